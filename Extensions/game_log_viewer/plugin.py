@@ -0,0 +1,197 @@
+# --- Filename: Extensions/game_log_viewer/plugin.py ---
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from ttkbootstrap.scrolled import ScrolledText
+from collections import deque
+from datetime import datetime
+import threading
+from src.log_sink import LogSink
+from src.task_executor import get_current_cancel_token
+
+UNITY_TAGS = ("Unity", "CRASH", "AndroidRuntime", "DEBUG", "libc")
+
+class LogBuffer:
+    """
+    The captured session: a ring buffer of the last max_lines lines. Each line is stored with a
+    lowercased copy so a search over the whole buffer is a single pass of substring checks.
+    """
+    def __init__(self, max_lines=100_000):
+        self.lines = deque(maxlen=max_lines) # (line, lowercased line)
+        self._lock = threading.Lock()
+
+    def append(self, line):
+        with self._lock: self.lines.append((line, line.lower()))
+
+    def clear(self):
+        with self._lock: self.lines.clear()
+
+    def snapshot(self):
+        with self._lock: return [line for line, _ in self.lines]
+
+    def search(self, term, limit=2000):
+        """Returns the newest `limit` lines containing term (case-insensitive), oldest first."""
+        term = term.lower()
+        with self._lock: matches = [line for line, lower in self.lines if term in lower]
+        return matches[-limit:]
+
+    def __len__(self):
+        return len(self.lines)
+
+
+class GameLogFrame(ttk.Frame):
+    """Streams logcat for the game process only, following it across restarts."""
+    name = "Game Log"
+    PID_POLL_SECONDS = 2
+    LIVE_MAX_LINES = 5000
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.buffer = LogBuffer()
+        self.handle = None
+
+        main_frame = ttk.Frame(self, padding=15)
+        main_frame.pack(fill=BOTH, expand=True)
+
+        header = ttk.Frame(main_frame)
+        header.pack(fill=X, pady=(0, 10))
+        self.start_button = ttk.Button(header, text="Start Capture", command=self.start_capture, bootstyle="success")
+        self.start_button.pack(side=LEFT)
+        self.stop_button = ttk.Button(header, text="Stop", command=self.stop_capture, bootstyle="danger-outline", state="disabled")
+        self.stop_button.pack(side=LEFT, padx=(5, 0))
+        self.unity_only_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(header, text="Unity tags only", variable=self.unity_only_var, bootstyle="round-toggle").pack(side=LEFT, padx=(10, 0))
+        self.status_label = ttk.Label(header, text="  Click Start Capture to follow the game's log.")
+        self.status_label.pack(side=LEFT)
+        ttk.Button(header, text="Export Session...", command=self.export_session, bootstyle="info-outline").pack(side=RIGHT)
+        ttk.Button(header, text="Clear", command=self.clear_session, bootstyle="secondary-outline").pack(side=RIGHT, padx=(0, 5))
+
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=X, pady=(0, 10))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side=LEFT, fill=X, expand=True, padx=(0, 5))
+        search_entry.bind("<Return>", self.run_search)
+        ttk.Button(search_frame, text="Search Session", command=self.run_search).pack(side=LEFT)
+
+        self.views = ttk.Notebook(main_frame)
+        self.views.pack(fill=BOTH, expand=True)
+        self.live_text = self._create_text_view("Live")
+        self.results_text = self._create_text_view("Search Results")
+        self.live_sink = LogSink(self.live_text, self.LIVE_MAX_LINES, name="game_log")
+
+    def _create_text_view(self, title):
+        text = ScrolledText(self.views, wrap=tk.NONE, autohide=True, font=("Consolas", 9))
+        text.text.config(state='disabled')
+        self.views.add(text, text=title)
+        return text
+
+    def _set_status(self, text):
+        self.controller.after(0, lambda: self.status_label.config(text=f"  {text}"))
+
+    def on_line(self, line):
+        """Called from the adb reader threads for every logcat line."""
+        self.buffer.append(line)
+        self.live_sink.write(line)
+
+    def start_capture(self):
+        if not self.controller.is_adb_connected:
+            messagebox.showwarning("Not Connected", "Please connect to the emulator first.")
+            return
+        if self.handle and not self.handle.done.is_set(): return
+        self.start_button.config(state="disabled")
+        self.stop_button.config(state="normal")
+        package = self.controller.setting_vars["Game Configuration"]["Game Package Name"]['var'].get()
+        self.handle = self.controller.task_executor.submit_dedicated(self._follow_game, package, self.unity_only_var.get(), name="game_log")
+
+    def stop_capture(self):
+        if self.handle: self.handle.cancel()
+
+    def _get_pid(self, package):
+        stdout, _ = self.controller.adb.send_adb_command_with_output(f"shell pidof {package}")
+        pids = (stdout or "").split()
+        return pids[0] if pids else None
+
+    def _follow_game(self, package, unity_only):
+        """
+        Runs logcat filtered on the device to the game's PID (and optionally Unity's tags), so
+        only the game's lines ever cross adb. The PID is polled, and logcat is restarted on the
+        new PID whenever the game restarts.
+        """
+        token = get_current_cancel_token()
+        filters = " ".join(f"{tag}:V" for tag in UNITY_TAGS) + " *:S" if unity_only else ""
+        executor = self.controller.task_executor
+        pid, session = None, None
+        try:
+            while not token.is_cancelled:
+                new_pid = self._get_pid(package)
+                if new_pid != pid:
+                    if session: session.cancel(); session.wait()
+                    session, pid = None, new_pid
+                    if pid:
+                        self.on_line(f"--- {datetime.now():%H:%M:%S} Following {package} (pid {pid}) ---")
+                        self._set_status(f"Capturing pid {pid}")
+                        session = executor.submit_dedicated(self.controller.adb.stream_adb_command, f"logcat -v threadtime --pid={pid} {filters}".strip(), self.on_line, name="logcat")
+                    else:
+                        self._set_status(f"Waiting for {package} to start...")
+                token.wait(self.PID_POLL_SECONDS)
+        finally:
+            if session: session.cancel()
+            self._set_status(f"Stopped. {len(self.buffer)} line(s) captured.")
+            self.controller.after(0, self._on_capture_stopped)
+
+    def _on_capture_stopped(self):
+        self.start_button.config(state="normal")
+        self.stop_button.config(state="disabled")
+
+    def run_search(self, event=None):
+        term = self.search_var.get().strip()
+        if not term: return
+        matches = self.buffer.search(term)
+        self.results_text.text.config(state='normal')
+        self.results_text.delete('1.0', tk.END)
+        self.results_text.insert(tk.END, "\n".join(matches))
+        self.results_text.text.config(state='disabled')
+        self.views.select(self.results_text)
+        self.status_label.config(text=f"  {len(matches)} match(es) for '{term}' in the last {len(self.buffer)} line(s).")
+
+    def clear_session(self):
+        self.buffer.clear()
+        self.live_sink.clear()
+
+    def export_session(self):
+        if not len(self.buffer):
+            messagebox.showinfo("Nothing to Export", "No log lines have been captured yet.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Export Game Log", defaultextension=".log", initialfile=f"smx_game_log_{datetime.now():%Y%m%d_%H%M%S}.log",
+            filetypes=[("Log files", "*.log"), ("Text files", "*.txt"), ("All files", "*.*")])
+        if not file_path: return
+        self.controller.submit_task(self._threaded_export, self.buffer.snapshot(), file_path)
+
+    def _threaded_export(self, lines, file_path):
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f: f.write("\n".join(lines) + "\n")
+            self.controller.log_to_ui(f"Exported {len(lines)} game log line(s) to '{file_path}'.")
+        except OSError as e:
+            self.controller.log_to_ui(f"ERROR: Could not export game log: {e}")
+
+
+class SMXExtension:
+    """This is the main entry point for the Game Log Viewer extension."""
+    def __init__(self):
+        self.name = "Game Log"
+        self.description = "Streams the game's logcat output so you can see why a mod broke the game."
+        self.version = "1.0.0"
+
+    def initialize(self, app):
+        """Called by the main application to let the extension integrate itself."""
+        print(f"INFO: Initializing extension '{self.name}' v{self.version}")
+        self.app = app
+        self.app.add_extension_tab(self.name, GameLogFrame)
+
+    def on_close(self):
+        """Called when the main application is closing."""
+        print(f"INFO: Closing extension '{self.name}'.")
@@ -5,6 +5,7 @@ from ttkbootstrap.constants import *
 from tkinter import messagebox, font
 # The shared component is still in 'src', so we adjust the import path
 from src.shared_ui_components import ModListView
+from src.task_executor import PRIORITY_BULK
 
 # --- This is the original OnDeviceFrame class, moved here from on_device_ui.py ---
 class OnDeviceFrame(ttk.Frame):
@@ -95,7 +96,7 @@ class OnDeviceFrame(ttk.Frame):
         if not dialog == "Yes":
             return
             
-        self.controller.run_in_thread(self._threaded_delete_unmanaged, device_folders)
+        self.controller.submit_task(self._threaded_delete_unmanaged, device_folders, priority=PRIORITY_BULK)
 
     def _threaded_delete_unmanaged(self, device_folders):
         log_func = self.controller.frames["Mod Manager"].log
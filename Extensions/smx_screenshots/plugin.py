@@ -135,7 +135,7 @@ class ScreenshotsFrame(ttk.Frame):
         for widget in self.screenshot_widgets:
             widget.destroy()
         self.screenshot_widgets.clear()
-        self.controller.run_in_thread(self._threaded_scan)
+        self.controller.submit_task(self._threaded_scan, key="screenshots_scan")
 
     def _threaded_scan(self):
         filenames = self.controller.adb.list_device_files(self.DEVICE_PATH)
@@ -144,12 +144,15 @@ class ScreenshotsFrame(ttk.Frame):
             return
 
         screenshot_data = []
-        for fname in sorted(filenames):
-            if fname.lower().endswith(('.jpg', '.jpeg', '.png')):
+        image_names = [f for f in sorted(filenames) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
+        progress = self.controller.start_transfer_progress("Pulling screenshots", total_files=len(image_names))
+        try:
+            for fname in image_names:
                 device_path = f"{self.DEVICE_PATH}{fname}"
                 temp_path = os.path.join(self.controller.TEMP_ICON_DIR, f"ss_{fname}")
-                if self.controller.adb.pull_file(device_path, temp_path):
+                if self.controller.adb.pull_file(device_path, temp_path, progress):
                     screenshot_data.append({'name': fname, 'local_path': temp_path})
+        finally: self.controller.end_transfer_progress()
         
         self.controller.after(0, self.on_scan_complete, screenshot_data)
 
@@ -222,16 +225,19 @@ class ScreenshotsFrame(ttk.Frame):
         os.makedirs(downloads_path, exist_ok=True)
         
         self.controller.show_loading_overlay(f"Downloading {len(selected_widgets)} file(s)...")
-        self.controller.run_in_thread(self._threaded_download, selected_widgets, downloads_path)
+        self.controller.submit_task(self._threaded_download, selected_widgets, downloads_path)
 
     def _threaded_download(self, widgets, pc_path):
         success_count = 0
-        for widget in widgets:
-            filename = widget.data['name']
-            device_file = f"{self.DEVICE_PATH}{filename}"
-            local_file = pc_path / filename
-            if self.controller.adb.pull_file(device_file, str(local_file)):
-                success_count += 1
+        progress = self.controller.start_transfer_progress("Downloading screenshots", total_files=len(widgets))
+        try:
+            for widget in widgets:
+                filename = widget.data['name']
+                device_file = f"{self.DEVICE_PATH}{filename}"
+                local_file = pc_path / filename
+                if self.controller.adb.pull_file(device_file, str(local_file), progress):
+                    success_count += 1
+        finally: self.controller.end_transfer_progress()
         
         self.controller.after(0, self.on_download_complete, success_count, len(widgets), pc_path)
 
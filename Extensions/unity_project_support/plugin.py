@@ -21,7 +21,8 @@ class SMXExtension:
         # Corrected the keyword arguments to match the function definition
         self.app.register_library_scanner(
             type_name="Suits (Unity Project)", 
-            func=self.scan_unity_project_folder
+            func=self.scan_unity_project_folder,
+            base_type="Suits"
         )
 
     def on_close(self):
@@ -2,7 +2,7 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from tkinter import font, messagebox
+from tkinter import font, messagebox, filedialog
 import os
 import sys
 import threading
@@ -10,21 +10,40 @@ import json
 import tempfile
 import shutil
 import re
+import zipfile
 import time
 import ctypes
+import multiprocessing
 from PIL import Image, ImageTk
 from pathlib import Path
 import importlib.util
 
 from src.mod_manager_ui import ModManagerFrame
 from src.settings_ui import SettingsFrame
-from src.adb_handler import AdbHandler
-from src.data_manager import DataManager
+from src.adb_handler import AdbHandler, quote_device_path, LANE_BULK
+from src.data_manager import DataManager, device_safe_name
+from src.mod_verifier import expected_files, compare_mod_files, is_broken
+from src.device_backup import DeviceBackup
+from src.mod_transcoder import ModTranscoder
+from src.extraction_cache import ExtractionCache
+from src.zip_integrity import ZipIntegrityChecker
 from src.extensions_ui import ExtensionsFrame
 from src.github_handler import GitHubHandler
+from src.image_cache import ImageCache
+from src.mapping_store import MappingStore
+from src.task_executor import TaskExecutor, TaskCancelled, get_current_cancel_token, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BULK
+from src.transfer_progress import TransferProgress, TransferMetrics
+from src.install_planner import plan_installs, install_record, is_install_current, measure_push_throughput
+from src.transfer_journal import TransferJournal
 
 CONFIG_FILE = "config.json"
-MAPPINGS_FILE = "mod_mappings.json"
+MAPPINGS_FILE = "mod_mappings.json" # Legacy format, migrated into MAPPINGS_DB_FILE on first run
+MAPPINGS_DB_FILE = "mod_mappings.db"
+TRANSFER_METRICS_FILE = "transfer_metrics.jsonl"
+TRANSFER_JOURNAL_FILE = "transfer_journal.jsonl"
+TRANSCODE_CACHE_DIR = "transcode_cache"
+EXTRACTION_CACHE_DIR = "extraction_cache"
+ZIP_INTEGRITY_FILE = "zip_integrity.json"
 EXTENSIONS_SETTINGS_FILE = "extensions_settings.json" 
 APP_VERSION = "8.0.4" # Version bump for critical architecture fix
 
@@ -77,6 +96,8 @@ class App(ttk.Window):
         os.makedirs(self.TEMP_ICON_DIR)
 
         self.github_handler = GitHubHandler()
+        self.task_executor = TaskExecutor(max_workers=4)
+        self.transcoder = ModTranscoder(TRANSCODE_CACHE_DIR)
         self.extensions = {}
         
         # --- THE FIX IS HERE ---
@@ -84,6 +105,7 @@ class App(ttk.Window):
         # This state is now reliable and not based on appending to a list.
         self.base_library_types = ["Tracks", "Sounds", "Suits"]
         self.custom_library_scanners = {}
+        self.custom_library_base_types = {} # custom type -> the base type its mods are laid out as
         
         self.setting_vars = {}
         self.saved_config = {}
@@ -106,6 +128,17 @@ class App(ttk.Window):
         default_gpg_adb_path = r"C:\Program Files\Google\Play Games Developer Emulator\current\emulator\adb.exe"
         self.register_setting("Advanced", "ADB Executable Override", default_gpg_adb_path, setting_type='file')
         self.register_setting("LocalLibrary", "Paths", [], setting_type='internal')
+        self.image_cache_size_var = self.register_setting("Advanced", "Image Cache Size (MB)", "64")
+        self.log_max_lines_var = self.register_setting("Advanced", "Log Max Lines", "5000")
+        self.log_file_var = self.register_setting("Advanced", "Log File (blank = off)", "")
+        self.adb_control_lanes_var = self.register_setting("Advanced", "ADB Control Lane Concurrency", "4")
+        self.adb_bulk_lanes_var = self.register_setting("Advanced", "ADB Bulk Lane Concurrency", "1")
+        self.parking_quota_var = self.register_setting("Advanced", "Disabled Mods Quota (MB)", "2048")
+        self.backup_compression_var = self.register_setting("Advanced", "Backup Compression Level (0-9)", "6")
+        self.extraction_cache_size_var = self.register_setting("Advanced", "Extraction Cache Size (MB, 0 = off)", "2048")
+        self.integrity_workers_var = self.register_setting("Advanced", "Background Zip Check Processes (0 = off)", "1")
+        self.suit_texture_limit_var = self.register_setting("Transcoding", "Suits: Max Texture Size (px, 0 = off)", "0")
+        self.sound_rate_limit_var = self.register_setting("Transcoding", "Sounds: Max Sample Rate (Hz, 0 = off)", "0")
         
         self._migrate_library_config()
         self.update_full_mods_path()
@@ -114,7 +147,18 @@ class App(ttk.Window):
         self.ADB_PATH = self.find_adb_path()
         if not self.ADB_PATH: messagebox.showerror("ADB Not Found", "Could not find adb.exe. Please configure its location in Settings.")
 
+        self.image_cache = ImageCache(self.get_image_cache_budget())
+        self.image_cache_size_var.trace_add("write", lambda *a: self.image_cache.set_max_bytes(self.get_image_cache_budget()))
+        self.extraction_cache = ExtractionCache(EXTRACTION_CACHE_DIR, self.get_extraction_cache_budget())
+        self.extraction_cache_size_var.trace_add("write", lambda *a: self.extraction_cache.set_max_bytes(self.get_extraction_cache_budget()))
+        self.integrity_checker = ZipIntegrityChecker(ZIP_INTEGRITY_FILE, self.get_integrity_workers())
+        self.integrity_workers_var.trace_add("write", lambda *a: setattr(self.integrity_checker, 'max_workers', self.get_integrity_workers()))
+        self.transfer_metrics = TransferMetrics(TRANSFER_METRICS_FILE)
+        self.transfer_journal = TransferJournal(TRANSFER_JOURNAL_FILE)
+        self.resume_offered = False
+        self.declined_renames = set()
         self.adb = AdbHandler(self)
+        for var in (self.adb_control_lanes_var, self.adb_bulk_lanes_var): var.trace_add("write", lambda *a: self.adb.reset_schedulers())
         self.data_manager = DataManager(self)
         self.loading_overlay = None
         self.device_has_been_scanned = False
@@ -204,15 +248,21 @@ class App(ttk.Window):
         frame.grid(row=0, column=0, sticky="nsew")
         print(f"  -> Extension '{name}' successfully added a UI tab.")
     
-    def register_library_scanner(self, type_name, func):
+    def register_library_scanner(self, type_name, func, base_type=None):
+        """base_type names the built-in type whose layout the mods follow (e.g. "Suits"), so they are checked and transcoded as one."""
         if type_name in self.base_library_types:
             print(f"ERROR: Extension tried to overwrite a built-in library type: '{type_name}'")
             return
         if type_name in self.custom_library_scanners:
              print(f"WARNING: An extension is overwriting a custom scanner for type: '{type_name}'")
         self.custom_library_scanners[type_name] = func
+        if base_type in self.base_library_types: self.custom_library_base_types[type_name] = base_type
         print(f"  -> Extension registered scanner for type: '{type_name}'")
 
+    def get_layout_type(self, lib_type):
+        """Maps a library type to the built-in type its mods are laid out as; the scan and the install-time checks both go through here."""
+        return self.custom_library_base_types.get(lib_type, lib_type)
+
     def get_available_library_types(self):
         all_types = self.base_library_types + list(self.custom_library_scanners.keys())
         return sorted(list(set(all_types)))
@@ -246,6 +296,57 @@ class App(ttk.Window):
         if not full_path.endswith('/'): full_path += '/'
         self.full_mods_path_var.set(full_path)
 
+    def get_image_cache_budget(self):
+        try: return max(1, int(float(self.image_cache_size_var.get()))) * 1024 * 1024
+        except ValueError: return 64 * 1024 * 1024
+
+    def get_extraction_cache_budget(self):
+        try: return max(0, int(float(self.extraction_cache_size_var.get()))) * 1024 * 1024
+        except ValueError: return 2048 * 1024 * 1024
+
+    def get_integrity_workers(self):
+        try: return max(0, int(self.integrity_workers_var.get()))
+        except ValueError: return 1
+
+    def get_log_max_lines(self):
+        try: return max(100, int(self.log_max_lines_var.get()))
+        except ValueError: return 5000
+
+    def get_adb_lane_concurrency(self):
+        """Returns (control, bulk) lane concurrency for the ADB command scheduler."""
+        try: control = max(1, int(self.adb_control_lanes_var.get()))
+        except ValueError: control = 4
+        try: bulk = max(1, int(self.adb_bulk_lanes_var.get()))
+        except ValueError: bulk = 1
+        return control, bulk
+
+    def get_parking_quota_bytes(self):
+        """Returns the on-device byte budget for disabled (parked) mods."""
+        try: return max(0, int(self.parking_quota_var.get())) * 1024 * 1024
+        except ValueError: return 2048 * 1024 * 1024
+
+    def get_library_type(self, library):
+        return next((lib.get('type') for lib in self.get_local_library_paths() if os.path.basename(lib['path']) == library), None)
+
+    def get_layout_problems(self, path, library=None):
+        """Why a mod zip cannot be installed (see mod_layout.check_layout); empty if it can. Unreadable zips are left to push_mod."""
+        library = library or self.data_manager.search_index.locate(path)[0]
+        try: return self.data_manager.zip_index.get_layout_problems(path, self.get_layout_type(self.get_library_type(library)))
+        except (OSError, zipfile.BadZipFile): return []
+
+    def get_transcode_rules(self, library):
+        """The ModTranscoder rules for a library's type, or None if transcoding is off for it."""
+        lib_type = self.get_layout_type(self.get_library_type(library))
+        setting = {"Suits": ('max_texture', self.suit_texture_limit_var), "Sounds": ('max_sample_rate', self.sound_rate_limit_var)}.get(lib_type)
+        if not setting: return None
+        try: limit = int(setting[1].get())
+        except ValueError: return None
+        return {setting[0]: limit} if limit > 0 else None
+
+    def get_parking_path(self):
+        """Disabled mods are parked in a sibling of the Mods folder, so moving them is a single rename."""
+        return f"{self.full_mods_path_var.get().rstrip('/')}_Parked/"
+
     def ensure_initial_config(self):
         if not os.path.exists(CONFIG_FILE): self.save_config()
 
@@ -280,7 +381,7 @@ class App(ttk.Window):
 
     def manual_refresh_connection(self):
         self.frames["Mod Manager"].status_widget.config(text="Checking...", state="disabled")
-        self.run_in_thread(self._perform_connection_check, is_initial_check=True, is_manual_refresh=True)
+        self.submit_task(self._perform_connection_check, is_initial_check=True, is_manual_refresh=True, priority=PRIORITY_INTERACTIVE, key="connection_check")
 
     def _update_ui_on_connection_change(self):
         status_widget = self.frames["Mod Manager"].status_widget
@@ -303,86 +404,344 @@ class App(ttk.Window):
 
     def initial_local_scan(self):
         self.show_loading_overlay("Scanning Local Files...")
-        self.run_in_thread(self._threaded_initial_scan)
+        self.submit_task(self._threaded_initial_scan, key="local_scan")
 
     def refresh_local_data_and_ui(self): self.initial_local_scan()
         
     def _threaded_initial_scan(self):
         try:
             self.data_manager.refresh_all(scan_device=False)
-            self.after(0, self.frames["Mod Manager"].build_nav, self.data_manager)
+            self.after(0, self._on_scan_complete)
         finally: self.after(100, self.hide_loading_overlay)
 
+    def _on_scan_complete(self):
+        # The store diffs the new scan against the old one and its subscribers patch the UI.
+        self.data_manager.mod_store.load(self.data_manager.local_data, self.mod_mappings)
+        self.frames["Mod Manager"].build_nav(self.data_manager)
+        if self.device_has_been_scanned and not self.resume_offered: self._offer_transfer_resume()
+        self.submit_task(self._threaded_integrity_check, list(self.data_manager.mod_store.mods), key="zip_integrity")
+
+    def confirm_folder_renames(self, target_dir, renames):
+        """Asks before renaming device folders that share a mod index; a declined set is not offered again this session."""
+        renames = [r for r in renames if r[0] not in self.declined_renames]
+        if not renames: return
+        names = "\n".join(f"{old} -> {new}" for old, new, _ in renames[:10])
+        if messagebox.askyesno("Duplicate Mod Indices", f"{len(renames)} mod folder(s) on the device share an index with another folder:\n\n{names}\n\nRename them to free indices now?"):
+            self.submit_task(self._threaded_rename_folders, target_dir, renames, priority=PRIORITY_BULK, key="rename_folders")
+        else: self.declined_renames.update(r[0] for r in renames)
+
+    def _threaded_rename_folders(self, target_dir, renames):
+        self.data_manager.rename_device_folders(target_dir, renames, self.log_to_ui)
+        self.after(0, self.refresh_data_and_ui)
+
+    def _threaded_integrity_check(self, paths):
+        """
+        Background CRC check of every library zip; it yields to interactive work and device transfers.
+        Results are collected and handed to the mod store in batches, so the list patches the affected
+        items in place instead of being redrawn once per zip.
+        """
+        def should_pause():
+            running = self.task_executor.get_stats()['running']
+            return running[PRIORITY_INTERACTIVE] > 0 or running[PRIORITY_BULK] > 0
+        results, lock = {}, threading.Lock()
+        def flush():
+            with lock:
+                batch = {path: {'integrity_error': error} for path, error in results.items()}
+                results.clear()
+            self.data_manager.mod_store.set_fields(batch)
+        def on_result(path, error):
+            if error: self.log_to_ui(f"WARNING: '{os.path.basename(path)}' is damaged: {error}")
+            with lock:
+                first = not results
+                results[path] = error
+            if first: self.after(250, flush)
+        self.integrity_checker.check(paths, on_result, should_pause, self.log_to_ui)
+
+    def _offer_transfer_resume(self):
+        self.resume_offered = True
+        pending = [p for p in self.transfer_journal.pending() if os.path.exists(p)]
+        if not pending: return
+        names = "\n".join(os.path.basename(p) for p in pending[:10])
+        if messagebox.askyesno("Resume Interrupted Installs", f"{len(pending)} mod install(s) were interrupted:\n\n{names}\n\nResume them now? Files already on the device are verified and skipped."):
+            self.submit_task(self.install_mods, pending, priority=PRIORITY_BULK)
+
     def refresh_data_and_ui(self):
         if not self.is_adb_connected: return
         self.show_loading_overlay("Scanning Device...")
         self.device_has_been_scanned = True
-        self.run_in_thread(self._threaded_refresh)
+        self.submit_task(self._threaded_refresh, key="device_scan")
 
     def _threaded_refresh(self):
         try:
             self.data_manager.refresh_all(scan_device=True)
-            self.after(0, self.frames["Mod Manager"].build_nav, self.data_manager)
+            self.after(0, self._on_scan_complete)
         finally: self.after(100, self.hide_loading_overlay)
 
     def _update_ui_after_mod_operation(self, paths, new_status):
-        for path in paths:
-            for cats in self.data_manager.local_data.values():
-                for mods in cats.values():
-                    for mod in mods:
-                        if mod['full_path'] == path: mod['status'] = new_status
-        for widget in self.frames["Mod Manager"].local_mods_frame.scrollable_frame.winfo_children():
-            if hasattr(widget, 'mod_data') and widget.mod_data.get('full_path') in paths:
-                widget.update_ui_for_status(new_status)
-        self.frames["Mod Manager"].update_control_state()
+        self.data_manager.mod_store.set_status(paths, new_status, self.mod_mappings)
 
-    def install_mods(self, paths, lib, cat):
+    def _report_transfer_progress(self, snapshot):
+        self.after(0, self.frames["Mod Manager"].update_transfer_progress, snapshot)
+
+    def start_transfer_progress(self, name, total_bytes=0, total_files=0):
+        """
+        A TransferProgress that feeds the Mod Manager's transfer panel (shown with its first update),
+        e.g. for adb.pull_file(..., progress). Call end_transfer_progress() when the batch is done.
+        """
+        return TransferProgress(total_bytes, total_files, on_update=self._report_transfer_progress, current=name)
+
+    def end_transfer_progress(self):
+        self.after(0, self.frames["Mod Manager"].hide_transfer_progress)
+
+    def plan_and_install(self, paths):
+        """Plans the batch off the UI thread, then asks before running only the installs that are needed."""
+        self.submit_task(self._threaded_plan_install, paths, priority=PRIORITY_INTERACTIVE, key="install_plan")
+
+    def _threaded_plan_install(self, paths):
+        throughput = measure_push_throughput(self.transfer_metrics.read_recent())
+        plan = plan_installs(paths, self.mod_mappings, self.data_manager.zip_index, self.transfer_journal, throughput, self.get_layout_problems)
+        self.after(0, self._confirm_install_plan, plan)
+
+    def _confirm_install_plan(self, plan):
+        for item in plan.items: self.log_to_ui(f"  [{item['action']}] {os.path.basename(item['path'])} ({item['reason']})")
+        invalid_text = f"\n{len(plan.invalid)} mod(s) have an invalid layout and cannot be installed (see the log).\n" if plan.invalid else ""
+        if not plan.needed:
+            messagebox.showinfo("Nothing to Install", f"{len(plan.skipped)} selected mod(s) are already installed and up to date.\n{invalid_text}")
+            return
+        eta = plan.estimated_seconds
+        eta_text = f"about {int(eta // 60)}m {int(eta % 60)}s" if eta is not None else "unknown (no transfers measured yet)"
+        summary = (f"{len(plan.needed)} mod(s) to install or update: {plan.total_bytes / 1048576:.1f} MB in {plan.total_files} file(s).\n"
+                   f"Estimated time: {eta_text}.\n{invalid_text}")
+        if plan.skipped:
+            summary += f"\n{len(plan.skipped)} mod(s) are unchanged since they were installed and will be skipped.\nPress No to reinstall everything selected."
+            answer = messagebox.askyesnocancel("Install Plan", summary)
+        else:
+            answer = messagebox.askokcancel("Install Plan", summary) or None
+        if answer is None: return
+        paths = [i['path'] for i in (plan.needed if answer else plan.needed + plan.skipped)]
+        self.submit_task(self.install_mods, paths, priority=PRIORITY_BULK)
+
+    def install_mods(self, paths, lib=None, cat=None):
         if not self.is_adb_connected: return
         target = self.full_mods_path_var.get()
         success = []
+        cancel_token = get_current_cancel_token()
+        progress = TransferProgress(on_update=self._report_transfer_progress)
+        for p in paths:
+            if self.mod_mappings.get(p, {}).get('parked'): continue # Enabling is a move; no bytes to push
+            try: progress.add_total(*self.data_manager.zip_index.get_payload_size(p))
+            except (OSError, zipfile.BadZipFile): pass # push_mod reports the bad zip itself
         for p in paths:
+            if cancel_token.is_cancelled:
+                self.log_to_ui(f"\n--- Batch cancelled; {len(paths) - len(success)} mod(s) not processed ---")
+                break
             mod_name = os.path.basename(p)
+            progress.set_current(mod_name)
+            # Selections can span libraries (global search), so resolve each mod's own location.
+            mod_lib, mod_cat = (lib, cat) if lib else self.data_manager.search_index.locate(p)
             try:
-                if p in self.mod_mappings:
+                problems = self.get_layout_problems(p, mod_lib)
+                if problems:
+                    self.log_to_ui(f"\n--- Rejected '{mod_name}' ---: {'; '.join(problems)}")
+                    continue
+                if self.mod_mappings.get(p, {}).get('parked'):
+                    if self._enable_parked_mod(p, target):
+                        success.append(p)
+                        continue
+                    try: progress.add_total(*self.data_manager.zip_index.get_payload_size(p))
+                    except (OSError, zipfile.BadZipFile): pass
+                pending = self.transfer_journal.get(p)
+                if pending and not self.transfer_journal.is_current(p):
+                    self.log_to_ui(f"\n--- '{mod_name}' changed since its install was interrupted; starting over ---")
+                    self.adb.delete_device_folder(f"/sdcard/{pending['device_folder']}", self.log_to_ui)
+                    self.transfer_journal.finish(p)
+                    pending = None
+                if pending:
+                    self.log_to_ui(f"\n--- Resuming '{mod_name}' ---")
+                    dev_folder, idx = pending['device_folder'], pending['index']
+                    # A half-finished update may not have removed the old copy yet.
+                    if pending['stage'] == 'pushing': self.adb.delete_device_folder(f"{target}{dev_folder}", self.log_to_ui)
+                elif p in self.mod_mappings:
                     map_info = self.mod_mappings[p]
+                    dev_folder, idx = map_info['device_folder'], map_info.get('index')
                     self.log_to_ui(f"\n--- Updating '{mod_name}' ---")
-                    self.adb.delete_device_folder(f"{target}{map_info['device_folder']}", self.log_to_ui)
-                    self.adb.push_mod(p, map_info['device_folder'], target, self.log_to_ui)
-                    map_info.update({'library': lib, 'category': cat})
+                    self.transfer_journal.begin(p, dev_folder, target, idx)
+                    self.adb.delete_device_folder(f"{target}{dev_folder}", self.log_to_ui)
                 else:
                     self.log_to_ui(f"\n--- Installing '{mod_name}' ---")
                     dev_mods = self.adb.list_device_files(target) or []
                     indices = {int(re.search(r'mod_(\d+)_', m).group(1)) for m in dev_mods if re.search(r'mod_(\d+)_', m)}
+                    # Indices reserved by interrupted installs are not in the Mods folder yet.
+                    # Neither are parked mods.
+                    indices |= {self.transfer_journal.get(j)['index'] for j in self.transfer_journal.pending()}
+                    indices |= {m.get('index') for m in self.mod_mappings.values() if m.get('parked')}
                     idx = 0
                     while idx in indices: idx += 1
-                    safe_name = re.sub(r'[^\w.-]', '_', os.path.splitext(mod_name)[0])
-                    dev_folder = f"mod_{idx}_{safe_name}"
-                    self.adb.push_mod(p, dev_folder, target, self.log_to_ui)
-                    self.mod_mappings[p] = {'index': idx, 'device_folder': dev_folder, 'library': lib, 'category': cat}
-                self.save_mappings()
+                    dev_folder = f"mod_{idx}_{device_safe_name(p)}"
+                    self.transfer_journal.begin(p, dev_folder, target, idx)
+                rules = self.get_transcode_rules(mod_lib)
+                transcoded = self.adb.push_mod(p, dev_folder, target, self.log_to_ui, progress, rules)
+                record = install_record(self.data_manager.zip_index, p)
+                if transcoded is not None: record.update(transcoded=transcoded, transcode_rules=rules)
+                if p in self.mod_mappings: self.mod_mappings.update_fields(p, library=mod_lib, category=mod_cat, **record)
+                else: self.mod_mappings[p] = {'index': idx, 'device_folder': dev_folder, 'library': mod_lib, 'category': mod_cat, **record}
+                self.transfer_journal.finish(p)
                 self.log_to_ui(f"SUCCESS: '{mod_name}' processed.")
                 success.append(p)
+            except TaskCancelled:
+                self.log_to_ui(f"\n--- Batch cancelled while pushing '{mod_name}'; {len(paths) - len(success)} mod(s) not completed ---")
+                break
+            except ValueError as e:
+                self.transfer_journal.finish(p) # A malformed zip will never resume; don't keep offering it
+                self.log_to_ui(f"--- FAILED for '{mod_name}' ---: {e}")
             except Exception as e: self.log_to_ui(f"--- FAILED for '{mod_name}' ---: {e}")
+        self.after(0, self.frames["Mod Manager"].hide_transfer_progress)
         if success: self.after(0, self._update_ui_after_mod_operation, success, "Installed")
 
+    def _enable_parked_mod(self, path, target):
+        """Moves a parked mod back if its parked copy still matches the local zip; otherwise drops it so the caller pushes afresh."""
+        map_info = self.mod_mappings[path]
+        parked_folder = f"{self.get_parking_path()}{map_info['device_folder']}"
+        self.log_to_ui(f"\n--- Enabling '{os.path.basename(path)}' ---")
+        if self._parked_copy_matches(path, map_info, parked_folder):
+            _, stderr = self.adb.send_adb_command_with_output(f"shell mv {quote_device_path(parked_folder)} {quote_device_path(target)}")
+            if stderr and stderr.strip(): raise IOError(f"Could not move the parked copy back: {stderr.strip()}")
+            self.mod_mappings.update_fields(path, parked=False, parked_bytes=0)
+            self.log_to_ui("SUCCESS: Mod moved back from the parking area.")
+            return True
+        self.log_to_ui("  - Parked copy no longer matches the local zip; reinstalling.")
+        self.adb.delete_device_folder(parked_folder, self.log_to_ui)
+        self.mod_mappings.update_fields(path, parked=False, parked_bytes=0)
+        return False
+
+    def _parked_copy_matches(self, path, map_info, parked_folder):
+        """
+        Checks the zip is unchanged since install (when the mapping has an install record) and the
+        parked copy holds exactly the zip's files, each with the size its central directory records.
+        """
+        zip_index = self.data_manager.zip_index
+        try:
+            if 'zip_size' in map_info and not is_install_current(map_info, zip_index, path): return False
+            expected = {name: size for name, (size, _) in expected_files(zip_index, path, transcoded=map_info.get('transcoded')).items()}
+        except (OSError, zipfile.BadZipFile): return False
+        device = self.adb.get_device_file_digests(parked_folder, with_md5=False)
+        return bool(device) and {rel: d['size'] for rel, d in device.items()} == expected
+
+    def disable_mods(self, paths):
+        """Parks installed mods next to the Mods folder with one mv each, evicting the oldest parked mods past the quota."""
+        if not self.is_adb_connected: return
+        target, parking = self.full_mods_path_var.get(), self.get_parking_path()
+        quota = self.get_parking_quota_bytes()
+        parked, removed = [], []
+        cancel_token = get_current_cancel_token()
+        returncode, _, stderr = self.adb._run(f"shell mkdir -p {quote_device_path(parking)}", LANE_BULK)
+        if returncode:
+            self.log_to_ui(f"ERROR: Could not create the parking folder '{parking}': {(stderr or '').strip() or f'exit code {returncode}'}")
+            return
+        for p in paths:
+            if cancel_token.is_cancelled:
+                self.log_to_ui("\n--- Disable batch cancelled ---")
+                break
+            map_info = self.mod_mappings.get(p)
+            if not map_info or map_info.get('parked'): continue
+            dev_folder = map_info['device_folder']
+            try: size = self.data_manager.zip_index.get_payload_size(p)[0]
+            except (OSError, zipfile.BadZipFile): size = 0
+            self.log_to_ui(f"\n--- Disabling '{os.path.basename(p)}' ---")
+            if size > quota:
+                self.log_to_ui(f"  - {size / 1048576:.0f} MB is larger than the parking quota; uninstalling instead.")
+                self.adb.delete_device_folder(f"{target}{dev_folder}", self.log_to_ui)
+                del self.mod_mappings[p]
+                removed.append(p)
+                continue
+            removed += self._evict_parked_mods(quota - size)
+            returncode, _, stderr = self.adb._run(f"shell mv {quote_device_path(target + dev_folder)} {quote_device_path(parking)}", LANE_BULK)
+            if returncode:
+                self.log_to_ui(f"ERROR: Could not park the mod; it stays installed: {(stderr or '').strip() or f'exit code {returncode}'}")
+                continue
+            self.mod_mappings.update_fields(p, parked=True, parked_at=time.time(), parked_bytes=size)
+            parked.append(p)
+            self.log_to_ui("SUCCESS: Mod parked.")
+        if parked: self.after(0, self._update_ui_after_mod_operation, parked, "Disabled")
+        if removed: self.after(0, self._update_ui_after_mod_operation, removed, "Not Installed")
+
+    def _evict_parked_mods(self, budget):
+        """Deletes the longest-parked mods until the parked total fits in budget bytes. Returns the evicted paths."""
+        parked = sorted((m.get('parked_at', 0), p, m) for p, m in self.mod_mappings.items() if m.get('parked'))
+        total = sum(m.get('parked_bytes', 0) for _, _, m in parked)
+        evicted = []
+        for _, p, m in parked:
+            if total <= budget: break
+            self.log_to_ui(f"  - Parking quota reached; removing parked '{os.path.basename(p)}'.")
+            self.adb.delete_device_folder(f"{self.get_parking_path()}{m['device_folder']}", self.log_to_ui)
+            del self.mod_mappings[p]
+            total -= m.get('parked_bytes', 0)
+            evicted.append(p)
+        return evicted
+
+    def save_loadout(self, name):
+        """Saves the currently installed mods as a named loadout."""
+        installed = [p for p, m in self.mod_mappings.items() if not m.get('parked')]
+        self.mod_mappings.loadouts.save(name, installed)
+        self.log_to_ui(f"Saved loadout '{name}' with {len(installed)} mod(s).")
+
+    def apply_loadout(self, name):
+        self.submit_task(self._threaded_plan_loadout, name, priority=PRIORITY_INTERACTIVE, key="loadout_plan")
+
+    def _threaded_plan_loadout(self, name):
+        wanted = self.mod_mappings.loadouts.get(name) or set()
+        installed = {p for p, m in self.mod_mappings.items() if not m.get('parked')} # Parked mods count as absent; enabling them is a move
+        missing = {p for p in wanted - installed if not os.path.exists(p)}
+        to_install = sorted(wanted - installed - missing)
+        to_remove = sorted(installed - wanted)
+        install_bytes = 0
+        for p in to_install:
+            try: install_bytes += self.data_manager.zip_index.get_payload_size(p)[0]
+            except (OSError, zipfile.BadZipFile): pass
+        self.after(0, self._confirm_loadout, name, to_remove, to_install, missing, len(wanted & installed), install_bytes)
+
+    def _confirm_loadout(self, name, to_remove, to_install, missing, unchanged, install_bytes):
+        for p in missing: self.log_to_ui(f"WARNING: Loadout '{name}' lists '{p}', which no longer exists locally.")
+        if not to_remove and not to_install:
+            messagebox.showinfo("Loadout Already Applied", f"The device already matches loadout '{name}'.")
+            return
+        summary = (f"Apply loadout '{name}'?\n\n"
+                   f"Uninstall: {len(to_remove)} mod(s)\n"
+                   f"Install: {len(to_install)} mod(s), {install_bytes / 1048576:.1f} MB\n"
+                   f"Untouched: {unchanged} mod(s)")
+        if missing: summary += f"\nMissing locally (skipped): {len(missing)}"
+        if messagebox.askyesno("Apply Loadout", summary):
+            self.submit_task(self._threaded_apply_loadout, name, to_remove, to_install, priority=PRIORITY_BULK, key="apply_loadout")
+
+    def _threaded_apply_loadout(self, name, to_remove, to_install):
+        self.log_to_ui(f"\n=== Applying loadout '{name}' ===")
+        if to_remove: self.uninstall_mods(to_remove)
+        if to_install and not get_current_cancel_token().is_cancelled: self.install_mods(to_install)
+        self.log_to_ui(f"=== Loadout '{name}' finished ===")
+
     def uninstall_mods(self, paths):
         if not self.is_adb_connected: return
         target = self.full_mods_path_var.get()
         success = []
+        cancel_token = get_current_cancel_token()
         for p in paths:
+            if cancel_token.is_cancelled:
+                self.log_to_ui("\n--- Uninstall batch cancelled ---")
+                break
             if p in self.mod_mappings:
                 self.log_to_ui(f"\n--- Uninstalling '{os.path.basename(p)}' ---")
                 try:
-                    self.adb.delete_device_folder(f"{target}{self.mod_mappings[p]['device_folder']}", self.log_to_ui)
+                    map_info = self.mod_mappings[p]
+                    folder = self.get_parking_path() if map_info.get('parked') else target
+                    self.adb.delete_device_folder(f"{folder}{map_info['device_folder']}", self.log_to_ui)
                     del self.mod_mappings[p]
-                    self.save_mappings()
                     self.log_to_ui("SUCCESS! Mod uninstalled.")
                     success.append(p)
                 except Exception as e: self.log_to_ui(f"--- UNINSTALL FAILED ---: {e}")
         if success: self.after(0, self._update_ui_after_mod_operation, success, "Not Installed")
 
-    def launch_game(self): self.run_in_thread(self.adb.launch_game_activity, self.setting_vars["Game Configuration"]["Game Package Name"]['var'].get(), self.setting_vars["Game Configuration"]["Game Activity Name"]['var'].get(), self.log_to_ui)
-    def force_stop_game(self): self.run_in_thread(self.adb.force_stop_package, self.setting_vars["Game Configuration"]["Game Package Name"]['var'].get(), self.log_to_ui)
+    def launch_game(self): self.submit_task(self.adb.launch_game_activity, self.setting_vars["Game Configuration"]["Game Package Name"]['var'].get(), self.setting_vars["Game Configuration"]["Game Activity Name"]['var'].get(), self.log_to_ui, priority=PRIORITY_INTERACTIVE, key="launch_game")
+    def force_stop_game(self): self.submit_task(self.adb.force_stop_package, self.setting_vars["Game Configuration"]["Game Package Name"]['var'].get(), self.log_to_ui, priority=PRIORITY_INTERACTIVE, key="force_stop_game")
 
     def open_folder_in_explorer(self, path):
         if not path: return
@@ -436,20 +795,24 @@ class App(ttk.Window):
         with open(CONFIG_FILE, 'w') as f: json.dump(data, f, indent=4)
 
     def load_mappings(self):
-        try:
-            with open(MAPPINGS_FILE, 'r') as f: self.mod_mappings = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError): self.mod_mappings = {}
+        self.mod_mappings = MappingStore(MAPPINGS_DB_FILE, legacy_json_path=MAPPINGS_FILE)
 
     def save_mappings(self):
-        with open(MAPPINGS_FILE, 'w') as f: json.dump(self.mod_mappings, f, indent=4)
+        """Kept for extensions; the mapping store commits every change as it is made."""
+        pass
 
     def on_closing(self):
         for ext in self.extensions.values():
             try: ext.on_close()
             except Exception as e: print(f"ERROR on_close for '{ext.name}': {e}")
         self.stop_monitoring.set()
+        self.task_executor.shutdown()
+        self.transcoder.shutdown()
+        print(f"INFO: Image cache stats: {self.image_cache.get_stats()}")
+        print(f"INFO: Extraction cache stats: {self.extraction_cache.get_stats()}")
+        print(f"INFO: ADB lane stats: {self.adb.get_lane_stats()}")
         self.save_config()
-        self.save_mappings()
+        self.mod_mappings.close()
         if os.path.exists(self.TEMP_ICON_DIR): shutil.rmtree(self.TEMP_ICON_DIR, ignore_errors=True)
         self.destroy()
 
@@ -462,8 +825,23 @@ class App(ttk.Window):
             for name, btn in self.nav_buttons.items():
                 btn.config(bootstyle="primary" if name == page_name else "secondary")
     
+    def submit_task(self, target, *args, priority=PRIORITY_BACKGROUND, key=None, **kwargs):
+        """
+        Public API for running work off the UI thread (use this from extensions instead of raw threads).
+        priority is PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND or PRIORITY_BULK; a key that is already
+        queued or running returns the existing TaskHandle instead of starting a duplicate job.
+        Long jobs can poll get_current_cancel_token() to honour cancellation.
+        """
+        return self.task_executor.submit(target, *args, priority=priority, key=key, **kwargs)
+
     def run_in_thread(self, target, *args, **kwargs):
-        threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True).start()
+        """Legacy helper; runs target as a background-priority task."""
+        return self.submit_task(target, *args, **kwargs)
+
+    def cancel_tasks(self, priority=None, key=None):
+        count = self.task_executor.cancel(priority=priority, key=key)
+        if count: self.log_to_ui(f"Cancellation requested for {count} task(s).")
+        return count
 
     def get_local_library_paths(self): return self.setting_vars["LocalLibrary"]["Paths"]['value']
     def update_local_library_paths(self, paths):
@@ -478,15 +856,118 @@ class App(ttk.Window):
             self.frames["Mod Manager"].source_folder_path.set("")
             self.log_to_ui("Selection cleared.")
             
+    def verify_installed_mods(self):
+        if not self.is_adb_connected:
+            messagebox.showerror("Not Connected", "Cannot verify mods because the emulator is not connected.")
+            return
+        with_md5 = messagebox.askyesno("Verify Installed Mods",
+            "Compare file sizes of every installed mod against its zip.\n\nAlso compare MD5 checksums? This reads every file on the device and is slower.")
+        self.submit_task(self._threaded_verify, with_md5, priority=PRIORITY_BACKGROUND, key="verify_installed")
+
+    def _threaded_verify(self, with_md5):
+        target = self.full_mods_path_var.get()
+        self.log_to_ui(f"\n--- Verifying installed mods ({'size + md5' if with_md5 else 'size'}) ---")
+        # One stat (and md5sum) pass over the whole Mods tree, split per mod folder afterwards.
+        device_files = {}
+        for rel_path, digest in self.adb.get_device_file_digests(target, with_md5=with_md5).items():
+            folder, _, name = rel_path.partition('/')
+            device_files.setdefault(folder, {})[name] = digest
+        broken = {}
+        cancel_token = get_current_cancel_token()
+        for path, info in list(self.mod_mappings.items()):
+            cancel_token.raise_if_cancelled()
+            if info.get('parked') or not os.path.exists(path): continue
+            try: expected = expected_files(self.data_manager.zip_index, path, with_md5, info.get('transcoded'))
+            except (OSError, zipfile.BadZipFile) as e:
+                self.log_to_ui(f"  ? {os.path.basename(path)}: cannot read zip ({e})")
+                continue
+            report = compare_mod_files(expected, device_files.get(info['device_folder'], {}))
+            if not is_broken(report): continue
+            broken[path] = report
+            details = ", ".join(f"{len(names)} {kind}" for kind, names in report.items() if names)
+            self.log_to_ui(f"  ! {os.path.basename(path)} ({info['device_folder']}): {details}")
+            for kind, names in report.items():
+                for name in names[:5]: self.log_to_ui(f"      {kind}: {name}")
+        self.data_manager.zip_index.save() # Keeps the member md5s computed for this pass
+        self.log_to_ui(f"--- Verification complete: {len(broken)} of {len(self.mod_mappings)} installed mod(s) need repair ---")
+        if broken: self.after(0, self._offer_repair, broken)
+
+    def _offer_repair(self, broken):
+        files = sum(len(r['missing']) + len(r['truncated']) + len(r['drifted']) for r in broken.values())
+        extra = sum(len(r['extra']) for r in broken.values())
+        if messagebox.askyesno("Repair Mods", f"{len(broken)} installed mod(s) differ from their zips.\n\nRe-push {files} file(s) and delete {extra} extra file(s), leaving everything else untouched?"):
+            self.submit_task(self._threaded_repair, broken, priority=PRIORITY_BULK, key="repair_mods")
+
+    def _threaded_repair(self, broken):
+        target = self.full_mods_path_var.get()
+        for path, report in broken.items():
+            info = self.mod_mappings.get(path)
+            if not info: continue
+            self.log_to_ui(f"\n--- Repairing '{os.path.basename(path)}' ---")
+            try:
+                self.adb.repair_mod_files(path, f"{target}{info['device_folder']}", report['missing'] + report['truncated'] + report['drifted'], report['extra'], self.log_to_ui,
+                                          info.get('transcode_rules') if info.get('transcoded') else None)
+                self.log_to_ui("SUCCESS: Mod repaired.")
+            except TaskCancelled:
+                self.log_to_ui("\n--- Repair cancelled ---")
+                break
+            except Exception as e: self.log_to_ui(f"--- REPAIR FAILED ---: {e}")
+
+    def backup_device_mods(self):
+        if not self.is_adb_connected:
+            messagebox.showerror("Not Connected", "Cannot back up because the emulator is not connected.")
+            return
+        archive_path = filedialog.asksaveasfilename(title="Back Up Device Mods", defaultextension=".tar.gz",
+            initialfile=f"smx_mods_backup_{time.strftime('%Y%m%d_%H%M%S')}.tar.gz", filetypes=[("Mod backups", "*.tar.gz *.tar"), ("All files", "*.*")])
+        if not archive_path: return
+        dedupe = messagebox.askyesno("Back Up Device Mods",
+            "Skip files that are identical to files in your local library zips?\n\nThe backup is much smaller, but restoring it needs those zips.")
+        try: level = min(9, max(0, int(self.backup_compression_var.get())))
+        except ValueError: level = 6
+        self.submit_task(self._threaded_backup, archive_path, level, dedupe, priority=PRIORITY_BULK, key="device_backup")
+
+    def _threaded_backup(self, archive_path, level, dedupe):
+        self.log_to_ui(f"\n--- Backing up device mods to '{archive_path}' ---")
+        progress = TransferProgress(on_update=self._report_transfer_progress)
+        progress.set_current("Backup")
+        try:
+            manifest = DeviceBackup(self.adb, self.data_manager.zip_index).backup(self.full_mods_path_var.get(), archive_path, level, dedupe, progress, self.log_to_ui)
+            self.log_to_ui(f"SUCCESS: Backed up {manifest['files']} file(s), {manifest['bytes'] / 1048576:.1f} MB "
+                           f"({manifest['stored_bytes'] / 1048576:.1f} MB stored, {len(manifest['refs'])} file(s) referenced from local zips).")
+        except TaskCancelled: self.log_to_ui("--- Backup cancelled; the partial archive was removed ---")
+        except Exception as e: self.log_to_ui(f"--- BACKUP FAILED ---: {e}")
+        finally: self.after(0, self.frames["Mod Manager"].hide_transfer_progress)
+
+    def restore_device_backup(self):
+        if not self.is_adb_connected:
+            messagebox.showerror("Not Connected", "Cannot restore because the emulator is not connected.")
+            return
+        archive_path = filedialog.askopenfilename(title="Restore Device Mods Backup", filetypes=[("Mod backups", "*.tar.gz *.tar"), ("All files", "*.*")])
+        if not archive_path: return
+        if not messagebox.askyesno("Restore Backup", "Restore this backup into the device's Mods folder?\n\nFiles with the same names are overwritten; other mods are left in place."): return
+        self.submit_task(self._threaded_restore, archive_path, priority=PRIORITY_BULK, key="device_restore")
+
+    def _threaded_restore(self, archive_path):
+        self.log_to_ui(f"\n--- Restoring device mods from '{archive_path}' ---")
+        progress = TransferProgress(on_update=self._report_transfer_progress)
+        progress.set_current("Restore")
+        try:
+            manifest = DeviceBackup(self.adb, self.data_manager.zip_index).restore(archive_path, self.full_mods_path_var.get(), progress, self.log_to_ui)
+            self.log_to_ui(f"SUCCESS: Restored {manifest['files']} file(s).")
+            self.after(0, self.refresh_data_and_ui) # The device scan reconciles mappings with the restored folders
+        except TaskCancelled: self.log_to_ui("--- Restore cancelled ---")
+        except Exception as e: self.log_to_ui(f"--- RESTORE FAILED ---: {e}")
+        finally: self.after(0, self.frames["Mod Manager"].hide_transfer_progress)
+
     def sync_mod_mappings(self):
         if not self.is_adb_connected:
             messagebox.showerror("Not Connected", "Cannot sync mappings because the emulator is not connected.")
             return
         if not messagebox.askyesno("Confirm Sync", 
-            "This will scan the device and re-link installed mods to your local library files based on their .zip filename.\n\nThis is a recovery tool and will overwrite existing mappings. Continue?"):
+            "This will scan the device and re-link installed mods to your local library files, by their contents fingerprint where known and otherwise by .zip filename.\n\nThis is a recovery tool and will overwrite existing mappings. Continue?"):
             return
         self.show_loading_overlay("Syncing Mappings...")
-        self.run_in_thread(self._threaded_sync)
+        self.submit_task(self._threaded_sync, key="sync_mappings")
 
     def _threaded_sync(self):
         try:
@@ -501,16 +982,27 @@ class App(ttk.Window):
             }
             
             found, unlinked = 0, 0
-            new_mappings = {}
+            # Parked mods are not in the Mods folder, so keep their mappings as they are.
+            new_mappings = {p: info for p, info in self.mod_mappings.items() if info.get('parked')}
+            zip_index = self.data_manager.zip_index
 
             for device_folder in device_folders:
                 match = re.search(r'mod_(\d+)_(.*)', device_folder)
                 if not match: continue
                 index_str, device_name = match.groups()
-                
-                if device_name in local_mods_map:
-                    local_mod = local_mods_map[device_name]
-                    local_path = local_mod["full_path"]
+
+                # The folder's previous mapping knows its contents fingerprint, which survives renames and moves;
+                # the zip filename is only the fallback.
+                local_path, carried = None, {}
+                old_path, old_info = self.mod_mappings.get_by_device_folder(device_folder)
+                if old_info and old_info.get('fingerprint'):
+                    candidates = zip_index.get_paths_by_fingerprint(old_info['fingerprint'])
+                    if candidates: local_path, carried = (old_path if old_path in candidates else min(candidates)), dict(old_info)
+                if local_path is None and device_name in local_mods_map:
+                    local_path = local_mods_map[device_name]["full_path"]
+                    if old_path == local_path: carried = dict(old_info)
+
+                if local_path:
                     lib_path_obj = Path(local_path)
                     lib_root = next((lib['path'] for lib in self.get_local_library_paths() if Path(lib['path']) in lib_path_obj.parents), None)
                     
@@ -520,6 +1012,7 @@ class App(ttk.Window):
                         category = "Uncategorized"
 
                     new_mappings[local_path] = {
+                        **carried,
                         'index': int(index_str),
                         'device_folder': device_folder,
                         'library': os.path.basename(lib_root) if lib_root else "Unknown",
@@ -529,8 +1022,7 @@ class App(ttk.Window):
                 else:
                     unlinked += 1
             
-            self.mod_mappings = new_mappings
-            self.save_mappings()
+            self.mod_mappings.replace_all(new_mappings)
             self.after(0, self._report_sync_results, found, unlinked)
         except Exception as e:
             self.after(0, messagebox.showerror, "Sync Error", f"An error occurred during sync: {e}")
@@ -547,6 +1039,7 @@ class App(ttk.Window):
         os.execv(sys.executable, ['python'] + [sys.argv[0]])
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # The transcoder's process pool re-launches this executable when frozen
     if sys.platform == "win32":
         myappid = f'kbeq.smxmodmanager.v{APP_VERSION}'
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
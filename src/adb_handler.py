@@ -5,10 +5,96 @@ from tkinter import messagebox
 import zipfile
 import tempfile
 import shutil
+import threading
+import time
+from collections import deque
+from src.task_executor import get_current_cancel_token
+from src.transfer_journal import file_md5
+
+LANE_CONTROL = "control" # Short commands: pidof, devices, ls/find, am start, console input
+LANE_BULK = "bulk" # Long transfers and deletions: push, pull, rm -r
+PUSH_BATCH_BYTES = 8 * 1024 * 1024 # One `adb push` carries at most this much (or one bigger file), so progress moves within a mod
+PUSH_BATCH_FILES = 8 # ... and at most this many files, so an interrupted install resumes close to where it stopped
+
+def quote_device_path(path):
+    """
+    Quotes a path for the device shell. adb joins its shell arguments with spaces, so host-side
+    double quotes never reach the device; only single quotes (with embedded ones escaped) do.
+    """
+    return "'" + path.replace("'", "'\\''") + "'"
+
+class AdbLane:
+    """A concurrency-limited lane of ADB commands that records its own wait/run latency."""
+    def __init__(self, name, concurrency):
+        self.name = name
+        self.concurrency = concurrency
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._stats_lock = threading.Lock()
+        self.count = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.recent_waits = deque(maxlen=200)
+
+    def run(self, func):
+        queued_at = time.monotonic()
+        with self._stats_lock: self.waiting += 1
+        with self._semaphore:
+            started_at = time.monotonic()
+            with self._stats_lock: self.waiting -= 1
+            try: return func()
+            finally:
+                wait, run = started_at - queued_at, time.monotonic() - started_at
+                with self._stats_lock:
+                    self.count += 1
+                    self.total_wait += wait
+                    self.total_run += run
+                    self.recent_waits.append(wait)
+
+    def get_stats(self):
+        with self._stats_lock:
+            waits = sorted(self.recent_waits)
+            return {
+                'concurrency': self.concurrency, 'commands': self.count, 'waiting': self.waiting,
+                'avg_wait_ms': round(1000 * self.total_wait / self.count, 1) if self.count else 0.0,
+                'p95_wait_ms': round(1000 * waits[min(len(waits) - 1, int(len(waits) * 0.95))], 1) if waits else 0.0,
+                'avg_run_ms': round(1000 * self.total_run / self.count, 1) if self.count else 0.0,
+            }
+
+class AdbCommandScheduler:
+    """
+    Per-device scheduler with separate lanes for control and bulk traffic, so short control
+    commands (process checks, listings, console input) are served promptly while a long push is
+    running instead of queueing behind it or timing out.
+    """
+    def __init__(self, control_concurrency=4, bulk_concurrency=1):
+        self.lanes = {LANE_CONTROL: AdbLane(LANE_CONTROL, control_concurrency), LANE_BULK: AdbLane(LANE_BULK, bulk_concurrency)}
+
+    def run(self, lane, func):
+        return self.lanes[lane].run(func)
+
+    def get_stats(self):
+        return {name: lane.get_stats() for name, lane in self.lanes.items()}
 
 class AdbHandler:
     def __init__(self, controller):
         self.controller = controller
+        self.schedulers = {} # device serial (None = the default device) -> AdbCommandScheduler
+        self._schedulers_lock = threading.Lock()
+
+    def get_scheduler(self, device=None):
+        with self._schedulers_lock:
+            if device not in self.schedulers:
+                control, bulk = self.controller.get_adb_lane_concurrency()
+                self.schedulers[device] = AdbCommandScheduler(control, bulk)
+            return self.schedulers[device]
+
+    def reset_schedulers(self):
+        """Drops the schedulers so new lane concurrency settings apply to the next commands."""
+        with self._schedulers_lock: self.schedulers = {}
+
+    def get_lane_stats(self):
+        with self._schedulers_lock: return {device or "default": s.get_stats() for device, s in self.schedulers.items()}
 
     def is_device_connected(self):
         """Checks if a device is connected and authorized via ADB."""
@@ -29,7 +115,7 @@ class AdbHandler:
         stdout, stderr = self.send_adb_command_with_output(command)
         if log_func and stderr:
             log_func(f"Error checking directory '{path}': {stderr.strip()}")
-        return stdout is not None and "exists" in stdout.strip()
+        return stdout is not None and stdout.strip() == "exists"
 
     def launch_game_activity(self, package_name, activity_name, log_func):
         full_activity = f"{package_name}/{activity_name}"
@@ -58,22 +144,75 @@ class AdbHandler:
         basenames = [p.split('/')[-1] for p in content_paths]
         return basenames
 
-    def pull_file(self, device_path, local_path):
-        _, stderr = self.send_adb_command_with_output(f'pull "{device_path.strip()}" "{local_path.strip()}"')
-        return not stderr
+    def get_device_file_digests(self, folder, with_md5=True):
+        """Returns {relative path: {'size', 'md5'}} for every file under a device folder, using one stat and one md5sum pass."""
+        folder = folder.rstrip('/')
+        prefix = f"{folder}/"
+        quoted = quote_device_path(folder)
+        sizes_out, _ = self.send_adb_command_with_output(f"shell find {quoted} -type f -exec stat -c '%s %n' {{}} +", lane=LANE_BULK)
+        md5_out = self.send_adb_command_with_output(f"shell find {quoted} -type f -exec md5sum {{}} +", lane=LANE_BULK)[0] if with_md5 else ""
+        digests = {}
+        # Anything that is not "<size> <folder>/<path>" (error text, a broken stat) is ignored.
+        for line in (sizes_out or "").splitlines():
+            size, _, path = line.rstrip('\r\n').partition(' ')
+            if size.isdigit() and path.startswith(prefix) and len(path) > len(prefix): digests[path[len(prefix):]] = {'size': int(size), 'md5': None}
+        for line in (md5_out or "").splitlines():
+            md5, _, path = line.rstrip('\r\n').partition('  ')
+            rel_path = path[len(prefix):] if path.startswith(prefix) else None
+            if rel_path in digests and len(md5) == 32: digests[rel_path]['md5'] = md5.lower()
+        return digests
+
+    def _verify_resumed_files(self, device_content_path, completed, local_files, log_func):
+        """Returns the journaled files whose device copy still matches the local file by size and md5."""
+        device_digests = self.get_device_file_digests(device_content_path)
+        verified = set()
+        for rel_path, size in completed.items():
+            device = device_digests.get(rel_path)
+            local_path = local_files.get(rel_path)
+            if device and local_path and device['size'] == size and device['md5'] == file_md5(local_path): verified.add(rel_path)
+        log_func(f"  - Verified {len(verified)} of {len(completed)} previously pushed file(s) on the device.")
+        return verified
+
+    def pull_file(self, device_path, local_path, progress=None):
+        """Pulls one file; progress (a TransferProgress counting this file in its total_files) advances whether or not it worked."""
+        started = time.monotonic()
+        _, stderr = self.send_adb_command_with_output(f'pull "{device_path.strip()}" "{local_path.strip()}"', lane=LANE_BULK)
+        if stderr:
+            if progress: progress.file_done(0)
+            return False
+        size = os.path.getsize(local_path.strip()) if os.path.exists(local_path.strip()) else 0
+        self.controller.transfer_metrics.record('pull', os.path.basename(device_path.strip()), size, 1, time.monotonic() - started)
+        if progress: progress.file_done(size)
+        return True
     
     # --- MODIFIED: This function now handles unzipping from a source .zip file ---
-    def push_mod(self, source_zip_path, device_folder_name, target_dir, log_func):
+    def push_mod(self, source_zip_path, device_folder_name, target_dir, log_func, progress=None, transcode=None):
+        """
+        Extracts a mod zip and pushes its middleman folder to target_dir/device_folder_name via a
+        staging folder on /sdcard. If the transfer journal has an unfinished entry for this zip,
+        files already pushed (and still matching by size and md5) are skipped. transcode is the
+        ModTranscoder rules for the mod's library type; returns {member name: (size, md5)} of the
+        files it replaced, or None if the install had already been moved into place.
+        """
         if not os.path.exists(source_zip_path) or not zipfile.is_zipfile(source_zip_path):
             log_func(f"ERROR: Source path is not a valid zip file: {source_zip_path}")
             raise ValueError("Invalid source zip file.")
 
-        temp_dir = tempfile.mkdtemp(prefix="smx_mod_")
-        log_func(f"  - Unzipping mod to temporary location...")
-        try:
-            with zipfile.ZipFile(source_zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
+        journal = self.controller.transfer_journal
+        entry = journal.get(source_zip_path)
+        if entry and entry['device_folder'] != device_folder_name: entry = None
+        if entry and entry['stage'] == 'moving' and not self.directory_exists(f"/sdcard/{device_folder_name}"):
+            if self.directory_exists(f"{target_dir}{device_folder_name}"):
+                log_func(f"  - Interrupted install had already been moved into the game directory.")
+                return None
+            entry = None # Neither the staging copy nor the installed one is there; push it again
+
+        extraction_cache = self.controller.extraction_cache
+        try: fingerprint = self.controller.data_manager.zip_index.get_fingerprint(source_zip_path)
+        except (OSError, zipfile.BadZipFile): fingerprint = None
+        log_func("  - Using cached extraction..." if extraction_cache.contains(fingerprint) else "  - Unzipping mod to staging folder...")
+        # The staging folder may be shared with later installs of the same contents, so nothing below writes to it.
+        with extraction_cache.checkout(source_zip_path, fingerprint) as temp_dir:
             # Find the "middleman folder" inside the unzipped contents
             extracted_items = os.listdir(temp_dir)
             # Ignore macOS specific hidden folders that can interfere
@@ -88,31 +227,133 @@ class AdbHandler:
             
             log_func(f"  - Found mod content folder: '{extracted_items[0]}'")
             log_func(f"  - Creating parent folder '{device_folder_name}' on device sdcard...")
-            self.send_adb_command(f"shell mkdir \"/sdcard/{device_folder_name}\"", log_func)
-            
-            log_func(f"  - Pushing mod contents into parent folder...")
-            self.send_adb_command(f'push "{content_folder_path}" "/sdcard/{device_folder_name}/"', log_func)
+            # Pushed in small per-folder batches (same layout as pushing the whole folder); each file is journaled as soon as its batch has landed.
+            device_content_path = f"/sdcard/{device_folder_name}/{extracted_items[0]}"
+            files, device_dirs = [], [device_content_path]
+            for root, dirs, names in os.walk(content_folder_path):
+                rel_root = os.path.relpath(root, content_folder_path).replace(os.sep, '/')
+                device_dirs += [f"{device_content_path}/{d}" if rel_root == '.' else f"{device_content_path}/{rel_root}/{d}" for d in dirs]
+                files += [(os.path.join(root, n), n if rel_root == '.' else f"{rel_root}/{n}") for n in names]
+            self._make_device_dirs(device_dirs, log_func)
+            transcoded = self.controller.transcoder.transcode_files(files, transcode, log_func) if transcode else {}
+            files = [(transcoded[rel][0] if rel in transcoded else path, rel) for path, rel in files]
+
+            verified = set()
+            if entry and entry['completed']:
+                log_func(f"  - Resuming interrupted transfer; checking files already on the device...")
+                verified = self._verify_resumed_files(device_content_path, entry['completed'], {rel: path for path, rel in files}, log_func)
+                for local_path, rel_path in files:
+                    if rel_path in verified and progress: progress.file_done(os.path.getsize(local_path))
+                files = [(path, rel) for path, rel in files if rel not in verified]
+
+            log_func(f"  - Pushing {len(files)} file(s) into parent folder...")
+            started, pushed_bytes = time.monotonic(), 0
+            def on_pushed(batch):
+                nonlocal pushed_bytes
+                for local_path, rel_path in batch:
+                    size = os.path.getsize(local_path)
+                    pushed_bytes += size
+                    journal.file_done(source_zip_path, rel_path, size)
+                    if progress: progress.file_done(size)
+            self._push_files(files, device_content_path, on_pushed)
+            elapsed = time.monotonic() - started
+            self.controller.transfer_metrics.record('push', os.path.basename(source_zip_path), pushed_bytes, len(files), elapsed)
+            log_func(f"  - Pushed {pushed_bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s.")
 
             log_func(f"  - Moving mod into game directory...")
-            self.send_adb_command(f'shell mv "/sdcard/{device_folder_name}" "{target_dir}"', log_func)
+            journal.set_stage(source_zip_path, 'moving')
+            returncode, _, stderr = self._run(f"shell mv {quote_device_path(f'/sdcard/{device_folder_name}')} {quote_device_path(target_dir)}", LANE_BULK)
+            if returncode: raise IOError(f"Could not move the mod into the game directory: {(stderr or '').strip() or f'exit code {returncode}'}")
+            return {f"{extracted_items[0]}/{rel}": (size, md5) for rel, (_, size, md5) in transcoded.items()}
 
+    def repair_mod_files(self, source_zip_path, device_folder_path, push_names, delete_names, log_func, transcode=None):
+        """Delta repair of an installed mod: re-pushes only the given zip members (transcoded as at install) and deletes the given extra files."""
+        device_folder_path = device_folder_path.rstrip('/')
+        for i in range(0, len(delete_names), 50):
+            self.send_adb_command("shell rm -f " + " ".join(quote_device_path(f"{device_folder_path}/{n}") for n in delete_names[i:i + 50]), log_func)
+        if not push_names: return
+        temp_dir = tempfile.mkdtemp(prefix="smx_repair_")
+        try:
+            with zipfile.ZipFile(source_zip_path, 'r') as zip_ref:
+                for name in push_names: zip_ref.extract(name, temp_dir)
+            transcoded = self.controller.transcoder.transcode_files([(os.path.join(temp_dir, n), n) for n in push_names], transcode, log_func) if transcode else {}
+            self._make_device_dirs(sorted({f"{device_folder_path}/{n.rsplit('/', 1)[0]}" for n in push_names if '/' in n}), log_func)
+            self._push_files([(transcoded[n][0] if n in transcoded else os.path.join(temp_dir, n), n) for n in push_names], device_folder_path)
         finally:
-            log_func(f"  - Cleaning up temporary files...")
             shutil.rmtree(temp_dir)
 
+    def _push_files(self, files, device_root, on_pushed=None, max_command_length=6000):
+        """
+        Pushes (local path, path relative to device_root) files with few adb processes: files for
+        the same device folder that keep their local name go in one `adb push a b c folder/` of up
+        to PUSH_BATCH_FILES files and PUSH_BATCH_BYTES (and the command-line limit), and renamed
+        ones (transcoder outputs) one at a time. The device folders must exist. on_pushed(batch)
+        runs only once a batch's exit code shows it landed; a failed push raises IOError.
+        """
+        by_folder, commands = {}, []
+        for local_path, rel_path in files:
+            folder, _, name = rel_path.rpartition('/')
+            if os.path.basename(local_path) == name: by_folder.setdefault(folder, []).append((local_path, rel_path))
+            else: commands.append(([(local_path, rel_path)], f"{device_root}/{rel_path}"))
+        for folder, group in by_folder.items():
+            destination = f"{device_root}/{folder}/" if folder else f"{device_root}/"
+            batch, length, size = [], len(destination), 0
+            for item in group:
+                item_size = os.path.getsize(item[0])
+                if batch and (len(batch) >= PUSH_BATCH_FILES or length + len(item[0]) + 3 > max_command_length or size + item_size > PUSH_BATCH_BYTES):
+                    commands.append((batch, destination))
+                    batch, length, size = [], len(destination), 0
+                batch.append(item)
+                length += len(item[0]) + 3
+                size += item_size
+            commands.append((batch, destination))
+        cancel_token = get_current_cancel_token()
+        for batch, destination in commands:
+            cancel_token.raise_if_cancelled()
+            # Host-side quoting: adb receives these as arguments, not through the device shell.
+            sources = " ".join(f'"{local}"' for local, _ in batch)
+            returncode, _, stderr = self._run(f'push {sources} "{destination}"', LANE_BULK)
+            if returncode: raise IOError(f"Failed to push to '{destination}': {(stderr or '').strip() or f'exit code {returncode}'}")
+            if on_pushed: on_pushed(batch)
+
+    def _make_device_dirs(self, device_dirs, log_func, max_command_length=6000):
+        """Creates device directories with as few `mkdir -p` calls as the command-line length allows."""
+        batches, length = [[]], 0
+        for path in device_dirs:
+            if batches[-1] and length + len(path) + 3 > max_command_length: batches.append([]); length = 0
+            batches[-1].append(path)
+            length += len(path) + 3
+        for batch in batches:
+            if batch: self.send_adb_command("shell mkdir -p " + " ".join(quote_device_path(p) for p in batch), log_func)
+
     def delete_device_folder(self, folder_path, log_func):
-        self.send_adb_command(f"shell rm -r \"{folder_path}\"", log_func)
+        self.send_adb_command(f"shell rm -r {quote_device_path(folder_path)}", log_func, lane=LANE_BULK)
 
-    def send_adb_command(self, command, log_func):
+    def _communicate(self, command, lane, timeout=None):
+        """Runs one adb command through the device scheduler's lane and returns (stdout, stderr)."""
+        return self._run(command, lane, timeout)[1:]
+
+    def _run(self, command, lane, timeout=None):
+        """Like _communicate, but returns (returncode, stdout, stderr)."""
+        full_command = f'"{self.controller.ADB_PATH}" {command}'
+        def run():
+            process = subprocess.Popen(full_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW, encoding='utf-8')
+            try: stdout, stderr = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+            return process.returncode, stdout, stderr
+        return self.get_scheduler().run(lane, run)
+
+    def send_adb_command(self, command, log_func, lane=LANE_CONTROL):
         try:
             adb_path = self.controller.ADB_PATH
             if not adb_path:
                 log_func("ERROR: ADB Path is not set. Cannot send command.")
                 return
                 
-            full_command = f'"{adb_path}" {command}'
-            process = subprocess.Popen(full_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW, encoding='utf-8')
-            stdout, stderr = process.communicate()
+            stdout, stderr = self._communicate(command, lane)
             if stdout: log_func(stdout.strip())
             if stderr and "No such file or directory" not in stderr:
                 log_func(f"ERROR: {stderr.strip()}")
@@ -120,15 +361,65 @@ class AdbHandler:
             log_func(f"Failed to run command: {e}")
             raise e
 
-    def send_adb_command_with_output(self, command):
+    def run_binary_pipe(self, command, func, write=False):
+        """
+        Runs a binary-streaming adb command (exec-out, or exec-in when write=True) on the bulk
+        lane. func receives the process and reads its stdout or feeds its stdin; if func fails,
+        the process is killed. Raises IOError if adb exits with an error.
+        """
+        full_command = f'"{self.controller.ADB_PATH}" {command}'
+        def run():
+            process = subprocess.Popen(full_command, stdin=subprocess.PIPE if write else subprocess.DEVNULL, stdout=subprocess.DEVNULL if write else subprocess.PIPE, stderr=subprocess.PIPE, creationflags=subprocess.CREATE_NO_WINDOW)
+            try: result = func(process)
+            except BaseException:
+                process.kill()
+                process.communicate()
+                raise
+            _, stderr = process.communicate()
+            if process.returncode: raise IOError(stderr.decode('utf-8', errors='replace').strip() or f"adb exited with code {process.returncode}")
+            return result
+        return self.get_scheduler().run(LANE_BULK, run)
+
+    def stream_adb_command(self, command, on_line, cancel_token=None):
+        """
+        Runs an adb command and hands every stdout/stderr line to on_line as soon as it arrives,
+        so long-running commands (logcat, top) never buffer their whole output. Streams run
+        outside the scheduler lanes since they may never end. Returns the exit code, or None if
+        the command was cancelled through the task's CancelToken.
+        """
+        adb_path = self.controller.ADB_PATH
+        if not adb_path:
+            on_line("ERROR: ADB Path is not set. Cannot send command.")
+            return None
+        cancel_token = cancel_token or get_current_cancel_token()
+        # No shell wrapper, so killing the process really stops adb.
+        process = subprocess.Popen(f'"{adb_path}" {command}', stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW, encoding='utf-8', errors='replace', bufsize=1)
+
+        def pump(stream, prefix):
+            for line in iter(stream.readline, ''): on_line(f"{prefix}{line.rstrip()}")
+            stream.close()
+        readers = [threading.Thread(target=pump, args=(process.stdout, ""), daemon=True), threading.Thread(target=pump, args=(process.stderr, "ERROR: "), daemon=True)]
+        for reader in readers: reader.start()
+
+        while process.poll() is None:
+            if cancel_token.is_cancelled:
+                process.kill()
+                process.wait()
+                for reader in readers: reader.join(timeout=1)
+                on_line("[Cancelled]")
+                return None
+            time.sleep(0.1)
+        for reader in readers: reader.join(timeout=1)
+        return process.returncode
+
+    def send_adb_command_with_output(self, command, lane=LANE_CONTROL, timeout=10):
         try:
             adb_path = self.controller.ADB_PATH
             if not adb_path:
                 return None, "ERROR: ADB Path is not set. Cannot send command."
 
-            full_command = f'"{adb_path}" {command}'
-            process = subprocess.Popen(full_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW, encoding='utf-8')
-            stdout, stderr = process.communicate(timeout=10)
+            # Bulk transfers are bounded by their size, not by the control timeout.
+            stdout, stderr = self._communicate(command, lane, timeout=timeout if lane == LANE_CONTROL else None)
             return stdout, stderr
         except Exception as e:
             return None, str(e)
\ No newline at end of file
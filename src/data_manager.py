@@ -5,14 +5,19 @@ from tkinter import messagebox
 import zipfile
 import hashlib
 from pathlib import Path
+from src.search_index import SearchIndex
+from src.zip_index import ZipIndex
+from src.mod_store import ModStore
+from src.mod_layout import REQUIRED_SOUNDS, REQUIRED_SUIT_FILES
+from src.adb_handler import quote_device_path
 
 CATEGORY_PREFIX = "c_"
-REQUIRED_SOUNDS = ["engine.wav", "high.wav", "idle.wav", "low.wav"]
-REQUIRED_SUIT_FILES = {
-    "icon": "icon.jpg",
-    "gear": "gear_suit.png",
-    "normal": "gear_suit_normal.png" # Optional, special handling
-}
+MOD_FOLDER_PATTERN = re.compile(r'^mod_(\d+)_(.*)$')
+ZIP_INDEX_FILE = "zip_index.json"
+
+def device_safe_name(zip_path):
+    """The zip-derived part of a managed device folder name (mod_<index>_<safe name>)."""
+    return re.sub(r'[^\w.-]', '_', os.path.splitext(os.path.basename(zip_path))[0])
 
 class DataManager:
     def __init__(self, controller):
@@ -20,10 +25,21 @@ class DataManager:
         self.local_data = {}
         self.managed_device_data = {}
         self.unmanaged_device_data = []
+        self.search_index = SearchIndex()
+        self.zip_index = ZipIndex(ZIP_INDEX_FILE)
+        self.mod_store = ModStore()
+        self.relinked_paths = [] # Mappings moved to a new zip path by fingerprint during the current scan
 
     def refresh_all(self, scan_device=True):
         # This is the single source of truth for local file scanning.
+        self.zip_index.begin_scan()
+        self.relinked_paths = []
         self.local_data = self._scan_all_local_libs()
+        self.zip_index.end_scan()
+        added, updated, removed = self.search_index.apply_scan(self.local_data)
+        if added or updated or removed:
+            print(f"INFO: Search index updated (+{added} ~{updated} -{removed}, {len(self.search_index.entries)} mods).")
+        self._finish_fingerprint_links()
         
         if scan_device:
             self.managed_device_data, self.unmanaged_device_data = self._get_all_device_mods()
@@ -115,11 +131,15 @@ class DataManager:
             with zipfile.ZipFile(mod_zip_path, 'r') as zip_ref:
                 namelist = zip_ref.namelist()
                 if not namelist: return None
+                entry = self.zip_index.update_from_zip(mod_zip_path, zip_ref)
                 files_in_zip = {os.path.basename(f).lower(): f for f in namelist if os.path.basename(f)}
-                status = "Installed" if mod_zip_path in self.controller.mod_mappings else "Not Installed"
+                mapping = self.controller.mod_mappings.get(mod_zip_path) or self._relink_by_fingerprint(mod_zip_path, entry['fingerprint'])
+                status = "Not Installed" if mapping is None else "Disabled" if mapping.get('parked') else "Installed"
                 mod_details = { 
                     "name": mod_name, "full_path": mod_zip_path, "file_count": len(namelist), 
-                    "preview_path": None, "icon_path": None, "status": status, "library_type": lib_type
+                    "preview_path": None, "icon_path": None, "status": status, "library_type": lib_type,
+                    "layout_problems": self.zip_index.get_layout_problems(mod_zip_path, self.controller.get_layout_type(lib_type)),
+                    "integrity_error": self.controller.integrity_checker.get_error(mod_zip_path)
                 }
                 def extract_and_get_path(zip_member_path):
                     unique_prefix = hashlib.md5(mod_zip_path.encode()).hexdigest()[:8]
@@ -150,24 +170,127 @@ class DataManager:
             self.controller.log_to_ui(f"ERROR: Failed to read details from {os.path.basename(mod_zip_path)}: {e}")
             return None
 
+    def _relink_by_fingerprint(self, mod_zip_path, fingerprint):
+        """
+        Finds the mapping of an installed mod whose zip was renamed or moved: same contents
+        fingerprint, and the old path no longer exists. Returns the moved mapping or None.
+        """
+        mappings = self.controller.mod_mappings
+        old_path, info = mappings.get_by_fingerprint(fingerprint)
+        if old_path is None or old_path == mod_zip_path or os.path.exists(old_path): return None
+        mappings.rekey(old_path, mod_zip_path)
+        self.relinked_paths.append((old_path, mod_zip_path))
+        return mappings[mod_zip_path]
+
+    def _finish_fingerprint_links(self):
+        """After a scan: fixes the library/category of re-linked mappings, fingerprints older mappings and reports duplicates."""
+        mappings = self.controller.mod_mappings
+        for old_path, new_path in self.relinked_paths:
+            library, category = self.search_index.locate(new_path)
+            mappings.update_fields(new_path, library=library, category=category)
+            self.controller.log_to_ui(f"INFO: Re-linked installed mod '{os.path.basename(old_path)}' to '{new_path}'.")
+        for path, info in list(mappings.items()):
+            if 'fingerprint' not in info and path in self.zip_index.zips:
+                mappings.update_fields(path, fingerprint=self.zip_index.zips[path]['fingerprint'])
+        duplicates = self.zip_index.get_duplicate_groups()
+        if duplicates:
+            self.controller.log_to_ui(f"INFO: {sum(len(g) for g in duplicates)} mod zip(s) in {len(duplicates)} group(s) have identical contents (use 'dup:' in Contains file... to list them).")
+
     def _get_all_device_mods(self):
         log_func = self.controller.log_to_ui
         log_func("\n--- Scanning Device For Mods ---")
         target_dir = self.controller.full_mods_path_var.get()
         device_folders = self.controller.adb.list_device_files(target_dir)
         if device_folders is None: return {}, []
-        mapped_device_folders = {v['device_folder'] for v in self.controller.mod_mappings.values()}
-        orphaned_keys = [lp for lp, mi in self.controller.mod_mappings.items() if mi['device_folder'] not in mapped_device_folders]
-        if orphaned_keys:
-            log_func(f"Found {len(orphaned_keys)} orphaned mapping(s). Pruning...")
-            for key in orphaned_keys: del self.controller.mod_mappings[key]
-            self.controller.save_mappings()
+        self._reconcile_mappings(device_folders, target_dir, log_func)
         unmanaged_folders = [f for f in device_folders if not f.startswith("mod_")]
-        unmanaged_mod_details = [self._get_unmanaged_mod_details(folder) for folder in unmanaged_folders]
+        progress = self.controller.start_transfer_progress("Pulling unmanaged mod previews")
+        try: unmanaged_mod_details = [self._get_unmanaged_mod_details(folder, progress) for folder in unmanaged_folders]
+        finally: self.controller.end_transfer_progress()
         managed_mod_details = self._build_managed_device_data()
         log_func("--- Device Scan Complete ---")
         return (managed_mod_details, [d for d in unmanaged_mod_details if d])
 
+    def _reconcile_mappings(self, device_folders, target_dir, log_func):
+        """
+        Patches the mappings against one listing of the Mods folder, touching only the entries
+        that disagree with it:
+          - a mapped folder missing on the device drops its mapping (parked mods and interrupted
+            installs are not in the listing, and an empty listing, which is also what a wrong
+            Mods path or a failed listing looks like, prunes nothing);
+          - an unmapped mod_N_ folder is adopted if exactly one unmapped local zip has its name;
+          - a mapping whose index differs from its folder's N is corrected;
+          - folders sharing an index N are offered to the user for renaming to free indices.
+        """
+        mappings = self.controller.mod_mappings
+        on_device = set(device_folders)
+        local_mods = {mod['full_path']: mod for lib in self.local_data.values() for cat in lib.values() for mod in cat}
+        journal = self.controller.transfer_journal
+        journaled = set(journal.pending())
+        in_progress = {journal.get(p)['device_folder'] for p in journaled}
+        changed_status = {}
+
+        missing = [p for p, info in mappings.items() if not info.get('parked') and p not in journaled and info['device_folder'] not in on_device]
+        if missing and not on_device:
+            log_func(f"Reconcile: the Mods folder listing is empty; keeping all {len(missing)} mapping(s). Check the Mods path if your mods are missing.")
+        elif missing:
+            log_func(f"Reconcile: {len(missing)} mapped mod folder(s) are missing on the device; removing their mappings.")
+            mappings.delete_many(missing)
+            changed_status.update(dict.fromkeys(missing, "Not Installed"))
+
+        folders_by_index = {}
+        for folder in device_folders:
+            match = MOD_FOLDER_PATTERN.match(folder)
+            if match: folders_by_index.setdefault(int(match.group(1)), []).append(folder)
+
+        unmapped = [f for fs in folders_by_index.values() for f in fs if f not in mappings.by_device_folder and f not in in_progress]
+        if unmapped:
+            paths_by_safe_name = {}
+            for path in local_mods:
+                if path not in mappings: paths_by_safe_name.setdefault(device_safe_name(path), []).append(path)
+            for folder in unmapped:
+                index, safe_name = MOD_FOLDER_PATTERN.match(folder).groups()
+                candidates = paths_by_safe_name.get(safe_name, [])
+                if len(candidates) != 1:
+                    log_func(f"Reconcile: '{folder}' has no {'unambiguous ' if candidates else ''}local zip; leaving it unmanaged.")
+                    continue
+                path = candidates.pop()
+                library, category = self.search_index.locate(path)
+                mappings[path] = {'index': int(index), 'device_folder': folder, 'library': library, 'category': category}
+                changed_status[path] = "Installed"
+                log_func(f"Reconcile: adopted '{folder}' as '{os.path.basename(path)}'.")
+
+        # Free indices also skip parked mods and interrupted installs, which are not in this listing.
+        used = set(folders_by_index) | {m.get('index') for m in mappings.values()} | {journal.get(p)['index'] for p in journaled}
+        next_free, renames = 0, []
+        for index, folders in folders_by_index.items():
+            for folder in sorted(folders)[1:]:
+                while next_free in used: next_free += 1
+                used.add(next_free)
+                renames.append((folder, f"mod_{next_free}_{MOD_FOLDER_PATTERN.match(folder).group(2)}", next_free))
+                log_func(f"Reconcile: index {index} is used by {len(folders)} folders, including '{folder}'.")
+            for folder in folders:
+                path = mappings.by_device_folder.get(folder)
+                if path and mappings[path].get('index') != index: mappings.update_fields(path, index=index)
+
+        # The local scan already set statuses from the old mappings; patch just the mods that changed.
+        for path, status in changed_status.items():
+            if path in local_mods: local_mods[path]['status'] = status
+        if renames: self.controller.after(0, self.controller.confirm_folder_renames, target_dir, renames)
+
+    def rename_device_folders(self, target_dir, renames, log_func):
+        """Renames colliding mod_N_ folders to free indices (see _reconcile_mappings) and moves their mappings along."""
+        mappings = self.controller.mod_mappings
+        adb = self.controller.adb
+        for folder, renamed, index in renames:
+            if adb.directory_exists(f"{target_dir}{renamed}"):
+                log_func(f"'{renamed}' already exists on the device; leaving '{folder}' as it is.")
+                continue
+            log_func(f"Renaming '{folder}' to '{renamed}'.")
+            adb.send_adb_command(f"shell mv {quote_device_path(target_dir + folder)} {quote_device_path(target_dir + renamed)}", log_func)
+            path = mappings.by_device_folder.get(folder)
+            if path: mappings.update_fields(path, device_folder=renamed, index=index)
+
     # --- THE FIX IS HERE ---
     def _build_managed_device_data(self):
         """
@@ -201,7 +324,7 @@ class DataManager:
                 
         return managed_libraries
 
-    def _get_unmanaged_mod_details(self, folder_name):
+    def _get_unmanaged_mod_details(self, folder_name, progress=None):
         target_dir = self.controller.full_mods_path_var.get()
         device_unmanaged_base_path = f"{target_dir}{folder_name}"
         top_level_contents = self.controller.adb.list_device_files(device_unmanaged_base_path)
@@ -227,12 +350,14 @@ class DataManager:
                 if filename.lower() in files_on_device:
                     device_path = f"{device_mod_path}/{files_on_device[filename.lower()]}"
                     local_path = os.path.join(self.controller.TEMP_ICON_DIR, f"unmanaged_{safe_mod_name}_{key}.png")
-                    if self.controller.adb.pull_file(device_path, local_path): suit_files[key] = local_path
+                    if progress: progress.add_total(0, 1)
+                    if self.controller.adb.pull_file(device_path, local_path, progress): suit_files[key] = local_path
                 else: suit_files[key] = None
             mod_data['suit_files'] = suit_files
         preview_name = next((f for f in ["preview.jpg", "preview.png"] if f in files_on_device), None)
         if preview_name:
             device_path = f"{device_mod_path}/{preview_name}"
             local_path = os.path.join(self.controller.TEMP_ICON_DIR, f"unmanaged_{safe_mod_name}_preview.jpg")
-            if self.controller.adb.pull_file(device_path, local_path): mod_data['preview_path'] = local_path
+            if progress: progress.add_total(0, 1)
+            if self.controller.adb.pull_file(device_path, local_path, progress): mod_data['preview_path'] = local_path
         return mod_data
\ No newline at end of file
@@ -0,0 +1,111 @@
+# --- Filename: device_backup.py ---
+import os
+import json
+import time
+import zlib
+import tarfile
+import zipfile
+import tempfile
+import posixpath
+from src.task_executor import get_current_cancel_token
+
+MANIFEST_SUFFIX = ".manifest.json"
+SPOOL_BYTES = 16 * 1024 * 1024
+CHUNK_BYTES = 1024 * 1024
+
+class DeviceBackup:
+    """
+    Streams the device Mods folder into a (optionally gzip-compressed) tar on the PC through
+    `adb exec-out tar`, and back through `adb exec-in tar`, without staging a copy anywhere.
+
+    Files whose CRC32 and size match a member of an indexed local library zip are not stored;
+    the archive's sidecar manifest (<archive>.manifest.json) records where to read them from
+    on restore instead.
+    """
+    def __init__(self, adb, zip_index):
+        self.adb = adb
+        self.zip_index = zip_index
+
+    @staticmethod
+    def _split_mods_path(mods_path):
+        mods_path = mods_path.rstrip('/')
+        return posixpath.dirname(mods_path), posixpath.basename(mods_path)
+
+    def backup(self, mods_path, archive_path, compress_level=6, dedupe=True, progress=None, log_func=print):
+        parent, folder = self._split_mods_path(mods_path)
+        if progress:
+            sizes = self.adb.get_device_file_digests(mods_path, with_md5=False)
+            progress.add_total(sum(d['size'] for d in sizes.values()), len(sizes))
+        mode = "w:gz" if compress_level > 0 else "w"
+        options = {'compresslevel': compress_level} if compress_level > 0 else {}
+        refs, stats = [], {'files': 0, 'bytes': 0, 'stored_bytes': 0}
+        cancel_token = get_current_cancel_token()
+
+        def consume(process):
+            with tarfile.open(archive_path, mode, **options) as out, tarfile.open(fileobj=process.stdout, mode='r|') as src:
+                for member in src:
+                    cancel_token.raise_if_cancelled()
+                    if not member.isfile():
+                        out.addfile(member)
+                        continue
+                    with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+                        crc, data = 0, src.extractfile(member)
+                        for chunk in iter(lambda: data.read(CHUNK_BYTES), b''):
+                            crc = zlib.crc32(chunk, crc)
+                            spool.write(chunk)
+                        source = self.zip_index.find_member(crc, member.size) if dedupe else None
+                        if source:
+                            refs.append({'name': member.name, 'zip': source[0], 'member': source[1], 'size': member.size, 'crc': crc, 'mtime': member.mtime, 'mode': member.mode})
+                        else:
+                            spool.seek(0)
+                            out.addfile(member, spool)
+                            stats['stored_bytes'] += member.size
+                    stats['files'] += 1
+                    stats['bytes'] += member.size
+                    if progress: progress.file_done(member.size)
+
+        log_func(f"  - Streaming '{mods_path}' from the device...")
+        try: self.adb.run_binary_pipe(f'exec-out tar -cf - -C "{parent}" "{folder}"', consume)
+        except BaseException:
+            for path in (archive_path, archive_path + MANIFEST_SUFFIX):
+                if os.path.exists(path): os.remove(path)
+            raise
+        manifest = {'version': 1, 'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'source': mods_path, **stats, 'refs': refs}
+        with open(archive_path + MANIFEST_SUFFIX, 'w', encoding='utf-8') as f: json.dump(manifest, f, indent=2)
+        return manifest
+
+    def restore(self, archive_path, mods_path, progress=None, log_func=print):
+        manifest_path = archive_path + MANIFEST_SUFFIX
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f: manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise IOError(f"Backup manifest '{manifest_path}' is missing or unreadable: {e}")
+        missing = {ref['zip'] for ref in manifest['refs'] if not os.path.exists(ref['zip'])}
+        if missing: raise IOError(f"{len(missing)} local zip(s) referenced by this backup no longer exist, e.g. '{next(iter(missing))}'.")
+        if progress: progress.add_total(manifest['bytes'], manifest['files'])
+        parent, _ = self._split_mods_path(mods_path)
+        cancel_token = get_current_cancel_token()
+
+        def feed(process):
+            with tarfile.open(fileobj=process.stdin, mode='w|') as out:
+                with tarfile.open(archive_path, 'r|*') as src:
+                    for member in src:
+                        cancel_token.raise_if_cancelled()
+                        out.addfile(member, src.extractfile(member) if member.isfile() else None)
+                        if progress and member.isfile(): progress.file_done(member.size)
+                open_zips = {}
+                try:
+                    for ref in manifest['refs']:
+                        cancel_token.raise_if_cancelled()
+                        if ref['zip'] not in open_zips: open_zips[ref['zip']] = zipfile.ZipFile(ref['zip'], 'r')
+                        info = tarfile.TarInfo(ref['name'])
+                        info.size, info.mtime, info.mode = ref['size'], ref['mtime'], ref['mode']
+                        with open_zips[ref['zip']].open(ref['member']) as data: out.addfile(info, data)
+                        if progress: progress.file_done(ref['size'])
+                finally:
+                    for zip_ref in open_zips.values(): zip_ref.close()
+            process.stdin.close()
+
+        log_func(f"  - Streaming backup back to '{parent}'...")
+        self.adb.run_binary_pipe(f'exec-in tar -xf - -C "{parent}"', feed, write=True)
+        return manifest
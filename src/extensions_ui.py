@@ -50,7 +50,7 @@ class ExtensionsFrame(ttk.Frame):
 
     def refresh_online_list(self):
         self.status_label.config(text="Fetching from GitHub...")
-        self.controller.run_in_thread(self._threaded_fetch_online)
+        self.controller.submit_task(self._threaded_fetch_online, key="fetch_extensions")
 
     def _threaded_fetch_online(self):
         self.available_extensions = self.github_handler.get_available_extensions()
@@ -0,0 +1,140 @@
+# --- Filename: extraction_cache.py ---
+import os
+import shutil
+import zipfile
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+CHUNK_BYTES = 1024 * 1024
+
+class ExtractionCache:
+    """
+    A content-addressed cache of extracted mod trees on disk, one folder per zip fingerprint,
+    so a mod reinstalled (e.g. flipped between loadouts) is pushed without unzipping it again.
+    Bounded by max_bytes with least-recently-used eviction; folder mtimes record last use, so
+    the order survives restarts. A tree checked out for a push is never evicted under it.
+    """
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.sizes = None # fingerprint -> bytes, loaded on first use
+        self.in_use = {} # fingerprint -> checkout count
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.sizes is not None: return
+        self.sizes = {}
+        if not os.path.isdir(self.root): return
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.endswith('.tmp'): shutil.rmtree(path, ignore_errors=True) # Left by an interrupted extraction
+            elif os.path.isdir(path): self.sizes[name] = _tree_size(path)
+
+    def contains(self, fingerprint):
+        with self._lock:
+            self._load()
+            return bool(fingerprint) and self.max_bytes > 0 and fingerprint in self.sizes
+
+    @contextmanager
+    def checkout(self, zip_path, fingerprint, extract=None):
+        """
+        Yields a folder holding the zip's extracted contents; the caller must not modify it.
+        extract(zip_path, dest) unpacks on a miss (extract_zip by default). Without a fingerprint,
+        or with the cache disabled, the zip is extracted to a temporary folder removed afterwards.
+        """
+        extract = extract or extract_zip
+        if not fingerprint or self.max_bytes <= 0:
+            temp_dir = tempfile.mkdtemp(prefix="smx_mod_")
+            try:
+                extract(zip_path, temp_dir)
+                yield temp_dir
+            finally: shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        path = os.path.join(self.root, fingerprint)
+        with self._lock:
+            self._load()
+            hit = fingerprint in self.sizes
+            self.in_use[fingerprint] = self.in_use.get(fingerprint, 0) + 1
+            if hit: self.hits += 1
+            else: self.misses += 1
+        try:
+            if hit: os.utime(path)
+            else:
+                os.makedirs(self.root, exist_ok=True)
+                temp_dir = tempfile.mkdtemp(prefix=f"{fingerprint}_", suffix=".tmp", dir=self.root)
+                try:
+                    extract(zip_path, temp_dir)
+                    size = _tree_size(temp_dir)
+                    with self._lock:
+                        if fingerprint not in self.sizes: # Another push of the same contents may have finished first
+                            os.replace(temp_dir, path)
+                            self.sizes[fingerprint] = size
+                finally: shutil.rmtree(temp_dir, ignore_errors=True)
+            yield path
+        finally:
+            with self._lock:
+                self.in_use[fingerprint] -= 1
+                if not self.in_use[fingerprint]: del self.in_use[fingerprint]
+            self.evict()
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            self._load()
+            idle = sorted((f for f in self.sizes if f not in self.in_use), key=lambda f: _mtime(os.path.join(self.root, f)))
+            total = sum(self.sizes.values())
+            for fingerprint in idle:
+                if total <= self.max_bytes: break
+                shutil.rmtree(os.path.join(self.root, fingerprint), ignore_errors=True)
+                total -= self.sizes.pop(fingerprint)
+
+    def get_stats(self):
+        with self._lock:
+            return {'entries': len(self.sizes or {}), 'bytes': sum((self.sizes or {}).values()), 'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+def extract_zip(zip_path, dest, max_workers=None):
+    """
+    Extracts a zip like extractall, minus __MACOSX/ (never pushed), inflating members on a thread
+    pool: zlib releases the GIL, so large archives decompress on several cores. Each worker has
+    its own handle on the zip and sizes every output file up front before streaming into it.
+    Small archives are extracted serially, where the pool would only add overhead.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        members = [(info, _safe_path(dest, info.filename)) for info in zip_ref.infolist() if not info.filename.startswith('__MACOSX/')]
+    members = [(info, path) for info, path in members if path]
+    for info, path in members: os.makedirs(path if info.is_dir() else os.path.dirname(path), exist_ok=True)
+    files = sorted((m for m in members if not m[0].is_dir()), key=lambda m: m[0].file_size, reverse=True) # Biggest first, so no worker is left with a long tail
+    if sum(info.file_size for info, _ in files) < PARALLEL_MIN_BYTES or len(files) < 2:
+        _extract_members(zip_path, files)
+        return
+    workers = min(len(files), max_workers or min(8, os.cpu_count() or 2))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="unzip") as pool:
+        for future in [pool.submit(_extract_members, zip_path, files[i::workers]) for i in range(workers)]: future.result()
+
+def _extract_members(zip_path, members):
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for info, path in members:
+            with zip_ref.open(info) as src, open(path, 'wb') as out:
+                out.truncate(info.file_size) # Preallocates the file so its blocks are reserved in one go
+                for chunk in iter(lambda: src.read(CHUNK_BYTES), b''): out.write(chunk)
+
+def _safe_path(dest, name):
+    """Maps a member name under dest the way extractall does: no absolute paths, drive letters or '..'."""
+    parts = [p for p in name.replace('\\', '/').split('/') if p not in ('', '.', '..')]
+    if parts and len(parts[0]) == 2 and parts[0][1] == ':': parts = parts[1:]
+    return os.path.join(dest, *parts) if parts else None
+
+def _tree_size(path):
+    return sum(os.path.getsize(os.path.join(root, n)) for root, _, names in os.walk(path) for n in names)
+
+def _mtime(path):
+    try: return os.path.getmtime(path)
+    except OSError: return 0
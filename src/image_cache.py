@@ -0,0 +1,64 @@
+# --- Filename: image_cache.py ---
+import os
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+class ImageCache:
+    """
+    An application-wide LRU of decoded thumbnails (PhotoImages), bounded by an approximate
+    byte budget. Keys are (path, size, mtime) so an edited file is never served stale.
+    Must only be used from the Tk main thread.
+    """
+    BYTES_PER_PIXEL = 4
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict() # key -> (photo, byte_cost)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, size):
+        """Returns a PhotoImage thumbnail for path fitting within size, decoding it only on a miss."""
+        try: mtime = os.path.getmtime(path)
+        except OSError: return None
+        key = (path, size, mtime)
+        entry = self.entries.get(key)
+        if entry:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        img = Image.open(path)
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        photo = ImageTk.PhotoImage(img)
+        cost = img.width * img.height * self.BYTES_PER_PIXEL
+        self.entries[key] = (photo, cost)
+        self.current_bytes += cost
+        self._evict()
+        return photo
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self):
+        # Evicted images stay alive only as long as a widget still displays them.
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, cost) = self.entries.popitem(last=False)
+            self.current_bytes -= cost
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries), 'bytes': self.current_bytes, 'max_bytes': self.max_bytes,
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0
+        }
@@ -0,0 +1,93 @@
+# --- Filename: install_planner.py ---
+import os
+import zipfile
+
+ACTION_INSTALL = "install"
+ACTION_UPDATE = "update"
+ACTION_RESUME = "resume"
+ACTION_ENABLE = "enable"
+ACTION_DUPLICATE = "duplicate"
+ACTION_SKIP = "skip"
+ACTION_INVALID = "invalid"
+
+class InstallPlan:
+    """The outcome of planning an install batch: what each selected mod needs and what the batch will cost."""
+    def __init__(self, items, bytes_per_second):
+        self.items = items # [{'path', 'action', 'reason', 'bytes', 'files'}]
+        self.bytes_per_second = bytes_per_second
+
+    @property
+    def needed(self): return [i for i in self.items if i['action'] not in (ACTION_SKIP, ACTION_DUPLICATE, ACTION_INVALID)]
+
+    @property
+    def skipped(self): return [i for i in self.items if i['action'] in (ACTION_SKIP, ACTION_DUPLICATE)]
+
+    @property
+    def invalid(self): return [i for i in self.items if i['action'] == ACTION_INVALID]
+
+    @property
+    def total_bytes(self): return sum(i['bytes'] for i in self.needed)
+
+    @property
+    def total_files(self): return sum(i['files'] for i in self.needed)
+
+    @property
+    def estimated_seconds(self):
+        return self.total_bytes / self.bytes_per_second if self.bytes_per_second else None
+
+def measure_push_throughput(metrics_entries):
+    """Bytes per second over the recorded push transfers, or None before anything was measured."""
+    pushes = [e for e in metrics_entries if e.get('direction') == 'push' and e.get('seconds')]
+    seconds = sum(e['seconds'] for e in pushes)
+    return sum(e['bytes'] for e in pushes) / seconds if seconds > 0 else None
+
+def install_record(zip_index, path):
+    """The fields stored in a mod's mapping at install time, used later to tell if the zip changed."""
+    st = os.stat(path)
+    return {'zip_size': st.st_size, 'zip_mtime': st.st_mtime, 'fingerprint': zip_index.get_fingerprint(path)}
+
+def is_install_current(mapping, zip_index, path):
+    """True if the zip is unchanged since the mapping's install record (same size/mtime, or same contents)."""
+    if 'zip_size' not in mapping: return False
+    st = os.stat(path)
+    if (st.st_size, st.st_mtime) == (mapping['zip_size'], mapping['zip_mtime']): return True
+    return zip_index.get_fingerprint(path) == mapping.get('fingerprint')
+
+def plan_installs(paths, mappings, zip_index, journal, bytes_per_second=None, layout_problems=None):
+    """
+    Decides what each selected mod needs before anything touches the device. A mapped mod is
+    skipped if its zip still has the size and mtime recorded at install time, or if its
+    contents fingerprint matches (e.g. the same zip downloaded again). A parked (disabled) mod
+    whose zip is unchanged only needs to be moved back. A zip whose contents are already
+    installed from another path (a duplicate in another library) is skipped too.
+    layout_problems(path) returns why a zip cannot be installed (see mod_layout); those are rejected.
+    """
+    items = []
+    for path in paths:
+        try: num_bytes, files = zip_index.get_payload_size(path)
+        except (OSError, zipfile.BadZipFile):
+            items.append({'path': path, 'action': ACTION_INSTALL, 'reason': "unreadable zip", 'bytes': 0, 'files': 0})
+            continue
+        item = {'path': path, 'bytes': num_bytes, 'files': files}
+        mapping = mappings.get(path)
+        problems = layout_problems(path) if layout_problems else []
+        if problems:
+            item.update(action=ACTION_INVALID, reason="; ".join(problems), bytes=0, files=0)
+        elif journal.get(path):
+            item.update(action=ACTION_RESUME, reason="interrupted install")
+        elif mapping is None:
+            twin_path, _ = mappings.get_by_fingerprint(zip_index.get_fingerprint(path))
+            if twin_path and os.path.exists(twin_path):
+                item.update(action=ACTION_DUPLICATE, reason=f"same contents already installed from '{twin_path}'")
+            else:
+                item.update(action=ACTION_INSTALL, reason="not installed")
+        elif 'zip_size' not in mapping:
+            item.update(action=ACTION_UPDATE, reason="no install record")
+        elif not is_install_current(mapping, zip_index, path):
+            item.update(action=ACTION_UPDATE, reason="zip changed")
+        elif mapping.get('parked'):
+            item.update(action=ACTION_ENABLE, reason="parked on the device", bytes=0, files=0)
+        else:
+            item.update(action=ACTION_SKIP, reason="unchanged since install")
+        items.append(item)
+    return InstallPlan(items, bytes_per_second)
@@ -0,0 +1,82 @@
+# --- Filename: log_sink.py ---
+import queue
+import logging
+import logging.handlers
+import tkinter as tk
+
+DRAIN_INTERVAL_MS = 100
+MAX_LINES_PER_DRAIN = 2000
+
+class LogSink:
+    """
+    A thread-safe, batched writer for a read-only ScrolledText log. write() only puts the line
+    on a queue and may be called from any thread; the Tk main thread drains the queue on a timer
+    and inserts everything that arrived in one go. The widget is trimmed to max_lines, and lines
+    can optionally be spilled to a rotating log file.
+    """
+    def __init__(self, text_widget, max_lines=5000, spill_path=None, name="log"):
+        self.text_widget = text_widget
+        self.max_lines = max_lines
+        self.line_count = 0
+        self.pending = queue.SimpleQueue()
+        self.spill_logger = None
+        self.name = name
+        self.set_spill_path(spill_path)
+        self.text_widget.after(DRAIN_INTERVAL_MS, self._drain)
+
+    def write(self, msg):
+        self.pending.put(str(msg).strip())
+
+    def set_max_lines(self, max_lines):
+        self.max_lines = max(1, max_lines)
+
+    def set_spill_path(self, spill_path, max_bytes=1024 * 1024, backup_count=3):
+        if self.spill_logger:
+            for handler in list(self.spill_logger.handlers):
+                self.spill_logger.removeHandler(handler)
+                handler.close()
+            self.spill_logger = None
+        if not spill_path: return
+        try:
+            handler = logging.handlers.RotatingFileHandler(spill_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        except OSError as e:
+            print(f"WARNING: Could not open log file '{spill_path}': {e}")
+            return
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.spill_logger = logging.getLogger(f"smx_mod_manager.{self.name}")
+        self.spill_logger.propagate = False
+        self.spill_logger.setLevel(logging.INFO)
+        self.spill_logger.addHandler(handler)
+
+    def clear(self):
+        self.text_widget.text.config(state='normal')
+        self.text_widget.delete('1.0', tk.END)
+        self.text_widget.text.config(state='disabled')
+        self.line_count = 0
+
+    def _drain(self):
+        lines = []
+        try:
+            while len(lines) < MAX_LINES_PER_DRAIN: lines.append(self.pending.get_nowait())
+        except queue.Empty: pass
+
+        try:
+            if lines: self._insert(lines)
+            # Drain again straight away if we hit the per-batch cap, otherwise wait for the next tick.
+            self.text_widget.after(1 if len(lines) >= MAX_LINES_PER_DRAIN else DRAIN_INTERVAL_MS, self._drain)
+        except tk.TclError:
+            pass # The widget was destroyed; stop draining.
+
+    def _insert(self, lines):
+        if self.spill_logger:
+            for line in lines: self.spill_logger.info(line)
+        line_total = sum(line.count('\n') + 1 for line in lines)
+        self.text_widget.text.config(state='normal')
+        self.text_widget.insert(tk.END, "\n".join(lines) + "\n")
+        self.line_count += line_total
+        excess = self.line_count - self.max_lines
+        if excess > 0:
+            self.text_widget.delete('1.0', f'{excess + 1}.0')
+            self.line_count -= excess
+        self.text_widget.see(tk.END)
+        self.text_widget.text.config(state='disabled')
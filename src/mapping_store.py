@@ -0,0 +1,181 @@
+# --- Filename: mapping_store.py ---
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+
+class MappingStore(MutableMapping):
+    """
+    The local zip path -> installed device folder mappings, backed by SQLite instead of a JSON
+    file that was rewritten in full after every mod. It behaves like the old dict (reads come
+    from an in-memory copy), but every assignment or deletion is its own atomic transaction,
+    so a crash can never leave a half-written file. Secondary indexes by device_folder, by
+    content fingerprint and by library/category make reverse lookups O(1).
+
+    Values are plain dicts; always assign a new dict back (mappings[p] = {...}) rather than
+    mutating the one returned, or the change will not be persisted.
+    """
+    def __init__(self, db_path, legacy_json_path=None):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS mappings (
+                    path TEXT PRIMARY KEY,
+                    device_folder TEXT NOT NULL,
+                    library TEXT,
+                    category TEXT,
+                    data TEXT NOT NULL
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_mappings_device_folder ON mappings(device_folder)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_mappings_location ON mappings(library, category)")
+
+        self._data = {}
+        self.by_device_folder = {} # device_folder -> path
+        self.by_fingerprint = {} # zip content fingerprint -> path
+        self.by_location = {} # (library, category) -> {path}
+        for path, data in self.conn.execute("SELECT path, data FROM mappings"):
+            self._index(path, json.loads(data))
+        if legacy_json_path: self._migrate_legacy_json(legacy_json_path)
+        self.loadouts = LoadoutStore(self.conn, self._lock)
+
+    def _migrate_legacy_json(self, json_path):
+        if self._data or not os.path.exists(json_path): return
+        try:
+            with open(json_path, 'r') as f: legacy = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"WARNING: Could not migrate '{json_path}': {e}")
+            return
+        self.replace_all(legacy)
+        os.replace(json_path, f"{json_path}.migrated")
+        print(f"INFO: Migrated {len(legacy)} mapping(s) from '{json_path}' to '{self.db_path}'.")
+
+    def _index(self, path, info):
+        self._data[path] = info
+        self.by_device_folder[info['device_folder']] = path
+        if info.get('fingerprint'): self.by_fingerprint[info['fingerprint']] = path
+        self.by_location.setdefault((info.get('library'), info.get('category')), set()).add(path)
+
+    def _unindex(self, path):
+        info = self._data.pop(path, None)
+        if info is None: return
+        if self.by_device_folder.get(info['device_folder']) == path: del self.by_device_folder[info['device_folder']]
+        if info.get('fingerprint') and self.by_fingerprint.get(info['fingerprint']) == path: del self.by_fingerprint[info['fingerprint']]
+        location = (info.get('library'), info.get('category'))
+        paths = self.by_location.get(location)
+        if paths:
+            paths.discard(path)
+            if not paths: del self.by_location[location]
+
+    def _write_row(self, path, info):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO mappings (path, device_folder, library, category, data) VALUES (?, ?, ?, ?, ?)",
+            (path, info['device_folder'], info.get('library'), info.get('category'), json.dumps(info)))
+
+    def __getitem__(self, path):
+        return self._data[path]
+
+    def __setitem__(self, path, info):
+        info = dict(info)
+        with self._lock:
+            with self.conn: self._write_row(path, info)
+            self._unindex(path)
+            self._index(path, info)
+
+    def __delitem__(self, path):
+        with self._lock:
+            if path not in self._data: raise KeyError(path)
+            with self.conn: self.conn.execute("DELETE FROM mappings WHERE path = ?", (path,))
+            self._unindex(path)
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, path):
+        return path in self._data
+
+    def update_fields(self, path, **fields):
+        """Merges fields into an existing mapping and persists it in one transaction."""
+        with self._lock: self[path] = {**self._data[path], **fields}
+
+    def replace_all(self, mappings):
+        """Atomically replaces every mapping (used by the sync recovery tool)."""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM mappings")
+                for path, info in mappings.items(): self._write_row(path, info)
+            self._data, self.by_device_folder, self.by_fingerprint, self.by_location = {}, {}, {}, {}
+            for path, info in mappings.items(): self._index(path, dict(info))
+
+    def delete_many(self, paths):
+        """Deletes several mappings in a single transaction."""
+        with self._lock:
+            paths = [p for p in paths if p in self._data]
+            with self.conn: self.conn.executemany("DELETE FROM mappings WHERE path = ?", [(p,) for p in paths])
+            for path in paths: self._unindex(path)
+
+    def get_by_device_folder(self, device_folder):
+        """Returns (path, mapping) for a device folder, or (None, None)."""
+        path = self.by_device_folder.get(device_folder)
+        return (path, self._data[path]) if path else (None, None)
+
+    def get_by_fingerprint(self, fingerprint):
+        """Returns (path, mapping) for a zip content fingerprint, or (None, None)."""
+        path = self.by_fingerprint.get(fingerprint)
+        return (path, self._data[path]) if path else (None, None)
+
+    def rekey(self, old_path, new_path, **fields):
+        """Moves a mapping (and any loadout references) to a new zip path in one transaction, e.g. after a rename."""
+        with self._lock:
+            info = {**self._data[old_path], **fields}
+            with self.conn:
+                self.conn.execute("DELETE FROM mappings WHERE path = ?", (old_path,))
+                self._write_row(new_path, info)
+                self.loadouts._replace_path(old_path, new_path)
+            self._unindex(old_path)
+            self._index(new_path, info)
+
+    def get_paths_in(self, library, category=None):
+        """Returns the mapped paths recorded under a library (and optionally one category)."""
+        if category is not None: return set(self.by_location.get((library, category), set()))
+        return {p for (lib, _), paths in self.by_location.items() if lib == library for p in paths}
+
+    def close(self):
+        with self._lock: self.conn.close()
+
+class LoadoutStore:
+    """Named sets of mod zip paths, kept in the mappings database so they are saved atomically alongside it."""
+    def __init__(self, conn, lock):
+        self.conn, self._lock = conn, lock
+        with self._lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS loadouts (name TEXT PRIMARY KEY, updated REAL NOT NULL, paths TEXT NOT NULL)")
+
+    def names(self):
+        with self._lock: return [row[0] for row in self.conn.execute("SELECT name FROM loadouts ORDER BY name COLLATE NOCASE")]
+
+    def get(self, name):
+        with self._lock: row = self.conn.execute("SELECT paths FROM loadouts WHERE name = ?", (name,)).fetchone()
+        return set(json.loads(row[0])) if row else None
+
+    def save(self, name, paths):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO loadouts (name, updated, paths) VALUES (?, ?, ?)", (name, time.time(), json.dumps(sorted(paths))))
+
+    def delete(self, name):
+        with self._lock, self.conn: self.conn.execute("DELETE FROM loadouts WHERE name = ?", (name,))
+
+    def _replace_path(self, old_path, new_path):
+        """Rewrites one path in every loadout; the caller holds the lock and the transaction."""
+        for name, paths in self.conn.execute("SELECT name, paths FROM loadouts").fetchall():
+            paths = json.loads(paths)
+            if old_path in paths:
+                updated = sorted({new_path if p == old_path else p for p in paths})
+                self.conn.execute("UPDATE loadouts SET paths = ? WHERE name = ?", (json.dumps(updated), name))
@@ -0,0 +1,31 @@
+# --- Filename: mod_layout.py ---
+import posixpath
+
+REQUIRED_SOUNDS = ["engine.wav", "high.wav", "idle.wav", "low.wav"]
+REQUIRED_SUIT_FILES = {
+    "icon": "icon.jpg",
+    "gear": "gear_suit.png",
+    "normal": "gear_suit_normal.png" # Optional, special handling
+}
+
+def check_layout(member_names, lib_type):
+    """
+    Checks a mod zip's member file names against what push_mod and the game need: everything
+    inside one middleman folder (__MACOSX/ aside), plus the files its library type requires.
+    Returns a list of short problem descriptions; empty if the mod can be installed.
+    """
+    names = [n for n in member_names if not n.startswith('__MACOSX/')]
+    if not names: return ["zip is empty"]
+    problems = []
+    roots = {n.split('/', 1)[0] for n in names if '/' in n}
+    if any('/' not in n for n in names) or len(roots) != 1:
+        problems.append("files must be inside a single folder")
+    basenames = {posixpath.basename(n).lower() for n in names}
+    if lib_type == 'Tracks':
+        if not any(n.endswith('.smxlevel') for n in basenames): problems.append("missing .smxlevel")
+    elif lib_type == 'Sounds':
+        missing = [s for s in REQUIRED_SOUNDS if s not in basenames]
+        if missing: problems.append(f"missing {', '.join(missing)}")
+    elif lib_type == 'Suits':
+        if REQUIRED_SUIT_FILES['gear'] not in basenames: problems.append(f"missing {REQUIRED_SUIT_FILES['gear']}")
+    return problems
@@ -3,10 +3,29 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.scrolled import ScrolledText
-from tkinter import filedialog, font, messagebox
+from tkinter import filedialog, font, messagebox, simpledialog
 import os
 import json
-from src.shared_ui_components import ModListView, ModDisplayItem
+from src.shared_ui_components import ModListView
+from src.log_sink import LogSink
+from src.task_executor import PRIORITY_BULK
+
+class ConsoleTab(ttk.Frame):
+    """One ADB console output pane. Its sink keeps at most max_lines lines, so endless streams stay bounded."""
+    def __init__(self, parent, max_lines):
+        super().__init__(parent)
+        self.output_text = ScrolledText(self, wrap=tk.WORD, autohide=True, height=6)
+        self.output_text.pack(expand=True, fill='both')
+        self.output_text.text.config(state='disabled')
+        self.sink = LogSink(self.output_text, max_lines, name="console")
+        self.handle = None # TaskHandle of the command streaming into this tab
+
+    @property
+    def is_running(self): return self.handle is not None and not self.handle.done.is_set()
+
+SEARCH_DEBOUNCE_MS = 250
+RESULT_BATCH_SIZE = 200
+LOG_FILE_DEBOUNCE_MS = 1000
 
 class ModManagerFrame(ttk.Frame):
     name = "Mod Manager"
@@ -18,11 +37,21 @@ class ModManagerFrame(ttk.Frame):
         self.selected_library = tk.StringVar()
         self.selected_category = tk.StringVar()
         self.library_category_memory = {}
+        self.library_buttons = {}
         self.category_buttons = {}
+        self.library_nav_frame = None
+        self._pending_nav_changes = set()
+        self.data_manager.mod_store.subscribe(self._on_store_event)
         
         self.source_folder_path = tk.StringVar()
         self.search_var = tk.StringVar()
         self.search_var.trace_add("write", self._on_search_change)
+        self.search_all_var = tk.BooleanVar(value=False)
+        self.content_filter_var = tk.StringVar()
+        self.content_filter_var.trace_add("write", self._schedule_list_update)
+        self._search_job = None
+        self._feed_job = None
+        self._log_file_job = None
 
         main_paned_window = ttk.PanedWindow(self, orient=VERTICAL)
         main_paned_window.pack(expand=True, fill='both', padx=15, pady=15)
@@ -45,6 +74,9 @@ class ModManagerFrame(ttk.Frame):
         self.search_entry.pack(side='left', fill='x', expand=True)
         refresh_button = ttk.Button(search_frame, text="↻", command=self.controller.refresh_local_data_and_ui, bootstyle="info-outline", width=2)
         refresh_button.pack(side='left', padx=(5,0))
+        ttk.Label(controls_panel, text="Contains file (idle.wav, *.smxlevel, !icon.jpg):", font=("Helvetica", 8)).pack(fill='x')
+        ttk.Entry(controls_panel, textvariable=self.content_filter_var).pack(fill='x', pady=(0, 5))
+        ttk.Checkbutton(controls_panel, text="Search all libraries", variable=self.search_all_var, command=self.update_mod_list, bootstyle="round-toggle").pack(fill='x', pady=(0, 5))
         
         self.placeholder_color = 'grey'
         self.default_fg_color = self.search_entry.cget("foreground")
@@ -55,6 +87,15 @@ class ModManagerFrame(ttk.Frame):
         # --- NEW: Sync Mappings button is now here ---
         self.sync_button = ttk.Button(controls_panel, text="Sync Mappings with Device", command=self.controller.sync_mod_mappings, bootstyle="info-outline")
         self.sync_button.pack(fill='x', expand=True, pady=(5, 0))
+        self.verify_button = ttk.Button(controls_panel, text="Verify Installed Mods", command=self.controller.verify_installed_mods, bootstyle="info-outline")
+        self.verify_button.pack(fill='x', expand=True, pady=(5, 0))
+        backup_buttons = ttk.Frame(controls_panel)
+        backup_buttons.pack(fill='x', expand=True, pady=(5, 0))
+        self.backup_button = ttk.Button(backup_buttons, text="Back Up Device", command=self.controller.backup_device_mods, bootstyle="info-outline")
+        self.backup_button.grid(row=0, column=0, padx=(0, 2), sticky='ew')
+        self.restore_button = ttk.Button(backup_buttons, text="Restore...", command=self.controller.restore_device_backup, bootstyle="info-outline")
+        self.restore_button.grid(row=0, column=1, padx=(2, 0), sticky='ew')
+        backup_buttons.grid_columnconfigure((0, 1), weight=1)
 
         ttk.Separator(controls_panel, orient=HORIZONTAL).pack(fill='x', pady=10)
 
@@ -70,12 +111,36 @@ class ModManagerFrame(ttk.Frame):
             btn.grid(row=i//2, column=i%2, padx=2, pady=2, sticky='ew')
         button_grid.grid_columnconfigure((0,1), weight=1)
 
+        loadout_frame = ttk.Frame(controls_panel)
+        loadout_frame.pack(fill='x', expand=True, pady=(0, 10))
+        ttk.Label(loadout_frame, text="Loadouts:").pack(fill='x', pady=(0, 5))
+        self.loadout_var = tk.StringVar()
+        self.loadout_combo = ttk.Combobox(loadout_frame, textvariable=self.loadout_var, state="readonly")
+        self.loadout_combo.pack(fill='x', pady=(0, 5))
+        loadout_buttons = ttk.Frame(loadout_frame)
+        loadout_buttons.pack(fill='x')
+        self.apply_loadout_button = ttk.Button(loadout_buttons, text="Apply", command=self.on_apply_loadout, bootstyle="success-outline")
+        self.apply_loadout_button.grid(row=0, column=0, padx=2, sticky='ew')
+        ttk.Button(loadout_buttons, text="Save...", command=self.on_save_loadout, bootstyle="secondary-outline").grid(row=0, column=1, padx=2, sticky='ew')
+        ttk.Button(loadout_buttons, text="Delete", command=self.on_delete_loadout, bootstyle="danger-outline").grid(row=0, column=2, padx=2, sticky='ew')
+        loadout_buttons.grid_columnconfigure((0, 1, 2), weight=1)
+        self.refresh_loadouts()
+
         ttk.Separator(controls_panel, orient=HORIZONTAL).pack(fill='x', pady=10)
 
         self.install_button = ttk.Button(controls_panel, text="Install/Update Selected", command=self.on_push_mods, bootstyle="success")
         self.install_button.pack(fill='x', expand=True, pady=(0, 5))
         self.uninstall_button = ttk.Button(controls_panel, text="Uninstall Selected", command=self.on_uninstall_selected, bootstyle="danger")
         self.uninstall_button.pack(fill='x', expand=True)
+        self.disable_button = ttk.Button(controls_panel, text="Disable Selected (Park on Device)", command=self.on_disable_selected, bootstyle="secondary")
+        self.disable_button.pack(fill='x', expand=True, pady=(5, 0))
+        self.cancel_button = ttk.Button(controls_panel, text="Cancel Running Batch", command=lambda: self.controller.cancel_tasks(PRIORITY_BULK), bootstyle="warning-outline")
+        self.cancel_button.pack(fill='x', expand=True, pady=(5, 0))
+        self.transfer_frame = ttk.Frame(controls_panel) # Packed only while a batch is transferring
+        self.transfer_bar = ttk.Progressbar(self.transfer_frame, bootstyle="success-striped", maximum=1)
+        self.transfer_bar.pack(fill='x', pady=(0, 2))
+        self.transfer_label = ttk.Label(self.transfer_frame, text="", justify='left')
+        self.transfer_label.pack(fill='x')
 
         right_pane = ttk.Frame(main_pane)
         right_pane.grid(row=0, column=1, sticky="nsew")
@@ -120,9 +185,9 @@ class ModManagerFrame(ttk.Frame):
         self.launch_game_button.pack(side='left', padx=(0, 5))
         self.force_stop_button = ttk.Button(game_controls_frame, text="Force Stop", command=controller.force_stop_game, bootstyle="warning-outline")
         self.force_stop_button.pack(side='left', padx=(0, 5))
-        self.console_output_text = ScrolledText(console_container, wrap=tk.WORD, autohide=True, height=6)
-        self.console_output_text.pack(expand=True, fill='both')
-        self.console_output_text.text.config(state='disabled')
+        self.console_notebook = ttk.Notebook(console_container)
+        self.console_notebook.pack(expand=True, fill='both')
+        self.console_tabs = []
         console_input_frame = ttk.Frame(console_container)
         console_input_frame.pack(fill='x', pady=(5,0))
         self.command_entry = ttk.Entry(console_input_frame, font=("Consolas", 10))
@@ -130,6 +195,15 @@ class ModManagerFrame(ttk.Frame):
         self.command_entry.bind("<Return>", self.send_command_event)
         send_button = ttk.Button(console_input_frame, text="Send", command=self.send_command_event, bootstyle="success")
         send_button.pack(side="right")
+        ttk.Button(console_input_frame, text="Close Tab", command=self.close_console_tab, bootstyle="secondary-outline").pack(side="right", padx=(0, 5))
+        ttk.Button(console_input_frame, text="Stop", command=self.stop_console_stream, bootstyle="danger-outline").pack(side="right", padx=(0, 5))
+        ttk.Button(console_input_frame, text="New Tab", command=self.new_console_tab, bootstyle="info-outline").pack(side="right", padx=(0, 5))
+
+        log_file = self.controller.log_file_var.get().strip()
+        self.log_sink = LogSink(self.log_output_text, self.controller.get_log_max_lines(), log_file or None, name="log")
+        self.console_sink = self.new_console_tab("Console").sink
+        self.controller.log_max_lines_var.trace_add("write", self._on_log_settings_change)
+        self.controller.log_file_var.trace_add("write", self._on_log_file_change)
         
     def _on_search_focus_in(self, event):
         if self.search_var.get() == "Search...":
@@ -143,7 +217,11 @@ class ModManagerFrame(ttk.Frame):
 
     def _on_search_change(self, *args):
         if self.search_var.get() != "Search...":
-            self.update_mod_list()
+            self._schedule_list_update()
+
+    def _schedule_list_update(self, *args):
+        if self._search_job: self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self.update_mod_list)
 
     def update_control_state(self):
         can_mod = self.controller.is_adb_connected
@@ -152,17 +230,24 @@ class ModManagerFrame(ttk.Frame):
 
         self.install_button.config(state=tk.NORMAL if can_mod else tk.DISABLED)
         self.uninstall_button.config(state=tk.NORMAL if can_mod else tk.DISABLED)
+        self.disable_button.config(state=tk.NORMAL if can_mod else tk.DISABLED)
         self.launch_game_button.config(state=tk.NORMAL if is_adb_connected and not is_game_running else tk.DISABLED)
         self.force_stop_button.config(state=tk.NORMAL if is_game_running else tk.DISABLED)
         # --- NEW: Manage the state of the sync button ---
         self.sync_button.config(state=tk.NORMAL if is_adb_connected else tk.DISABLED)
+        self.verify_button.config(state=tk.NORMAL if is_adb_connected else tk.DISABLED)
+        self.backup_button.config(state=tk.NORMAL if is_adb_connected else tk.DISABLED)
+        self.restore_button.config(state=tk.NORMAL if is_adb_connected else tk.DISABLED)
+        self.apply_loadout_button.config(state=tk.NORMAL if can_mod else tk.DISABLED)
         
-        for item in self.local_mods_frame.scrollable_frame.winfo_children():
-            if isinstance(item, ModDisplayItem):
-                modding_state = tk.NORMAL if can_mod else tk.DISABLED
-                if item.install_button: item.install_button.config(state=modding_state)
-                if item.uninstall_button: item.uninstall_button.config(state=modding_state)
-                if item.update_button: item.update_button.config(state=modding_state)
+        # Only the pooled items are live widgets; items bound later pick up the state themselves.
+        for item in self.local_mods_frame.get_bound_items():
+            modding_state = tk.NORMAL if can_mod else tk.DISABLED
+            if item.install_button:
+                blocked = item.mod_data['status'] not in ('Installed', 'Disabled') and (item.mod_data.get('layout_problems') or item.mod_data.get('integrity_error'))
+                item.install_button.config(state=tk.DISABLED if blocked else modding_state)
+            if item.uninstall_button: item.uninstall_button.config(state=modding_state)
+            if item.update_button: item.update_button.config(state=modding_state)
 
     def build_nav(self, data_manager):
         if not self.controller.get_local_library_paths():
@@ -177,14 +262,40 @@ class ModManagerFrame(ttk.Frame):
         all_libraries = sorted(list(data_manager.local_data.keys()))
         
         if not all_libraries:
-            for widget in self.local_header_nav_area.winfo_children(): widget.destroy()
+            self._sync_library_buttons()
+            self._sync_category_buttons()
             self.local_mods_frame.clear_list("No mods found in the configured library folder(s).")
             return
 
+        # Otherwise the nav and list have already been patched by the mod store events.
         if not self.selected_library.get() or self.selected_library.get() not in all_libraries:
             self.on_library_select(all_libraries[0])
-            return
-        self._redraw_nav()
+
+    def _on_store_event(self, event, **data):
+        """Patches the nav and the visible list from ModStore events instead of rebuilding them."""
+        lib, cat = self.selected_library.get(), self.selected_category.get()
+        if event == 'status_changed':
+            item = self.local_mods_frame.get_item(data['path'])
+            if item: item.update_ui_for_status(data['status'])
+        elif event in ('library_added', 'library_removed'):
+            self._pending_nav_changes.add('libraries')
+        elif event in ('category_added', 'category_removed') and data['library'] == lib:
+            self._pending_nav_changes.add('categories')
+            if event == 'category_removed' and data['category'] == cat: self._pending_nav_changes.add('category_lost')
+        elif event == 'mod_updated':
+            # The mod stayed where it was, so only its own widget needs the new data; a mod the current filter hides stays hidden.
+            self.local_mods_frame.update_item(data['mod'])
+        elif event in ('mod_added', 'mod_removed') and (self.search_all_var.get() or (data['library'], data['category']) == (lib, cat)):
+            self._pending_nav_changes.add('mods')
+        elif event == 'batch_complete':
+            changes, self._pending_nav_changes = self._pending_nav_changes, set()
+            if not lib: return
+            if 'libraries' in changes: self._sync_library_buttons()
+            if 'category_lost' in changes and self.selected_library.get() in self.data_manager.local_data:
+                self.on_library_select(self.selected_library.get())
+                return
+            if 'categories' in changes: self._sync_category_buttons()
+            if 'mods' in changes: self.update_mod_list()
 
     def on_library_select(self, lib_name):
         self.deselect_all()
@@ -194,13 +305,16 @@ class ModManagerFrame(ttk.Frame):
         if new_cat not in all_cats:
             new_cat = all_cats[0] if all_cats else ""
         self.selected_category.set(new_cat)
-        self._redraw_nav()
+        self._sync_library_buttons()
+        self._sync_category_buttons(rebuild=True)
+        self.update_mod_list()
 
     def on_category_select(self, cat_name):
         self.deselect_all()
         self.selected_category.set(cat_name)
         self.library_category_memory[self.selected_library.get()] = cat_name
         self._update_category_button_styles()
+        self._update_open_folder_buttons()
         self.update_mod_list()
 
     def _update_category_button_styles(self):
@@ -209,90 +323,127 @@ class ModManagerFrame(ttk.Frame):
             if btn.winfo_exists():
                 btn.config(bootstyle="info" if cat_name == current_cat else "secondary-outline")
 
-    def _redraw_nav(self):
-        for widget in self.local_header_nav_area.winfo_children(): widget.destroy()
-        
-        lib_defs = self.controller.get_local_library_paths()
-        name_to_path = {os.path.basename(lib['path']): lib['path'] for lib in lib_defs}
-        type_map = {os.path.basename(lib['path']): lib.get('type', '???') for lib in lib_defs}
-        all_libs = sorted(list(self.data_manager.local_data.keys()))
-        
-        lib_frame = ttk.Frame(self.local_header_nav_area)
-        lib_frame.pack(fill='x')
-
-        current_lib_name = self.selected_library.get()
-        current_lib_path = name_to_path.get(current_lib_name)
-        
-        open_lib_btn = ttk.Button(lib_frame, text="📂", command=lambda p=current_lib_path: self.controller.open_folder_in_explorer(p), bootstyle="info-outline", width=2)
-        open_lib_btn.pack(side='left', padx=(0, 10))
-        open_lib_btn.config(state=tk.NORMAL if current_lib_path else tk.DISABLED)
+    def _ensure_nav_skeleton(self):
+        """Builds the static parts of the library/category nav once; the buttons are patched in place afterwards."""
+        if self.library_nav_frame: return
+        self.library_nav_frame = ttk.Frame(self.local_header_nav_area)
+        self.library_nav_frame.pack(fill='x')
 
-        for lib_name in all_libs:
-            btn_text = f"[{type_map.get(lib_name, '???')}] {lib_name}"
-            style = "primary" if lib_name == current_lib_name else "secondary-outline"
-            btn = ttk.Button(lib_frame, text=btn_text, bootstyle=style, command=lambda l=lib_name: self.on_library_select(l))
-            btn.pack(side='left', padx=(0,2))
+        self.open_lib_btn = ttk.Button(self.library_nav_frame, text="📂", command=lambda: self.controller.open_folder_in_explorer(self._get_current_library_path()), bootstyle="info-outline", width=2)
+        self.open_lib_btn.pack(side='left', padx=(0, 10))
 
         cat_container = ttk.Frame(self.local_header_nav_area)
         cat_container.pack(fill='x', expand=True, pady=(4,0))
-        
-        current_cat_name = self.selected_category.get()
-        
-        cat_path = None
-        if current_lib_path and current_cat_name != "Uncategorized":
-            is_unity_lib = type_map.get(current_lib_name) == "Suits (Unity Project)"
-            cat_path = os.path.join(current_lib_path, current_cat_name if is_unity_lib else f"c_{current_cat_name}")
-
-        open_cat_btn = ttk.Button(cat_container, text="📂", bootstyle="info-outline", width=2)
-        open_cat_btn.pack(side='left', padx=(0, 10), anchor='n')
-        open_cat_btn.config(command=lambda p=cat_path: self.controller.open_folder_in_explorer(p), state=tk.NORMAL if cat_path and os.path.isdir(cat_path) else tk.DISABLED)
+
+        self.open_cat_btn = ttk.Button(cat_container, text="📂", bootstyle="info-outline", width=2, command=lambda: self.controller.open_folder_in_explorer(self._get_current_category_path()))
+        self.open_cat_btn.pack(side='left', padx=(0, 10), anchor='n')
         
         scroll_area = ttk.Frame(cat_container)
         scroll_area.pack(side='left', fill='x', expand=True)
         cat_canvas = tk.Canvas(scroll_area, highlightthickness=0, bg=self.winfo_toplevel().style.lookup('TFrame', 'background'))
         cat_scrollbar = ttk.Scrollbar(scroll_area, orient="horizontal", command=cat_canvas.xview, bootstyle="round")
         cat_canvas.configure(xscrollcommand=cat_scrollbar.set)
-        scrollable_cat_frame = ttk.Frame(cat_canvas)
-        cat_canvas.create_window((0, 0), window=scrollable_cat_frame, anchor="nw")
+        self.category_nav_frame = ttk.Frame(cat_canvas)
+        cat_canvas.create_window((0, 0), window=self.category_nav_frame, anchor="nw")
         
-        def on_cat_frame_configure(event): cat_canvas.configure(scrollregion=cat_canvas.bbox("all"), height=scrollable_cat_frame.winfo_height())
-        scrollable_cat_frame.bind("<Configure>", on_cat_frame_configure)
+        def on_cat_frame_configure(event): cat_canvas.configure(scrollregion=cat_canvas.bbox("all"), height=self.category_nav_frame.winfo_height())
+        self.category_nav_frame.bind("<Configure>", on_cat_frame_configure)
         cat_canvas.pack(side="top", fill="x", expand=True)
         cat_scrollbar.pack(side="top", fill="x", expand=True)
 
-        current_lib = self.selected_library.get()
-        all_categories = sorted(list(self.data_manager.local_data.get(current_lib, {}).keys()))
+    def _get_library_types(self):
+        return {os.path.basename(lib['path']): lib.get('type', '???') for lib in self.controller.get_local_library_paths()}
+
+    def _get_current_library_path(self):
+        name_to_path = {os.path.basename(lib['path']): lib['path'] for lib in self.controller.get_local_library_paths()}
+        return name_to_path.get(self.selected_library.get())
+
+    def _get_current_category_path(self):
+        current_lib_path = self._get_current_library_path()
+        current_cat_name = self.selected_category.get()
+        if not current_lib_path or current_cat_name == "Uncategorized": return None
+        is_unity_lib = self._get_library_types().get(self.selected_library.get()) == "Suits (Unity Project)"
+        return os.path.join(current_lib_path, current_cat_name if is_unity_lib else f"c_{current_cat_name}")
+
+    def _update_open_folder_buttons(self):
+        self.open_lib_btn.config(state=tk.NORMAL if self._get_current_library_path() else tk.DISABLED)
+        cat_path = self._get_current_category_path()
+        self.open_cat_btn.config(state=tk.NORMAL if cat_path and os.path.isdir(cat_path) else tk.DISABLED)
+
+    def _sync_buttons(self, parent, buttons, ordered_names, make_command):
+        """Destroys buttons for names that disappeared and inserts new ones in order, leaving the rest untouched."""
+        for name in [n for n in buttons if n not in ordered_names]:
+            buttons.pop(name).destroy()
+        for i, name in enumerate(ordered_names):
+            if name in buttons: continue
+            btn = ttk.Button(parent, text=name, command=make_command(name))
+            following = next((buttons[n] for n in ordered_names[i + 1:] if n in buttons), None)
+            if following: btn.pack(side='left', padx=(0,2), before=following)
+            else: btn.pack(side='left', padx=(0,2))
+            buttons[name] = btn
+
+    def _sync_library_buttons(self):
+        self._ensure_nav_skeleton()
+        type_map = self._get_library_types()
+        all_libs = sorted(list(self.data_manager.local_data.keys()))
+        self._sync_buttons(self.library_nav_frame, self.library_buttons, all_libs, lambda l: (lambda: self.on_library_select(l)))
+        current_lib_name = self.selected_library.get()
+        for lib_name, btn in self.library_buttons.items():
+            btn.config(text=f"[{type_map.get(lib_name, '???')}] {lib_name}", bootstyle="primary" if lib_name == current_lib_name else "secondary-outline")
+        self._update_open_folder_buttons()
+
+    def _sync_category_buttons(self, rebuild=False):
+        self._ensure_nav_skeleton()
+        if rebuild:
+            for btn in self.category_buttons.values(): btn.destroy()
+            self.category_buttons.clear()
+        all_categories = sorted(list(self.data_manager.local_data.get(self.selected_library.get(), {}).keys()))
         if "Uncategorized" in all_categories:
             all_categories.remove("Uncategorized")
             all_categories.insert(0, "Uncategorized")
-        
-        self.category_buttons.clear()
-        for cat_name in all_categories:
-            style = "info" if cat_name == current_cat_name else "secondary-outline"
-            btn = ttk.Button(scrollable_cat_frame, text=cat_name, bootstyle=style, command=lambda c=cat_name: self.on_category_select(c))
-            btn.pack(side='left', padx=(0,2))
-            self.category_buttons[cat_name] = btn
-        
-        self.update_mod_list()
+        self._sync_buttons(self.category_nav_frame, self.category_buttons, all_categories, lambda c: (lambda: self.on_category_select(c)))
+        self._update_category_button_styles()
+        self._update_open_folder_buttons()
 
     def update_mod_list(self):
+        if self._search_job: self.after_cancel(self._search_job)
+        if self._feed_job: self.after_cancel(self._feed_job)
+        self._search_job = self._feed_job = None
         lib = self.selected_library.get()
         cat = self.selected_category.get()
-        all_mods = self.data_manager.local_data.get(lib, {}).get(cat, [])
-        search_term = self.search_var.get().lower()
-
-        if search_term and self.search_var.get() != "Search...":
-            mods = [m for m in all_mods if search_term in m['name'].lower()]
-            msg = f"No mods found matching '{self.search_var.get()}'."
+        search_term = self.search_var.get()
+        content_query = self.content_filter_var.get().strip()
+
+        if search_term and search_term != "Search...":
+            if self.search_all_var.get():
+                mods = self.data_manager.search_index.query(search_term)
+                msg = f"No mods in any library match '{search_term}'."
+            else:
+                mods = self.data_manager.search_index.query(search_term, lib, cat)
+                msg = f"No mods found matching '{search_term}'."
+        elif content_query and self.search_all_var.get():
+            mods, msg = self.data_manager.search_index.get_mods(), ""
         else:
-            mods, msg = all_mods, "No mods in this category."
+            mods, msg = self.data_manager.local_data.get(lib, {}).get(cat, []), "No mods in this category."
 
-        self.local_mods_frame.display_list(mods, msg)
+        if content_query:
+            matches = self.data_manager.zip_index.find(content_query)
+            mods = [m for m in mods if m['full_path'] in matches]
+            msg = f"No mods match the file filter '{content_query}'."
+
+        # Long result lists are handed to the view in batches so the first rows appear immediately.
+        self.local_mods_frame.display_list(mods[:RESULT_BATCH_SIZE], msg)
+        if len(mods) > RESULT_BATCH_SIZE: self._feed_job = self.after(1, self._feed_results, mods, RESULT_BATCH_SIZE)
         self.update_control_state()
 
+    def _feed_results(self, mods, start):
+        end = start + RESULT_BATCH_SIZE
+        self.local_mods_frame.extend_list(mods[start:end])
+        self._feed_job = self.after(1, self._feed_results, mods, end) if end < len(mods) else None
+
     def apply_selection_filter(self, selection_type):
         if selection_type == "None": self.deselect_all(); return
-        mods = [c.mod_data for c in self.local_mods_frame.scrollable_frame.winfo_children() if hasattr(c, 'mod_data')]
+        mods = self.local_mods_frame.mod_list
         keys = []
         if selection_type == "All": keys = [m['full_path'] for m in mods]
         elif selection_type == "Installed": keys = [m['full_path'] for m in mods if m['status'] == 'Installed']
@@ -306,32 +457,113 @@ class ModManagerFrame(ttk.Frame):
         if not keys: return
         to_uninstall = [p for p in keys if p in self.controller.mod_mappings]
         if not to_uninstall: messagebox.showinfo("Info", "None of the selected mods are installed."); return
-        self.controller.run_in_thread(self.controller.uninstall_mods, to_uninstall)
+        self.controller.submit_task(self.controller.uninstall_mods, to_uninstall, priority=PRIORITY_BULK)
 
-    def on_install_single(self, path): self.controller.run_in_thread(self.controller.install_mods, [path], self.selected_library.get(), self.selected_category.get())
-    def on_uninstall_single(self, path): self.controller.run_in_thread(self.controller.uninstall_mods, [path])
+    def on_disable_selected(self):
+        keys = self.local_mods_frame.get_selected_keys()
+        if not keys: return
+        to_disable = [p for p in keys if p in self.controller.mod_mappings and not self.controller.mod_mappings[p].get('parked')]
+        if not to_disable: messagebox.showinfo("Info", "None of the selected mods are installed and enabled."); return
+        self.controller.submit_task(self.controller.disable_mods, to_disable, priority=PRIORITY_BULK)
+
+    def on_install_single(self, path): self.controller.submit_task(self.controller.install_mods, [path], priority=PRIORITY_BULK)
+    def on_uninstall_single(self, path): self.controller.submit_task(self.controller.uninstall_mods, [path], priority=PRIORITY_BULK)
+
+    def refresh_loadouts(self):
+        names = self.controller.mod_mappings.loadouts.names()
+        self.loadout_combo.config(values=names)
+        if self.loadout_var.get() not in names: self.loadout_var.set(names[0] if names else "")
+
+    def on_save_loadout(self):
+        name = simpledialog.askstring("Save Loadout", "Save the currently installed mods as loadout:", initialvalue=self.loadout_var.get(), parent=self)
+        if not name or not name.strip(): return
+        self.controller.save_loadout(name.strip())
+        self.refresh_loadouts()
+        self.loadout_var.set(name.strip())
+
+    def on_apply_loadout(self):
+        name = self.loadout_var.get()
+        if not name: self.log("ERROR: No loadout selected."); return
+        self.controller.apply_loadout(name)
+
+    def on_delete_loadout(self):
+        name = self.loadout_var.get()
+        if not name or not messagebox.askyesno("Delete Loadout", f"Delete loadout '{name}'? Installed mods are not affected."): return
+        self.controller.mod_mappings.loadouts.delete(name)
+        self.refresh_loadouts()
 
     def on_push_mods(self):
         keys = self.local_mods_frame.get_selected_keys()
         if not keys: self.log("ERROR: No mods selected."); return
-        self.controller.run_in_thread(self.controller.install_mods, keys, self.selected_library.get(), self.selected_category.get())
-        
-    def log(self, msg):
-        self.log_output_text.text.config(state='normal')
-        self.log_output_text.insert(tk.END, str(msg).strip() + "\n")
-        self.log_output_text.see(tk.END)
-        self.log_output_text.text.config(state='disabled')
-        
-    def console_log(self, msg):
-        self.console_output_text.text.config(state='normal')
-        self.console_output_text.insert(tk.END, str(msg).strip() + "\n")
-        self.console_output_text.see(tk.END)
-        self.console_output_text.text.config(state='disabled')
+        self.controller.plan_and_install(keys)
         
+    # Both are safe to call from any thread; the sinks batch the inserts on the Tk thread.
+    def log(self, msg): self.log_sink.write(msg)
+    def console_log(self, msg): self.console_sink.write(msg)
+
+    def update_transfer_progress(self, snapshot):
+        if not self.transfer_frame.winfo_ismapped(): self.transfer_frame.pack(fill='x', expand=True, pady=(5, 0))
+        total_bytes, total_files = snapshot['total_bytes'], snapshot['total_files']
+        if total_bytes: self.transfer_bar.config(value=snapshot['bytes_done'] / total_bytes)
+        else: self.transfer_bar.config(value=snapshot['files_done'] / total_files if total_files else 0)
+        eta = snapshot['eta']
+        eta_text = f"{int(eta // 60)}:{int(eta % 60):02d}" if eta is not None else "--:--"
+        bytes_text = f"{snapshot['bytes_done'] / 1048576:.1f} / {total_bytes / 1048576:.1f} MB" if total_bytes else f"{snapshot['bytes_done'] / 1048576:.1f} MB"
+        self.transfer_label.config(text=(
+            f"{snapshot['current']}\n"
+            f"{bytes_text}, {snapshot['files_done']} / {total_files} files\n"
+            f"{snapshot['inst_mbps']:.1f} MB/s (avg {snapshot['avg_mbps']:.1f}), ETA {eta_text}"))
+
+    def hide_transfer_progress(self):
+        self.transfer_frame.pack_forget()
+
+    def _on_log_settings_change(self, *args):
+        max_lines = self.controller.get_log_max_lines()
+        self.log_sink.set_max_lines(max_lines)
+        for tab in self.console_tabs: tab.sink.set_max_lines(max_lines)
+
+    def _on_log_file_change(self, *args):
+        # The settings entry writes on every keystroke; wait for typing to settle so half-typed paths never get opened.
+        if self._log_file_job: self.after_cancel(self._log_file_job)
+        self._log_file_job = self.after(LOG_FILE_DEBOUNCE_MS, self._apply_log_file)
+
+    def _apply_log_file(self):
+        self._log_file_job = None
+        self.log_sink.set_spill_path(self.controller.log_file_var.get().strip() or None)
+
+    def new_console_tab(self, title=None):
+        tab = ConsoleTab(self.console_notebook, self.controller.get_log_max_lines())
+        self.console_notebook.add(tab, text=title or f"Stream {len(self.console_tabs)}")
+        self.console_tabs.append(tab)
+        self.console_notebook.select(tab)
+        return tab
+
+    def _get_current_console_tab(self):
+        selected = self.console_notebook.select()
+        return next((tab for tab in self.console_tabs if str(tab) == selected), self.console_tabs[0])
+
+    def stop_console_stream(self):
+        tab = self._get_current_console_tab()
+        if tab.is_running: tab.handle.cancel()
+
+    def close_console_tab(self):
+        tab = self._get_current_console_tab()
+        if tab is self.console_tabs[0]: return # The main tab also receives adb_handler's console_log output.
+        if tab.handle: tab.handle.cancel()
+        self.console_tabs.remove(tab)
+        tab.destroy()
+
     def send_command_event(self, event=None):
         cmd = self.command_entry.get().strip()
         if not cmd: return
-        self.console_log(f"$ {cmd}")
         self.command_entry.delete(0, tk.END)
+        # A command typed while the current tab is still streaming gets a tab of its own.
+        tab = self._get_current_console_tab()
+        if tab.is_running: tab = self.new_console_tab(cmd[:20])
+        tab.sink.write(f"$ {cmd}")
         if cmd.lower().startswith("adb "): cmd = cmd[4:]
-        self.controller.run_in_thread(self.controller.adb.send_adb_command, cmd, self.console_log)
\ No newline at end of file
+        tab.handle = self.controller.task_executor.submit_dedicated(self._run_console_stream, cmd, tab.sink.write, name=f"console: {cmd[:30]}")
+
+    def _run_console_stream(self, cmd, write):
+        exit_code = self.controller.adb.stream_adb_command(cmd, write)
+        if exit_code: write(f"[Exited with code {exit_code}]")
\ No newline at end of file
@@ -0,0 +1,119 @@
+# --- Filename: mod_store.py ---
+
+class ModStore:
+    """
+    The central store for local mods, keyed by full_path (and by device_folder for installed
+    mods). Instead of views rebuilding everything after a scan or an install, the store diffs
+    each change and emits fine-grained events that subscribers use to patch only what changed:
+
+      library_added / library_removed      library
+      category_added / category_removed    library, category
+      mod_added / mod_removed / mod_updated library, category, path, mod
+      status_changed                       library, category, path, mod, status
+      batch_complete                       (after a load() or set_fields() finished emitting)
+
+    mod_updated always means the mod stayed where it was; one that moved to another library or
+    category is reported as mod_removed from the old place and mod_added to the new one.
+
+    Must only be mutated from the Tk main thread, since subscribers touch widgets.
+    """
+    def __init__(self):
+        self.mods = {} # full_path -> mod dict (the same dicts held by DataManager.local_data)
+        self.locations = {} # full_path -> (library, category)
+        self.categories = {} # library -> set of category names
+        self.by_device_folder = {} # device_folder -> full_path
+        self.device_folder_by_path = {}
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers: self.subscribers.remove(callback)
+
+    def _emit(self, event, **data):
+        for callback in list(self.subscribers):
+            try: callback(event, **data)
+            except Exception as e: print(f"ERROR: Mod store subscriber failed on '{event}': {e}")
+
+    def get(self, path):
+        return self.mods.get(path)
+
+    def get_location(self, path):
+        return self.locations.get(path, (None, None))
+
+    def get_by_device_folder(self, device_folder):
+        path = self.by_device_folder.get(device_folder)
+        return self.mods.get(path) if path else None
+
+    def load(self, local_data, mappings):
+        """Replaces the store's contents with a fresh scan, emitting events only for the differences."""
+        new_categories = {lib: set(cats.keys()) for lib, cats in local_data.items()}
+        new_mods, new_locations = {}, {}
+        for lib_name, categories in local_data.items():
+            for cat_name, mods in categories.items():
+                for mod in mods:
+                    new_mods[mod['full_path']] = mod
+                    new_locations[mod['full_path']] = (lib_name, cat_name)
+
+        old_mods, old_locations, old_categories = self.mods, self.locations, self.categories
+        self.mods, self.locations, self.categories = new_mods, new_locations, new_categories
+        self.device_folder_by_path = {path: info['device_folder'] for path, info in mappings.items() if 'device_folder' in info}
+        self.by_device_folder = {folder: path for path, folder in self.device_folder_by_path.items()}
+
+        for lib_name in old_categories.keys() - new_categories.keys():
+            self._emit('library_removed', library=lib_name)
+        for lib_name in new_categories.keys() - old_categories.keys():
+            self._emit('library_added', library=lib_name)
+        for lib_name, cats in new_categories.items():
+            old_cats = old_categories.get(lib_name, set())
+            for cat_name in old_cats - cats: self._emit('category_removed', library=lib_name, category=cat_name)
+            for cat_name in cats - old_cats: self._emit('category_added', library=lib_name, category=cat_name)
+
+        for path in old_mods.keys() - new_mods.keys():
+            lib_name, cat_name = old_locations[path]
+            self._emit('mod_removed', library=lib_name, category=cat_name, path=path, mod=old_mods[path])
+        for path, mod in new_mods.items():
+            lib_name, cat_name = new_locations[path]
+            old_mod = old_mods.get(path)
+            if old_mod is not None and old_locations[path] != new_locations[path]:
+                old_lib, old_cat = old_locations[path]
+                self._emit('mod_removed', library=old_lib, category=old_cat, path=path, mod=old_mod)
+                old_mod = None
+            if old_mod is None:
+                self._emit('mod_added', library=lib_name, category=cat_name, path=path, mod=mod)
+            elif old_mod != mod:
+                self._emit('mod_updated', library=lib_name, category=cat_name, path=path, mod=mod)
+        self._emit('batch_complete')
+
+    def _index_device_folder(self, path, device_folder):
+        old_folder = self.device_folder_by_path.pop(path, None)
+        if old_folder: self.by_device_folder.pop(old_folder, None)
+        if device_folder:
+            self.device_folder_by_path[path] = device_folder
+            self.by_device_folder[device_folder] = path
+
+    def set_fields(self, updates):
+        """
+        Merges {path: fields} (e.g. a batch of background check results) into the mods' dicts,
+        emitting mod_updated for each mod that changed and one batch_complete for the lot.
+        """
+        changed = False
+        for path, fields in updates.items():
+            mod = self.mods.get(path)
+            if not mod or all(mod.get(k) == v for k, v in fields.items()): continue
+            mod.update(fields)
+            lib_name, cat_name = self.locations[path]
+            self._emit('mod_updated', library=lib_name, category=cat_name, path=path, mod=mod)
+            changed = True
+        if changed: self._emit('batch_complete')
+
+    def set_status(self, paths, status, mappings=None):
+        """Updates the status of the given mods in place and notifies subscribers for each one that changed."""
+        for path in paths:
+            if mappings is not None: self._index_device_folder(path, mappings.get(path, {}).get('device_folder'))
+            mod = self.mods.get(path)
+            if not mod or mod.get('status') == status: continue
+            mod['status'] = status
+            lib_name, cat_name = self.locations[path]
+            self._emit('status_changed', library=lib_name, category=cat_name, path=path, mod=mod, status=status)
@@ -0,0 +1,114 @@
+# --- Filename: mod_transcoder.py ---
+import os
+import array
+import wave
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from PIL import Image
+from src.task_executor import get_current_cancel_token
+from src.transfer_journal import file_md5
+
+try: import audioop # Removed in Python 3.13; a slower pure-Python path covers 16-bit PCM without it
+except ImportError: audioop = None
+
+TEXTURE_NAMES = ("gear_suit.png", "gear_suit_normal.png")
+
+def _resize_texture(src, dst, max_px):
+    with Image.open(src) as img:
+        img.thumbnail((max_px, max_px), Image.Resampling.LANCZOS)
+        img.save(dst, format=img.format or "PNG", optimize=True)
+
+def _resample_pcm16(frames, channels, src_rate, dst_rate):
+    samples = array.array('h', frames)
+    count = len(samples) // channels
+    out_count = count * dst_rate // src_rate
+    out = array.array('h', bytes(out_count * channels * 2))
+    step = src_rate / dst_rate
+    for i in range(out_count):
+        pos = i * step
+        j = int(pos)
+        frac = pos - j
+        k = min(j + 1, count - 1)
+        for c in range(channels):
+            a, b = samples[j * channels + c], samples[k * channels + c]
+            out[i * channels + c] = int(a + (b - a) * frac)
+    return out.tobytes()
+
+def _resample_wav(src, dst, max_rate):
+    with wave.open(src, 'rb') as w:
+        params, frames = w.getparams(), w.readframes(w.getnframes())
+    if audioop: frames, _ = audioop.ratecv(frames, params.sampwidth, params.nchannels, params.framerate, max_rate, None)
+    else: frames = _resample_pcm16(frames, params.nchannels, params.framerate, max_rate)
+    with wave.open(dst, 'wb') as w:
+        w.setnchannels(params.nchannels)
+        w.setsampwidth(params.sampwidth)
+        w.setframerate(max_rate)
+        w.writeframes(frames)
+
+class ModTranscoder:
+    """
+    Optional pre-push transforms for extracted mod files: suit textures larger than max_texture
+    pixels are downsized, and wavs sampled above max_sample_rate Hz are resampled. Whether a file
+    needs it is decided from its header alone; the work itself runs in a process pool, and each
+    output is cached under the md5 of its input plus the target, so reinstalling a mod reuses it.
+    """
+    def __init__(self, cache_dir, max_workers=None):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None: self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _plan(self, local_path, rel_path, rules):
+        """Returns (worker, target) if the file needs transcoding under rules, else None."""
+        name = os.path.basename(rel_path).lower()
+        try:
+            if rules.get('max_texture') and name in TEXTURE_NAMES:
+                with Image.open(local_path) as img:
+                    if max(img.size) > rules['max_texture']: return _resize_texture, rules['max_texture']
+            elif rules.get('max_sample_rate') and name.endswith('.wav'):
+                with wave.open(local_path, 'rb') as w:
+                    if w.getframerate() > rules['max_sample_rate'] and (audioop or w.getsampwidth() == 2): return _resample_wav, rules['max_sample_rate']
+        except (OSError, wave.Error, EOFError): pass # Not something we can read; push it untouched
+        return None
+
+    def transcode_files(self, files, rules, log_func=print):
+        """
+        Transcodes the (local path, relative path) files where rules call for it, leaving the
+        originals untouched. Returns {relative path: (transcoded path, size, md5)} for every file
+        that should be pushed in place of its original.
+        """
+        if not rules or not any(rules.values()): return {}
+        jobs = [(local, rel, *plan) for local, rel in files if (plan := self._plan(local, rel, rules))]
+        if not jobs: return {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cancel_token = get_current_cancel_token()
+        jobs = [(local, rel, worker, target, os.path.join(self.cache_dir, f"{file_md5(local)}_{target}{os.path.splitext(local)[1].lower()}")) for local, rel, worker, target in jobs]
+        pending, hits = {}, 0
+        for local, rel, worker, target, cached in jobs:
+            if os.path.exists(cached): hits += 1; continue
+            pending[self._get_pool().submit(worker, local, f"{cached}.tmp", target)] = cached
+        log_func(f"  - Transcoding {len(jobs)} file(s) ({hits} cached)...")
+        failed = set()
+        while pending:
+            if cancel_token.is_cancelled:
+                for future in pending: future.cancel()
+                cancel_token.raise_if_cancelled()
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                cached = pending.pop(future)
+                try:
+                    future.result()
+                    os.replace(f"{cached}.tmp", cached)
+                except Exception as e:
+                    log_func(f"  - WARNING: Could not transcode '{os.path.basename(cached)}', pushing the original: {e}")
+                    failed.add(cached)
+        replaced = {}
+        for local, rel, _, _, cached in jobs:
+            if cached in failed or not os.path.exists(cached): continue
+            replaced[rel] = (cached, os.path.getsize(cached), file_md5(cached))
+        return replaced
+
+    def shutdown(self):
+        if self._pool: self._pool.shutdown(cancel_futures=True)
@@ -0,0 +1,31 @@
+# --- Filename: mod_verifier.py ---
+
+def expected_files(zip_index, zip_path, with_md5=False, transcoded=None):
+    """
+    Returns {member name: (size, md5 or None)} for the files a mod zip installs, from its central
+    directory. transcoded ({member name: (size, md5)}, from the mapping) overrides the members
+    that were transcoded on push.
+    """
+    md5s = zip_index.get_member_md5s(zip_path) if with_md5 else {}
+    expected = {name: (size, md5s.get(name)) for name, _, size in zip_index.get_current_entry(zip_path)['members'] if not name.startswith('__MACOSX/')}
+    for name, (size, md5) in (transcoded or {}).items():
+        if name in expected: expected[name] = (size, md5 if with_md5 else None)
+    return expected
+
+def compare_mod_files(expected, device):
+    """
+    Compares one installed mod against its zip. expected is {name: (size, md5 or None)} and
+    device is {name: {'size', 'md5'}}, both relative to the mod's device folder. Returns the
+    names that are missing, truncated (shorter on the device), drifted (other size, or same
+    size but a different md5) and extra (on the device but not in the zip).
+    """
+    report = {'missing': [], 'truncated': [], 'drifted': [], 'extra': sorted(device.keys() - expected.keys())}
+    for name, (size, md5) in expected.items():
+        found = device.get(name)
+        if found is None: report['missing'].append(name)
+        elif found['size'] < size: report['truncated'].append(name)
+        elif found['size'] != size or (md5 and found.get('md5') and found['md5'] != md5): report['drifted'].append(name)
+    return report
+
+def is_broken(report):
+    return any(report.values())
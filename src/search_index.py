@@ -0,0 +1,99 @@
+# --- Filename: search_index.py ---
+import threading
+from collections import defaultdict
+
+NGRAM_SIZE = 3
+
+class SearchIndex:
+    """
+    An in-memory index over the names of every scanned local mod. Names are lowercased once
+    and broken into trigrams, so a query only verifies the mods sharing all of its trigrams
+    instead of scanning every mod. Built from DataManager.local_data and patched with deltas
+    after each rescan. Scans patch it from a worker thread, so public reads/writes take a lock.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries = {} # full_path -> {'library', 'category', 'name', 'mod'}
+        self.ngrams = defaultdict(set) # trigram -> {full_path}
+
+    @staticmethod
+    def _get_ngrams(text):
+        return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+    def add(self, library, category, mod):
+        path = mod['full_path']
+        if path in self.entries: self.remove(path)
+        name = mod['name'].lower()
+        self.entries[path] = {'library': library, 'category': category, 'name': name, 'mod': mod}
+        for gram in self._get_ngrams(name):
+            self.ngrams[gram].add(path)
+
+    def remove(self, path):
+        entry = self.entries.pop(path, None)
+        if not entry: return
+        for gram in self._get_ngrams(entry['name']):
+            paths = self.ngrams.get(gram)
+            if paths is None: continue
+            paths.discard(path)
+            if not paths: del self.ngrams[gram]
+
+    def apply_scan(self, local_data):
+        """Brings the index in line with a fresh scan, touching only added, removed or changed mods."""
+        with self._lock: return self._apply_scan(local_data)
+
+    def _apply_scan(self, local_data):
+        scanned = {
+            mod['full_path']: (lib_name, cat_name, mod)
+            for lib_name, categories in local_data.items()
+            for cat_name, mods in categories.items()
+            for mod in mods
+        }
+        removed = [path for path in self.entries if path not in scanned]
+        for path in removed: self.remove(path)
+
+        added = updated = 0
+        for path, (lib_name, cat_name, mod) in scanned.items():
+            entry = self.entries.get(path)
+            if entry is None: added += 1
+            elif (entry['library'], entry['category'], entry['name']) != (lib_name, cat_name, mod['name'].lower()): updated += 1
+            else:
+                # Unchanged name/location: just point at the freshly scanned dict.
+                entry['mod'] = mod
+                continue
+            self.add(lib_name, cat_name, mod)
+        return added, updated, len(removed)
+
+    def locate(self, path):
+        """Returns (library, category) for a mod path, or (None, None) if it is not indexed."""
+        with self._lock: entry = self.entries.get(path)
+        return (entry['library'], entry['category']) if entry else (None, None)
+
+    def get_mods(self, library=None, category=None):
+        """Returns every indexed mod dict, optionally restricted to one library/category, sorted by name."""
+        with self._lock:
+            mods = [e['mod'] for e in self.entries.values() if (library is None or e['library'] == library) and (category is None or e['category'] == category)]
+        return sorted(mods, key=lambda m: m['name'].lower())
+
+    def query(self, term, library=None, category=None):
+        """Returns the mod dicts whose name contains term, optionally restricted to one library/category."""
+        term = term.lower().strip()
+        if not term: return []
+        with self._lock: return self._query(term, library, category)
+
+    def _query(self, term, library, category):
+        grams = self._get_ngrams(term)
+        if grams:
+            candidate_sets = sorted((self.ngrams.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*candidate_sets) if candidate_sets[0] else set()
+        else:
+            # Terms shorter than a trigram fall back to verifying every name.
+            candidates = self.entries.keys()
+
+        results = []
+        for path in candidates:
+            entry = self.entries[path]
+            if library is not None and entry['library'] != library: continue
+            if category is not None and entry['category'] != category: continue
+            if term in entry['name']: results.append(entry['mod'])
+        results.sort(key=lambda m: m['name'].lower())
+        return results
@@ -17,15 +17,48 @@ class ModDisplayItem(ttk.Frame):
         self.list_view = list_view
         self.mod_data = mod_data
         self.view_mode = view_mode
+        self.layout_type = self._get_layout_type(mod_data)
+        self.window_id = None # Canvas window item, assigned by the owning ModListView
         self.install_button = None
         self.uninstall_button = None
         self.update_button = None
         self.details_frame = None
+        self.layout_label = None
         self.suit_images = {} # To prevent garbage collection
         self.images_loaded = False 
 
         self.build_ui_placeholders()
 
+    @property
+    def mod_key(self):
+        return self.mod_data.get('full_path') if self.view_mode == 'local' else self.mod_data.get('device_folder')
+
+    def _get_layout_type(self, mod_data):
+        return mod_data.get('library_type') or mod_data.get('mod_type')
+
+    def bind_mod_data(self, mod_data):
+        """
+        Rebinds this (pooled) widget to a different mod. Only the text, indicators and
+        buttons are refreshed; the frame structure is rebuilt only when the mod type changes.
+        """
+        self.mod_data = mod_data
+        self.images_loaded = False
+        layout_type = self._get_layout_type(mod_data)
+        if layout_type != self.layout_type:
+            self.layout_type = layout_type
+            self.suit_images = {}
+            for widget in self.content_frame.winfo_children():
+                widget.destroy()
+            self.build_ui_placeholders()
+            return
+
+        self.name_label.config(text=mod_data['name'])
+        self._update_indicators()
+        self._reset_images()
+        for widget in self.details_frame.winfo_children():
+            widget.destroy()
+        self._build_details_frame_content()
+
     def update_ui_for_status(self, new_status):
         """Updates the mod's status and redraws the buttons without rebuilding the whole widget."""
         self.mod_data['status'] = new_status
@@ -34,6 +67,7 @@ class ModDisplayItem(ttk.Frame):
             for widget in self.details_frame.winfo_children():
                 widget.destroy()
             self._build_details_frame_content()
+            self.list_view.bind_item_events(self)
 
     def _build_details_frame_content(self):
         """Builds or rebuilds the content of the details frame (buttons, file count, etc.)."""
@@ -42,14 +76,21 @@ class ModDisplayItem(ttk.Frame):
         self.update_button = None
 
         if self.view_mode == 'local':
+            modding_state = tk.NORMAL if self.controller.is_adb_connected else tk.DISABLED
             ttk.Label(self.details_frame, text=f"Files: {self.mod_data.get('file_count', 'N/A')}", font=("Helvetica", 9), bootstyle="inverse-dark").pack(side='left', padx=(0,10))
             if self.mod_data['status'] == 'Installed':
-                self.update_button = ttk.Button(self.details_frame, text="Update", bootstyle="success-outline", command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_install_single(p))
+                self.update_button = ttk.Button(self.details_frame, text="Update", bootstyle="success-outline", state=modding_state, command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_install_single(p))
                 self.update_button.pack(side='left', padx=(0, 5))
-                self.uninstall_button = ttk.Button(self.details_frame, text="Uninstall", bootstyle="danger-outline", command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_uninstall_single(p))
+                self.uninstall_button = ttk.Button(self.details_frame, text="Uninstall", bootstyle="danger-outline", state=modding_state, command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_uninstall_single(p))
+                self.uninstall_button.pack(side='left', padx=(0, 10))
+            elif self.mod_data['status'] == 'Disabled':
+                self.install_button = ttk.Button(self.details_frame, text="Enable", bootstyle="success-outline", state=modding_state, command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_install_single(p))
+                self.install_button.pack(side='left', padx=(0, 5))
+                self.uninstall_button = ttk.Button(self.details_frame, text="Remove", bootstyle="danger-outline", state=modding_state, command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_uninstall_single(p))
                 self.uninstall_button.pack(side='left', padx=(0, 10))
             else:
-                self.install_button = ttk.Button(self.details_frame, text="Install", bootstyle="success-outline", command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_install_single(p))
+                if self.mod_data.get('layout_problems') or self.mod_data.get('integrity_error'): modding_state = tk.DISABLED
+                self.install_button = ttk.Button(self.details_frame, text="Install", bootstyle="success-outline", state=modding_state, command=lambda p=self.mod_data['full_path']: self.controller.frames["Mod Manager"].on_install_single(p))
                 self.install_button.pack(side='left', padx=(0, 10))
         
         elif self.view_mode == 'unmanaged':
@@ -57,6 +98,43 @@ class ModDisplayItem(ttk.Frame):
             mod_type_text = self.mod_data.get('mod_type', 'Unknown')
             ttk.Label(self.details_frame, text=f"Type: {mod_type_text}", font=("Helvetica", 8, "italic"), bootstyle="inverse-dark").pack(side='right', padx=(0,5))
 
+    def _update_indicators(self):
+        """Colours the required-file indicators (smxlevel / sound files) for the bound mod and flags an invalid layout."""
+        if self.layout_label:
+            problems = list(self.mod_data.get('layout_problems') or [])
+            if self.mod_data.get('integrity_error'): problems.append(f"damaged zip ({self.mod_data['integrity_error']})")
+            if problems:
+                self.layout_label.config(text=f"[Invalid: {'; '.join(problems)}]")
+                self.layout_label.pack(side='left', padx=5)
+            else: self.layout_label.pack_forget()
+        if self.layout_type == 'Tracks':
+            self.map_status_label.config(bootstyle="success" if self.mod_data.get('map_file_name') else "danger")
+        elif self.layout_type == 'Sounds':
+            sound_files = self.mod_data.get('sound_files', {})
+            for sound_file, label in self.sound_labels.items():
+                label.config(bootstyle="success" if sound_files.get(sound_file) else "danger")
+
+    def release_images(self):
+        """Drops this widget's references to decoded images so the shared cache can reclaim them."""
+        if not self.images_loaded: return
+        self._reset_images()
+        self.images_loaded = False
+
+    def _reset_images(self):
+        """Puts the placeholders back so a rebound widget never shows the previous mod's images."""
+        self.suit_images = {}
+        self.preview_image_label.image = None
+        self.preview_image_label.config(image=self._get_image_for_display(None, (180, 101), "..."))
+        if self.layout_type == 'Suits':
+            self.suit_icon_label.config(image=self._get_image_for_display(None, (80, 80), "..."))
+            self.suit_icon_filename_label.config(bootstyle="secondary")
+            for label, filename_label in ((self.gear_suit_label, self.gear_suit_filename_label), (self.gear_normal_label, self.gear_normal_filename_label)):
+                label.config(image=self._get_image_for_display(None, (40, 40), "..."))
+                filename_label.config(bootstyle="secondary")
+        elif self.layout_type not in ['Tracks', 'Sounds']:
+            self.icon_image_label.image = None
+            self.icon_image_label.config(image=self._get_image_for_display(None, (90, 90), "..."))
+
     def build_ui_placeholders(self):
         """Builds the widget structure with placeholder images."""
         self.content_frame.grid_columnconfigure(0, weight=1)
@@ -64,19 +142,20 @@ class ModDisplayItem(ttk.Frame):
 
         name_frame = ttk.Frame(self.content_frame, bootstyle="dark")
         name_frame.grid(row=0, column=0, sticky="ew", padx=8, pady=(5, 10))
-        name_label = ttk.Label(name_frame, text=self.mod_data['name'], font=("Helvetica", 11, "bold"), wraplength=280, justify='left', bootstyle="inverse-dark")
-        name_label.pack(side='left')
+        self.name_label = ttk.Label(name_frame, text=self.mod_data['name'], font=("Helvetica", 11, "bold"), wraplength=280, justify='left', bootstyle="inverse-dark")
+        self.name_label.pack(side='left')
 
         if self.view_mode == 'unmanaged':
             ttk.Label(name_frame, text="[Unmanaged]", font=("Helvetica", 8, "bold"), bootstyle="warning").pack(side='left', padx=5)
         
         if self.view_mode == 'local':
+            self.layout_label = ttk.Label(name_frame, font=("Helvetica", 8, "bold"), bootstyle="danger", wraplength=200, justify='left')
             open_folder_button = ttk.Button(
                 self.content_frame, 
                 text="📂", 
                 bootstyle="info-outline", 
                 width=2,
-                command=lambda p=self.mod_data['full_path']: self.open_folder_in_explorer(p)
+                command=lambda: self.open_folder_in_explorer(self.mod_data['full_path'])
             )
             open_folder_button.grid(row=0, column=1, sticky="ne", padx=(0, 5), pady=5)
 
@@ -91,26 +170,24 @@ class ModDisplayItem(ttk.Frame):
         preview_box.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
         self.preview_image_label = preview_box.image_widget
 
-        mod_type = self.mod_data.get('library_type') or self.mod_data.get('mod_type')
+        mod_type = self.layout_type
 
         if mod_type == 'Tracks':
             map_status_frame = ttk.Frame(images_frame, bootstyle="dark", width=100, height=120)
             map_status_frame.grid(row=0, column=1, sticky="nsew")
             map_status_frame.pack_propagate(False)
-            map_file_name = self.mod_data.get('map_file_name')
-            status_style = "success" if map_file_name else "danger"
-            ttk.Label(map_status_frame, text="Track.smxlevel", font=("Helvetica", 9), bootstyle=status_style, justify='center').pack(expand=True)
+            self.map_status_label = ttk.Label(map_status_frame, text="Track.smxlevel", font=("Helvetica", 9), justify='center')
+            self.map_status_label.pack(expand=True)
 
         elif mod_type == 'Sounds':
             sound_status_frame = ttk.Frame(images_frame, bootstyle="dark", width=100, height=120, padding=(5,5))
             sound_status_frame.grid(row=0, column=1, sticky="nsew")
             sound_status_frame.pack_propagate(False)
-            sound_files = self.mod_data.get('sound_files', {})
             REQUIRED_SOUNDS = ["engine.wav", "high.wav", "idle.wav", "low.wav"]
+            self.sound_labels = {}
             for sound_file in REQUIRED_SOUNDS:
-                style = "success" if sound_files.get(sound_file) else "danger"
-                ttk.Label(sound_status_frame, text=sound_file, bootstyle=style, font=("Consolas", 9)).pack(anchor='w')
-
+                self.sound_labels[sound_file] = ttk.Label(sound_status_frame, text=sound_file, font=("Consolas", 9))
+                self.sound_labels[sound_file].pack(anchor='w')
         elif mod_type == 'Suits':
             self.icon_frame = ttk.Frame(images_frame, bootstyle="dark")
             self.icon_frame.grid(row=0, column=1, sticky="nsew")
@@ -152,6 +229,7 @@ class ModDisplayItem(ttk.Frame):
         self.details_frame = ttk.Frame(self.content_frame, bootstyle="dark")
         self.details_frame.grid(row=details_row, column=0, columnspan=2, sticky="ew", padx=8, pady=(0, 8))
         
+        self._update_indicators()
         self._build_details_frame_content()
 
 
@@ -165,7 +243,7 @@ class ModDisplayItem(ttk.Frame):
         self.preview_image_label.config(image=preview_img_obj)
         self.preview_image_label.image = preview_img_obj
 
-        mod_type = self.mod_data.get('library_type') or self.mod_data.get('mod_type')
+        mod_type = self.layout_type
         if mod_type == 'Suits':
             suit_files = self.mod_data.get('suit_files', {})
             
@@ -212,9 +290,8 @@ class ModDisplayItem(ttk.Frame):
     def _get_image_for_display(self, path, size, placeholder_text):
         if path and os.path.exists(path):
             try:
-                img = Image.open(path)
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                return ImageTk.PhotoImage(img)
+                photo = self.controller.image_cache.get(path, size)
+                if photo: return photo
             except Exception as e:
                 self.controller.log_to_ui(f"ERROR: Failed to load image {path}: {e}")
         return self.list_view.get_placeholder(size, placeholder_text)
@@ -235,42 +312,57 @@ class ModDisplayItem(ttk.Frame):
             self.controller.log_to_ui(f"Error opening folder: {e}")
 
 class ModListView(ttk.Frame):
+    """
+    A virtualized grid of ModDisplayItems. Only enough items to fill the viewport (plus
+    OVERSCAN_ROWS above and below) are ever instantiated; they are kept in a pool and
+    rebound to different mod_data as the user scrolls or switches category.
+    """
+    ITEM_WIDTH = 350
+    ITEM_PADDING = 10
+    OVERSCAN_ROWS = 1
+
     def __init__(self, parent, controller, view_type='local'):
         super().__init__(parent)
         self.controller = controller
         self.view_type = view_type
-        self.selected_widgets = {}
+        self.mod_list = []
+        self.selected_keys = {}
         self.placeholders = {}
         self.max_columns = 2
+        self.row_height = 0
+        self.measured_layout_types = set()
+        self.bound_items = {} # mod_list index -> ModDisplayItem
+        self.index_by_key = {} # mod_key -> mod_list index
+        self.items_by_key = {}
+        self.free_items = []
+        self._lazy_load_job = None
+        self._fit_job = None
 
         self.canvas = tk.Canvas(self, highlightthickness=0)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scroll, bootstyle="round")
-        self.scrollable_frame = ttk.Frame(self.canvas)
-
-        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=scrollbar.set)
 
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
         self.canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", self._on_mousewheel)
-        self.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<Configure>", self.on_resize)
         
         self.style = self.winfo_toplevel().style
         labelframe_bg = self.style.lookup('TLabelframe', 'background')
         self.canvas.config(bg=labelframe_bg)
 
+        self.message_label = ttk.Label(self.canvas, font=("Helvetica", 10, "italic"))
+        self.message_window = self.canvas.create_window(0, 20, window=self.message_label, anchor="n", state='hidden')
+
     def on_resize(self, event):
-        new_max_columns = max(1, event.width // 350)
+        new_max_columns = max(1, event.width // self.ITEM_WIDTH)
         if new_max_columns != self.max_columns:
             self.max_columns = new_max_columns
-            self.redraw_grid()
-        self.after(50, self._lazy_load_visible_widgets)
-
-    def _on_frame_configure(self, event=None):
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            self._release_all_items()
+        self.canvas.coords(self.message_window, event.width // 2, 20)
+        self._update_viewport()
+        self._schedule_lazy_load()
 
     def get_placeholder(self, size, text):
         if (size, text) in self.placeholders: return self.placeholders[(size, text)]
@@ -290,69 +382,92 @@ class ModListView(ttk.Frame):
 
     def _on_scroll(self, *args):
         self.canvas.yview(*args)
-        self.after(50, self._lazy_load_visible_widgets)
+        self._update_viewport()
+        self._schedule_lazy_load()
 
     def _on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        self.after(50, self._lazy_load_visible_widgets)
+        self._update_viewport()
+        self._schedule_lazy_load()
     
     def clear_list(self, message=""):
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        if message:
-            self.scrollable_frame.grid_columnconfigure(0, weight=0)
-            ttk.Label(self.scrollable_frame, text=message, font=("Helvetica", 10, "italic")).grid(row=0, column=0, pady=20)
-    
+        self.mod_list = []
+        self.index_by_key = {}
+        self._release_all_items()
+        self.canvas.configure(scrollregion=(0, 0, 0, 0))
+        self._show_message(message)
+
+    def _show_message(self, message):
+        self.message_label.config(text=message)
+        self.canvas.itemconfigure(self.message_window, state='normal' if message else 'hidden')
+
     def get_selected_keys(self):
-        return list(self.selected_widgets.keys())
+        return list(self.selected_keys.keys())
+
+    def get_bound_items(self):
+        """Returns the item widgets currently bound to a mod (the visible range plus overscan)."""
+        return list(self.bound_items.values())
+
+    def get_item(self, mod_key):
+        """Returns the live widget bound to mod_key, or None if that mod is not in the pooled range."""
+        return self.items_by_key.get(mod_key)
+
+    def update_item(self, mod_data):
+        """
+        Swaps fresh data in for a mod already in the list, rebinding only its widget if it is
+        pooled; the rest of the pool and the scroll position are left alone. Returns False if the
+        mod is not in the list.
+        """
+        index = self.index_by_key.get(self._get_mod_key(mod_data))
+        if index is None: return False
+        self.mod_list[index] = mod_data
+        item = self.bound_items.get(index)
+        if item:
+            item.bind_mod_data(mod_data)
+            self.bind_item_events(item)
+            self._apply_selection_style(item)
+            self._schedule_lazy_load()
+            self._schedule_fit_row_height()
+        return True
+
+    def _notify_selection_changed(self):
+        for item in self.bound_items.values():
+            self._apply_selection_style(item)
+        if self.view_type == 'local':
+            self.controller.set_source_folder_from_local_mod(list(self.selected_keys.keys()))
+
+    def _apply_selection_style(self, item):
+        if item.mod_key in self.selected_keys: item.config(bootstyle="primary")
+        else: item.config(style="TFrame")
 
     def on_mod_select(self, mod_key, widget, event):
         ctrl_pressed = (event.state & 0x0004) != 0
 
         if ctrl_pressed:
-            if mod_key in self.selected_widgets:
-                widget.config(style="TFrame") 
-                del self.selected_widgets[mod_key]
-            else:
-                widget.config(bootstyle="primary")
-                self.selected_widgets[mod_key] = widget
+            if mod_key in self.selected_keys: del self.selected_keys[mod_key]
+            else: self.selected_keys[mod_key] = True
         else:
-            is_only_selected = mod_key in self.selected_widgets and len(self.selected_widgets) == 1
-            for w in self.selected_widgets.values():
-                w.config(style="TFrame")
-            self.selected_widgets.clear()
-            if not is_only_selected:
-                widget.config(bootstyle="primary")
-                self.selected_widgets[mod_key] = widget
+            is_only_selected = mod_key in self.selected_keys and len(self.selected_keys) == 1
+            self.selected_keys.clear()
+            if not is_only_selected: self.selected_keys[mod_key] = True
 
-        if self.view_type == 'local':
-            self.controller.set_source_folder_from_local_mod(list(self.selected_widgets.keys()))
+        self._notify_selection_changed()
 
     def clear_selection(self):
-        for widget in self.selected_widgets.values():
-            widget.config(style="TFrame")
-        self.selected_widgets.clear()
+        self.selected_keys.clear()
+        for item in self.bound_items.values():
+            self._apply_selection_style(item)
         self.controller.clear_source_folder_selection()
 
     def select_items(self, mod_keys_to_select):
         self.clear_selection()
-        all_widgets = {child.mod_data['full_path']: child for child in self.scrollable_frame.winfo_children() if hasattr(child, 'mod_data')}
+        keys_in_list = {self._get_mod_key(mod_data) for mod_data in self.mod_list}
         for key in mod_keys_to_select:
-            if key in all_widgets:
-                widget = all_widgets[key]
-                widget.config(bootstyle="primary")
-                self.selected_widgets[key] = widget
-        if self.view_type == 'local':
-            self.controller.set_source_folder_from_local_mod(list(self.selected_widgets.keys()))
+            if key in keys_in_list: self.selected_keys[key] = True
+        self._notify_selection_changed()
 
-    def redraw_grid(self):
-        widgets = self.scrollable_frame.winfo_children()
-        for i, widget in enumerate(widgets):
-            row = i // self.max_columns
-            col = i % self.max_columns
-            widget.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-        for i in range(self.max_columns):
-            self.scrollable_frame.grid_columnconfigure(i, weight=1)
+    def _get_mod_key(self, mod_data):
+        return mod_data.get('full_path') if self.view_type == 'local' else mod_data.get('device_folder')
 
     def display_list(self, mod_list, message=""):
         self.clear_list()
@@ -361,52 +476,162 @@ class ModListView(ttk.Frame):
             self.clear_list(message)
             return
 
+        self.mod_list = []
         for mod_data in mod_list:
-            self.create_mod_widget(mod_data, view_mode=self.view_type)
-        
-        self.redraw_grid()
+            if self._get_mod_key(mod_data): self.mod_list.append(mod_data)
+            else: self.controller.log_to_ui(f"ERROR: Could not display mod, mod_key is missing for data: {mod_data}")
+        if not self.mod_list: return
+        self.index_by_key = {self._get_mod_key(mod_data): i for i, mod_data in enumerate(self.mod_list)}
+        self.measured_layout_types = set()
+        self.row_height = self._measure_row_height(self.mod_list)
+        self._update_viewport()
+        self._schedule_lazy_load(10)
+
+    def extend_list(self, mod_list):
+        """Appends mods to the displayed list without resetting the scroll position (used to feed long results in batches)."""
+        if not self.mod_list:
+            self.display_list(mod_list)
+            return
+        new_mods = [mod_data for mod_data in mod_list if self._get_mod_key(mod_data)]
+        if not new_mods: return
+        self.index_by_key.update((self._get_mod_key(mod_data), i) for i, mod_data in enumerate(new_mods, len(self.mod_list)))
+        self.mod_list.extend(new_mods)
+        row_height = self._measure_row_height(new_mods)
+        if row_height > self.row_height:
+            self.row_height = row_height
+            self._release_all_items()
+        self._update_viewport()
+        self._schedule_lazy_load()
+
+    def _measure_row_height(self, mod_list):
+        """
+        Row math needs a fixed row height: measure one sample per layout type in the list, picking
+        the one most likely to be tallest (a layout warning, the longest name), and take the tallest.
+        Items that still turn out taller once bound grow the rows via _fit_row_height.
+        """
+        samples = {}
+        for mod_data in mod_list:
+            layout_type = mod_data.get('library_type') or mod_data.get('mod_type')
+            if layout_type in self.measured_layout_types: continue
+            if layout_type not in samples or self._height_hint(mod_data) > self._height_hint(samples[layout_type]): samples[layout_type] = mod_data
+        if not samples: return self.row_height
+        self.measured_layout_types.update(samples.keys())
+        items = [self._acquire_item(mod_data) for mod_data in samples.values()]
         self.update_idletasks()
-        self.after(10, self._lazy_load_visible_widgets)
+        height = max(item.winfo_reqheight() for item in items) + 2 * self.ITEM_PADDING
+        for item in items: self._release_item(item)
+        return height
+
+    def _height_hint(self, mod_data):
+        return (bool(mod_data.get('layout_problems') or mod_data.get('integrity_error')), len(mod_data.get('name') or mod_data.get('device_folder') or ''))
+
+    def _schedule_fit_row_height(self):
+        if not self._fit_job: self._fit_job = self.after_idle(self._fit_row_height)
+
+    def _fit_row_height(self):
+        """Grows the rows if a bound item needs more height than the measured samples did, so nothing is clipped."""
+        self._fit_job = None
+        try: needed = max((item.winfo_reqheight() for item in self.bound_items.values()), default=0) + 2 * self.ITEM_PADDING
+        except tk.TclError: return
+        if needed > self.row_height:
+            self.row_height = needed
+            self._update_viewport()
+
+    def _get_row_range(self, overscan=0):
+        """Returns the (first, last) row indices intersecting the viewport, computed from the scroll offset."""
+        total_rows = -(-len(self.mod_list) // self.max_columns)
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self.row_height) - overscan)
+        last_row = min(total_rows - 1, int(bottom // self.row_height) + overscan)
+        return first_row, last_row
+
+    def _update_viewport(self):
+        if not self.mod_list or not self.row_height: return
+        try:
+            width = self.canvas.winfo_width()
+            total_rows = -(-len(self.mod_list) // self.max_columns)
+            self.canvas.configure(scrollregion=(0, 0, width, total_rows * self.row_height))
+
+            first_row, last_row = self._get_row_range(self.OVERSCAN_ROWS)
+            wanted = range(first_row * self.max_columns, min(len(self.mod_list), (last_row + 1) * self.max_columns))
+
+            for index in [i for i in self.bound_items if i not in wanted]:
+                item = self.bound_items.pop(index)
+                if self.items_by_key.get(item.mod_key) is item: del self.items_by_key[item.mod_key]
+                self._release_item(item)
+
+            column_width = width / self.max_columns
+            for index in wanted:
+                item = self.bound_items.get(index)
+                if item is None:
+                    item = self._acquire_item(self.mod_list[index])
+                    self.bound_items[index] = item
+                    self.items_by_key[item.mod_key] = item
+                    self._schedule_fit_row_height()
+                row, col = divmod(index, self.max_columns)
+                self.canvas.coords(item.window_id, col * column_width + self.ITEM_PADDING, row * self.row_height + self.ITEM_PADDING)
+                self.canvas.itemconfigure(item.window_id, width=column_width - 2 * self.ITEM_PADDING, height=self.row_height - 2 * self.ITEM_PADDING, state='normal')
+        except tk.TclError:
+            pass
+
+    def _acquire_item(self, mod_data):
+        """Takes an item from the pool (preferring one with the same layout) and binds it to mod_data."""
+        layout_type = mod_data.get('library_type') or mod_data.get('mod_type')
+        item = next((i for i in self.free_items if i.layout_type == layout_type), None)
+        if item is None and self.free_items: item = self.free_items[-1]
+        if item is not None:
+            self.free_items.remove(item)
+            item.bind_mod_data(mod_data)
+        else:
+            item = self.create_mod_widget(mod_data, view_mode=self.view_type)
+        self.bind_item_events(item)
+        self._apply_selection_style(item)
+        return item
+
+    def _release_item(self, item):
+        self.canvas.itemconfigure(item.window_id, state='hidden')
+        item.release_images()
+        self.free_items.append(item)
+
+    def _release_all_items(self):
+        for item in self.bound_items.values():
+            self._release_item(item)
+        self.bound_items.clear()
+        self.items_by_key.clear()
+
+    def _schedule_lazy_load(self, delay=50):
+        if self._lazy_load_job: self.after_cancel(self._lazy_load_job)
+        self._lazy_load_job = self.after(delay, self._lazy_load_visible_widgets)
 
     def _lazy_load_visible_widgets(self):
-        if not self.winfo_viewable():
+        self._lazy_load_job = None
+        if not self.winfo_viewable() or not self.mod_list:
             return
 
         try:
-            visible_top = self.canvas.yview()[0] * self.scrollable_frame.winfo_height()
-            visible_bottom = self.canvas.yview()[1] * self.scrollable_frame.winfo_height()
-
-            for widget in self.scrollable_frame.winfo_children():
-                if isinstance(widget, ModDisplayItem) and not widget.images_loaded:
-                    y = widget.winfo_y()
-                    height = widget.winfo_height()
-                    if y < visible_bottom and (y + height) > visible_top:
-                        widget.load_images()
+            first_row, last_row = self._get_row_range()
+            for index in range(first_row * self.max_columns, (last_row + 1) * self.max_columns):
+                item = self.bound_items.get(index)
+                if item and not item.images_loaded:
+                    item.load_images()
         except tk.TclError:
             pass
 
     def create_mod_widget(self, mod_data, view_mode):
-        try:
-            widget = ModDisplayItem(self.scrollable_frame, self.controller, self, mod_data, view_mode=view_mode)
-            widget.config(style="TFrame")
-            widget.mod_data = mod_data
-            
-            mod_key = mod_data.get('full_path') if view_mode == 'local' else mod_data.get('device_folder')
-            if not mod_key:
-                self.controller.log_to_ui(f"ERROR: Could not create mod widget, mod_key is missing for data: {mod_data}")
-                widget.destroy()
-                return
+        widget = ModDisplayItem(self.canvas, self.controller, self, mod_data, view_mode=view_mode)
+        widget.config(style="TFrame")
+        widget.window_id = self.canvas.create_window(0, 0, window=widget, anchor="nw", state='hidden')
+        return widget
 
-            def _select_callback(event, key=mod_key, wid=widget): self.on_mod_select(key, wid, event)
-            self._bind_recursive(widget, "<Button-1>", _select_callback)
-            self._bind_recursive(widget, "<MouseWheel>", self._on_mousewheel)
-            return widget
-        except Exception as e:
-            self.controller.log_to_ui(f"FATAL: Failed to create widget for {mod_data.get('name')}. Error: {e}")
-            return None
+    def bind_item_events(self, widget):
+        """(Re)binds selection and scrolling; the callbacks read the widget's current mod_key."""
+        def _select_callback(event, wid=widget): self.on_mod_select(wid.mod_key, wid, event)
+        self._bind_recursive(widget, "<Button-1>", _select_callback)
+        self._bind_recursive(widget, "<MouseWheel>", self._on_mousewheel)
 
     def _bind_recursive(self, widget, event, callback):
         widget.bind(event, callback)
         for child in widget.winfo_children():
             if not isinstance(child, ttk.Button):
-                self._bind_recursive(child, event, callback)
\ No newline at end of file
+                self._bind_recursive(child, event, callback)
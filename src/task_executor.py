@@ -0,0 +1,165 @@
+# --- Filename: task_executor.py ---
+import threading
+import itertools
+from collections import deque
+
+PRIORITY_INTERACTIVE = "interactive" # Short jobs the user is waiting on (console commands, launch, connection checks)
+PRIORITY_BACKGROUND = "background" # Scans, listings, downloads
+PRIORITY_BULK = "bulk" # Long device transfers (install/uninstall batches)
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BULK)
+
+_current = threading.local()
+
+class TaskCancelled(Exception):
+    pass
+
+class CancelToken:
+    """A cooperative cancellation flag. Long jobs should check it between units of work."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self): self._event.set()
+
+    @property
+    def is_cancelled(self): return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Sleeps up to timeout seconds, waking early on cancellation. Returns True if cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set(): raise TaskCancelled()
+
+def get_current_cancel_token():
+    """Returns the CancelToken of the task running on this thread (a never-cancelled one outside the executor)."""
+    return getattr(_current, 'token', None) or CancelToken()
+
+class TaskHandle:
+    def __init__(self, func, args, kwargs, priority, key, name):
+        self.func, self.args, self.kwargs = func, args, kwargs
+        self.priority, self.key, self.name = priority, key, name
+        self.token = CancelToken()
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+    def cancel(self): self.token.cancel()
+
+    def wait(self, timeout=None): return self.done.wait(timeout)
+
+class TaskExecutor:
+    """
+    One bounded, application-wide pool for background work, replacing a raw thread per call.
+    Tasks are picked strictly by priority class, and each class has its own concurrency cap
+    (bulk transfers run one at a time). Background and bulk work also share a cap of one
+    worker fewer than the pool, so an interactive job always finds a free worker. Submitting
+    with a key that is already queued or running returns the existing handle instead of
+    starting a duplicate job.
+    """
+    def __init__(self, max_workers=4):
+        self.max_workers = max(2, max_workers)
+        self.limits = {PRIORITY_INTERACTIVE: self.max_workers, PRIORITY_BACKGROUND: self.max_workers - 1, PRIORITY_BULK: 1}
+        self.non_interactive_limit = self.max_workers - 1 # Shared by background and bulk tasks
+        self.queues = {p: deque() for p in PRIORITIES}
+        self.running = {p: 0 for p in PRIORITIES}
+        self.in_flight = {} # key -> TaskHandle
+        self.active = set()
+        self.dedicated = set()
+        self._cond = threading.Condition()
+        self._workers = []
+        self._idle_workers = 0
+        self._shutdown = False
+        self._ids = itertools.count(1)
+
+    def submit(self, func, *args, priority=PRIORITY_BACKGROUND, key=None, name=None, **kwargs):
+        if priority not in self.queues: raise ValueError(f"Unknown task priority '{priority}'")
+        with self._cond:
+            if self._shutdown: raise RuntimeError("Task executor has been shut down.")
+            if key is not None and key in self.in_flight:
+                return self.in_flight[key]
+            handle = TaskHandle(func, args, kwargs, priority, key, name or getattr(func, '__name__', f"task-{next(self._ids)}"))
+            if key is not None: self.in_flight[key] = handle
+            self.queues[priority].append(handle)
+            if self._idle_workers == 0 and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker_loop, name=f"smx-worker-{len(self._workers) + 1}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+            return handle
+
+    def _next_task(self):
+        non_interactive = self.running[PRIORITY_BACKGROUND] + self.running[PRIORITY_BULK]
+        for priority in PRIORITIES:
+            if not self.queues[priority] or self.running[priority] >= self.limits[priority]: continue
+            if priority != PRIORITY_INTERACTIVE and non_interactive >= self.non_interactive_limit: continue
+            return self.queues[priority].popleft()
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                handle = self._next_task()
+                while handle is None:
+                    if self._shutdown: return
+                    self._idle_workers += 1
+                    self._cond.wait()
+                    self._idle_workers -= 1
+                    handle = self._next_task()
+                self.running[handle.priority] += 1
+                self.active.add(handle)
+            self._run(handle)
+            with self._cond:
+                self.running[handle.priority] -= 1
+                self.active.discard(handle)
+                if handle.key is not None and self.in_flight.get(handle.key) is handle: del self.in_flight[handle.key]
+                self._cond.notify_all()
+
+    def _run(self, handle):
+        _current.token = handle.token
+        try:
+            if not handle.token.is_cancelled:
+                handle.result = handle.func(*handle.args, **handle.kwargs)
+        except TaskCancelled:
+            print(f"INFO: Task '{handle.name}' was cancelled.")
+        except Exception as e:
+            handle.exception = e
+            print(f"ERROR: Task '{handle.name}' failed: {e}")
+        finally:
+            _current.token = None
+            handle.done.set()
+
+    def submit_dedicated(self, func, *args, name=None, **kwargs):
+        """
+        Runs an open-ended job (e.g. a streaming adb command) on its own thread so it never
+        occupies a pool worker, while still giving it a TaskHandle and CancelToken.
+        """
+        handle = TaskHandle(func, args, kwargs, PRIORITY_INTERACTIVE, None, name or getattr(func, '__name__', f"stream-{next(self._ids)}"))
+        def run():
+            with self._cond: self.dedicated.add(handle)
+            try: self._run(handle)
+            finally:
+                with self._cond: self.dedicated.discard(handle)
+        threading.Thread(target=run, name=f"smx-{handle.name}", daemon=True).start()
+        return handle
+
+    def cancel(self, priority=None, key=None):
+        """Cancels queued and running tasks, optionally only those of one priority class or key."""
+        with self._cond:
+            handles = list(self.active) + [h for q in self.queues.values() for h in q]
+            if priority is None and key is None: handles += list(self.dedicated)
+        count = 0
+        for handle in handles:
+            if (priority is None or handle.priority == priority) and (key is None or handle.key == key):
+                handle.cancel()
+                count += 1
+        return count
+
+    def get_stats(self):
+        with self._cond:
+            return {'workers': len(self._workers), 'running': dict(self.running), 'queued': {p: len(q) for p, q in self.queues.items()}}
+
+    def shutdown(self):
+        self.cancel()
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
@@ -0,0 +1,85 @@
+# --- Filename: transfer_journal.py ---
+import os
+import json
+import hashlib
+import threading
+
+def file_md5(path, chunk_size=1024 * 1024):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''): digest.update(chunk)
+    return digest.hexdigest()
+
+class TransferJournal:
+    """
+    An append-only record of mod installs in progress, so a batch interrupted by a disconnect
+    or a crash can resume instead of starting over. Every event is one JSON line appended (and
+    flushed) as it happens; on load the lines are replayed and the file is compacted to the
+    installs that never finished.
+
+    Entry per zip path: device_folder, target_dir, index, zip_size, zip_mtime,
+    stage ('pushing' or 'moving') and completed ({relative path: size} of pushed files).
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.file_path): return
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try: self._apply(json.loads(line))
+                except (json.JSONDecodeError, KeyError): continue # A torn last line from a crash
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for zip_path, entry in self.entries.items(): f.write(json.dumps({'op': 'begin', 'zip': zip_path, 'entry': entry}) + "\n")
+        os.replace(tmp_path, self.file_path)
+
+    def _apply(self, record):
+        op, zip_path = record['op'], record['zip']
+        if op == 'begin': self.entries[zip_path] = record['entry']
+        elif op == 'done': self.entries.pop(zip_path, None)
+        elif zip_path not in self.entries: return
+        elif op == 'file': self.entries[zip_path]['completed'][record['path']] = record['size']
+        elif op == 'stage': self.entries[zip_path]['stage'] = record['stage']
+
+    def _append(self, record):
+        with self._lock:
+            if record['op'] != 'begin' and record['zip'] not in self.entries: return # Not a journaled install
+            self._apply(record)
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+
+    def begin(self, zip_path, device_folder, target_dir, index=None):
+        st = os.stat(zip_path)
+        entry = {'device_folder': device_folder, 'target_dir': target_dir, 'index': index,
+                 'zip_size': st.st_size, 'zip_mtime': st.st_mtime, 'stage': 'pushing', 'completed': {}}
+        self._append({'op': 'begin', 'zip': zip_path, 'entry': entry})
+
+    def file_done(self, zip_path, rel_path, size):
+        self._append({'op': 'file', 'zip': zip_path, 'path': rel_path, 'size': size})
+
+    def set_stage(self, zip_path, stage):
+        self._append({'op': 'stage', 'zip': zip_path, 'stage': stage})
+
+    def finish(self, zip_path):
+        self._append({'op': 'done', 'zip': zip_path})
+
+    def get(self, zip_path):
+        """Returns the unfinished entry for a zip (a copy), or None."""
+        with self._lock:
+            entry = self.entries.get(zip_path)
+            return {**entry, 'completed': dict(entry['completed'])} if entry else None
+
+    def is_current(self, zip_path):
+        """True if the zip still has the size/mtime it had when its transfer began."""
+        entry = self.entries.get(zip_path)
+        try: st = os.stat(zip_path)
+        except OSError: return False
+        return bool(entry) and entry['zip_size'] == st.st_size and entry['zip_mtime'] == st.st_mtime
+
+    def pending(self):
+        with self._lock: return list(self.entries)
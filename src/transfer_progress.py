@@ -0,0 +1,95 @@
+# --- Filename: transfer_progress.py ---
+import os
+import json
+import time
+import threading
+from collections import deque
+
+RATE_WINDOW_SECONDS = 3.0
+UPDATE_INTERVAL_SECONDS = 0.25
+MB = 1024 * 1024
+
+class TransferProgress:
+    """
+    Tracks one batch of file transfers (bytes and files done out of a known total) and derives
+    the instantaneous rate (over the last few seconds), the average rate and the ETA. on_update
+    receives a snapshot() dict at most every UPDATE_INTERVAL_SECONDS; it is called on the
+    transferring thread, so UI callbacks must hop to the Tk thread themselves.
+    """
+    def __init__(self, total_bytes=0, total_files=0, on_update=None, current=""):
+        self.total_bytes, self.total_files = total_bytes, total_files
+        self.bytes_done, self.files_done = 0, 0
+        self.current = current
+        self.on_update = on_update
+        self.started = time.monotonic()
+        self.samples = deque([(self.started, 0)]) # (time, bytes_done)
+        self._last_update = 0.0
+        self._lock = threading.Lock()
+
+    def set_current(self, name):
+        with self._lock: self.current = name
+        self._notify(force=True)
+
+    def add_total(self, total_bytes, total_files):
+        with self._lock:
+            self.total_bytes += total_bytes
+            self.total_files += total_files
+
+    def file_done(self, size):
+        now = time.monotonic()
+        with self._lock:
+            self.bytes_done += size
+            self.files_done += 1
+            self.samples.append((now, self.bytes_done))
+            while len(self.samples) > 2 and now - self.samples[0][0] > RATE_WINDOW_SECONDS: self.samples.popleft()
+        self._notify(force=self.files_done == self.total_files)
+
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            elapsed = max(now - self.started, 1e-6)
+            avg_rate = self.bytes_done / elapsed
+            (t0, b0), (t1, b1) = self.samples[0], self.samples[-1]
+            inst_rate = (b1 - b0) / (t1 - t0) if t1 > t0 else avg_rate
+            # Pulls only know how many files are coming, not their sizes; their ETA goes by files instead.
+            if self.total_bytes: eta = max(self.total_bytes - self.bytes_done, 0) / avg_rate if avg_rate > 0 else None
+            else: eta = elapsed / self.files_done * max(self.total_files - self.files_done, 0) if self.files_done else None
+            return {
+                'current': self.current, 'bytes_done': self.bytes_done, 'total_bytes': self.total_bytes,
+                'files_done': self.files_done, 'total_files': self.total_files, 'elapsed': elapsed,
+                'inst_mbps': inst_rate / MB, 'avg_mbps': avg_rate / MB,
+                'eta': eta,
+            }
+
+    def _notify(self, force=False):
+        if not self.on_update: return
+        now = time.monotonic()
+        if not force and now - self._last_update < UPDATE_INTERVAL_SECONDS: return
+        self._last_update = now
+        self.on_update(self.snapshot())
+
+class TransferMetrics:
+    """Appends one JSON line per completed transfer (a pushed mod or a pulled file) to a metrics file."""
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    def record(self, direction, name, num_bytes, files, seconds, **extra):
+        entry = {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"), 'direction': direction, 'name': name,
+            'bytes': num_bytes, 'files': files, 'seconds': round(seconds, 3),
+            'mbps': round(num_bytes / MB / seconds, 3) if seconds > 0 else None, **extra,
+        }
+        try:
+            with self._lock, open(self.file_path, 'a', encoding='utf-8') as f: f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"WARNING: Could not write transfer metrics: {e}")
+
+    def read_recent(self, limit=200):
+        if not os.path.exists(self.file_path): return []
+        with self._lock, open(self.file_path, 'r', encoding='utf-8') as f: lines = deque(f, maxlen=limit)
+        entries = []
+        for line in lines:
+            try: entries.append(json.loads(line))
+            except json.JSONDecodeError: continue
+        return entries
@@ -0,0 +1,209 @@
+# --- Filename: zip_index.py ---
+import os
+import json
+import hashlib
+import zipfile
+import threading
+from collections import defaultdict
+from src.mod_layout import check_layout
+
+class ZipIndex:
+    """
+    A persistent record of every scanned mod zip's central directory (member names, CRCs and
+    sizes), keyed by zip path and stamped with the zip's size/mtime. It doubles as an inverted
+    index from member file names, extensions and CRCs to the zips that contain them, so
+    "which mods ship X" is a dictionary lookup instead of opening every archive. Each entry's
+    content fingerprint is indexed too: it identifies a mod across renames and moves, and
+    zips sharing one are duplicates.
+    """
+    VERSION = 1
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self.zips = {} # zip path -> {'size', 'mtime', 'members': [[name, crc, file_size], ...]}
+        self.by_name = defaultdict(set) # lowercased member basename -> {zip path}
+        self.by_ext = defaultdict(set) # lowercased extension (".wav") -> {zip path}
+        self.by_crc = defaultdict(set) # CRC32 -> {zip path}
+        self.by_fingerprint = defaultdict(set) # content fingerprint -> {zip path}
+        self._seen = set()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.file_path, 'r') as f: data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError): return
+        if data.get('version') != self.VERSION: return
+        for path, entry in data.get('zips', {}).items():
+            if 'fingerprint' not in entry: # Saved before fingerprints were recorded
+                entry['fingerprint'] = self._compute_fingerprint(entry['members'])
+                self._dirty = True
+            self.zips[path] = entry
+            self._add_postings(path, entry)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty: return
+            data = {'version': self.VERSION, 'zips': self.zips}
+            self._dirty = False
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, 'w') as f: json.dump(data, f)
+        os.replace(tmp_path, self.file_path)
+
+    @staticmethod
+    def _stat(path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime
+
+    def get_entry(self, path):
+        """Returns the cached entry for path if it is still current (same size and mtime), else None."""
+        try: size, mtime = self._stat(path)
+        except OSError: return None
+        with self._lock: entry = self.zips.get(path)
+        if entry and entry['size'] == size and entry['mtime'] == mtime: return entry
+        return None
+
+    def update_from_zip(self, path, zip_ref):
+        """Records the central directory of an open ZipFile; cheap, since ZipFile has already parsed it."""
+        with self._lock: self._seen.add(path)
+        entry = self.get_entry(path)
+        if entry: return entry
+        size, mtime = self._stat(path)
+        members = [[info.filename, info.CRC, info.file_size] for info in zip_ref.infolist() if not info.is_dir()]
+        entry = {'size': size, 'mtime': mtime, 'members': members, 'fingerprint': self._compute_fingerprint(members)}
+        with self._lock:
+            old_entry = self.zips.get(path)
+            if old_entry: self._remove_postings(path, old_entry)
+            self.zips[path] = entry
+            self._add_postings(path, entry)
+            self._dirty = True
+        return entry
+
+    @staticmethod
+    def _compute_fingerprint(members):
+        """A hash of the zip's contents (member names, CRCs and sizes) that ignores its mtime and compression."""
+        digest = hashlib.sha1()
+        for name, crc, size in sorted(m for m in members if not m[0].startswith('__MACOSX/')):
+            digest.update(f"{name}\0{crc}\0{size}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_current_entry(self, path):
+        """Like get_entry, but reads the zip's central directory if the cached entry is missing or stale."""
+        entry = self.get_entry(path)
+        if entry is None:
+            with zipfile.ZipFile(path, 'r') as zip_ref: entry = self.update_from_zip(path, zip_ref)
+        return entry
+
+    def get_layout_problems(self, path, lib_type):
+        """
+        Returns check_layout's problems for a zip as a mod of lib_type. The result is stored in
+        the entry, so it is computed once per zip change (or library type change) at scan time.
+        """
+        entry = self.get_current_entry(path)
+        layout = entry.get('layout')
+        if layout is None or layout['type'] != lib_type:
+            layout = {'type': lib_type, 'problems': check_layout([m[0] for m in entry['members']], lib_type)}
+            with self._lock:
+                entry['layout'] = layout
+                self._dirty = True
+        return list(layout['problems'])
+
+    def get_fingerprint(self, path):
+        return self.get_current_entry(path)['fingerprint']
+
+    def get_paths_by_fingerprint(self, fingerprint):
+        with self._lock: return set(self.by_fingerprint.get(fingerprint, set()))
+
+    def get_duplicate_groups(self):
+        """Returns the sets of zip paths that share identical contents."""
+        with self._lock: return [set(paths) for paths in self.by_fingerprint.values() if len(paths) > 1]
+
+    def get_payload_size(self, path):
+        """Returns (uncompressed bytes, file count) of a zip's contents, ignoring __MACOSX."""
+        members = [m for m in self.get_current_entry(path)['members'] if not m[0].startswith('__MACOSX/')]
+        return sum(m[2] for m in members), len(members)
+
+    def find_member(self, crc, size):
+        """Returns (zip path, member name) of an indexed file with this CRC32 and size, or None."""
+        with self._lock:
+            for path in self.by_crc.get(crc, ()):
+                for name, member_crc, member_size in self.zips[path]['members']:
+                    if member_crc == crc and member_size == size: return path, name
+        return None
+
+    def get_member_md5s(self, path):
+        """Returns {member name: md5} for a zip's files, hashing the members once and caching the result in its entry."""
+        entry = self.get_current_entry(path)
+        if 'md5s' not in entry:
+            md5s = {}
+            with zipfile.ZipFile(path, 'r') as zip_ref:
+                for name, _, _ in entry['members']:
+                    digest = hashlib.md5()
+                    with zip_ref.open(name) as f:
+                        for chunk in iter(lambda: f.read(1024 * 1024), b''): digest.update(chunk)
+                    md5s[name] = digest.hexdigest()
+            with self._lock:
+                entry['md5s'] = md5s
+                self._dirty = True
+        return entry['md5s']
+
+    def begin_scan(self):
+        with self._lock: self._seen = set()
+
+    def end_scan(self):
+        """Drops entries for zips that were not seen by the scan that just finished, then persists."""
+        with self._lock:
+            for path in [p for p in self.zips if p not in self._seen]:
+                self._remove_postings(path, self.zips.pop(path))
+                self._dirty = True
+        self.save()
+
+    def _iter_keys(self, entry):
+        for name, crc, _ in entry['members']:
+            base = name.rsplit('/', 1)[-1].lower()
+            yield self.by_name, base
+            ext = os.path.splitext(base)[1]
+            if ext: yield self.by_ext, ext
+            yield self.by_crc, crc
+
+    def _add_postings(self, path, entry):
+        for index, key in self._iter_keys(entry):
+            index[key].add(path)
+        self.by_fingerprint[entry['fingerprint']].add(path)
+
+    def _remove_postings(self, path, entry):
+        for index, key in self._iter_keys(entry):
+            paths = index.get(key)
+            if paths is None: continue
+            paths.discard(path)
+            if not paths: del index[key]
+        paths = self.by_fingerprint.get(entry['fingerprint'])
+        if paths is not None:
+            paths.discard(path)
+            if not paths: del self.by_fingerprint[entry['fingerprint']]
+
+    def find(self, query):
+        """
+        Returns the set of zip paths matching a content query:
+          'idle.wav'      zips containing a file with that name
+          '*.smxlevel'    zips containing a file with that extension
+          'crc:1a2b3c4d'  zips containing a file with that CRC32
+          'dup:'          zips whose contents are identical to another zip
+        A leading '!' inverts the match, e.g. '!idle.wav' finds zips missing it.
+        """
+        query = query.strip().lower()
+        negate = query.startswith('!')
+        if negate: query = query[1:].strip()
+        if not query: return set()
+        with self._lock:
+            if query == 'dup:':
+                matches = {p for paths in self.by_fingerprint.values() if len(paths) > 1 for p in paths}
+            elif query.startswith('crc:'):
+                try: matches = self.by_crc.get(int(query[4:], 16), set())
+                except ValueError: matches = set()
+            elif query.startswith('*.'):
+                matches = self.by_ext.get(query[1:], set())
+            else:
+                matches = self.by_name.get(query, set())
+            return (set(self.zips) - matches) if negate else set(matches)
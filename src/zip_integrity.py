@@ -0,0 +1,88 @@
+# --- Filename: zip_integrity.py ---
+import os
+import json
+import zipfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from src.task_executor import get_current_cancel_token
+
+SAVE_EVERY = 25
+
+def _test_zip(path):
+    """Runs in a worker process: reads every member and checks its CRC. Returns None if the zip is sound, else the problem."""
+    try:
+        with zipfile.ZipFile(path, 'r') as zip_ref: bad_member = zip_ref.testzip()
+        return f"bad CRC in '{bad_member}'" if bad_member else None
+    except Exception as e: return str(e) or type(e).__name__ # Truncated archives raise all sorts
+
+class ZipIntegrityChecker:
+    """
+    CRC-verifies library zips in the background (ZipFile.testzip in a small process pool) so a
+    corrupt or truncated download is flagged in the list instead of failing an install halfway.
+    Results are cached in a JSON file by path, size and mtime, so each zip is read once per change.
+    """
+    def __init__(self, file_path, max_workers=1):
+        self.file_path = file_path
+        self.max_workers = max_workers
+        self.results = {} # zip path -> {'size', 'mtime', 'error'}
+        self._lock = threading.Lock()
+        try:
+            with open(self.file_path, 'r') as f: self.results = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError): pass
+
+    def save(self):
+        with self._lock: data = dict(self.results)
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, 'w') as f: json.dump(data, f)
+        os.replace(tmp_path, self.file_path)
+
+    def _current(self, path):
+        try: st = os.stat(path)
+        except OSError: return None
+        with self._lock: result = self.results.get(path)
+        return result if result and (result['size'], result['mtime']) == (st.st_size, st.st_mtime) else None
+
+    def get_error(self, path):
+        """The cached problem for a zip as it is now, or None if it checked out or has not been checked yet."""
+        result = self._current(path)
+        return result['error'] if result else None
+
+    def check(self, paths, on_result=None, should_pause=None, log_func=print):
+        """
+        Verifies every zip in paths without a current cached result. on_result(path, error) is
+        called (on this thread) for each one checked. While should_pause() is true no new zip
+        is handed to the pool, so user-facing work keeps the disk and CPU to itself.
+        """
+        with self._lock:
+            for gone in self.results.keys() - set(paths): del self.results[gone]
+        todo = [p for p in paths if self._current(p) is None]
+        if not todo or self.max_workers <= 0: return
+        log_func(f"INFO: Checking the integrity of {len(todo)} library zip(s) in the background...")
+        cancel_token = get_current_cancel_token()
+        pending, broken, checked = {}, 0, 0
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            try:
+                while todo or pending:
+                    cancel_token.raise_if_cancelled()
+                    if todo and len(pending) < self.max_workers and not (should_pause and should_pause()):
+                        path = todo.pop()
+                        try: st = os.stat(path)
+                        except OSError: continue
+                        pending[pool.submit(_test_zip, path)] = (path, st.st_size, st.st_mtime)
+                        continue
+                    if not pending:
+                        cancel_token.wait(0.5)
+                        continue
+                    done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        path, size, mtime = pending.pop(future)
+                        error = future.result()
+                        with self._lock: self.results[path] = {'size': size, 'mtime': mtime, 'error': error}
+                        checked += 1
+                        if error: broken += 1
+                        if on_result: on_result(path, error)
+                        if checked % SAVE_EVERY == 0: self.save()
+            finally:
+                for future in pending: future.cancel()
+                self.save()
+        log_func(f"INFO: Zip integrity check finished: {broken} of {checked} zip(s) are damaged.")